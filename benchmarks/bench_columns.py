@@ -0,0 +1,83 @@
+#!/usr/bin/python3
+"""Compare aggregates over Place objects and over their columnar table.
+
+Stores places spread over 100 cities, then reports the time of the mean
+price per city and of the guest capacity of the places under a price,
+computed by reading the attributes of every object and through
+storage.columns(Place). The time to build the indexes of Place, the table
+included, on the first call is reported separately.
+
+Usage: ./benchmarks/bench_columns.py [objects]
+"""
+import os
+import random
+import sys
+import tempfile
+from time import perf_counter
+from unittest.mock import patch
+from uuid import uuid4
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import models  # noqa: E402
+from models.engine.file_storage import FileStorage  # noqa: E402
+from models.place import Place  # noqa: E402
+
+
+def timed(function):
+    """Return the result and the duration of a call to function, in ms."""
+    start = perf_counter()
+    result = function()
+    return result, (perf_counter() - start) * 1000
+
+
+def scan_mean_by_city(storage):
+    """Return the mean price per city, reading every object."""
+    totals = {}
+    for place in storage.all(Place).values():
+        total = totals.setdefault(place.city_id, [0, 0])
+        total[0] += place.price_by_night
+        total[1] += 1
+    return {city_id: total / count
+            for city_id, (total, count) in totals.items()}
+
+
+def scan_capacity(storage, price):
+    """Return the guest capacity of the places under price, reading every
+    object."""
+    return sum(place.max_guest for place in storage.all(Place).values()
+               if place.price_by_night < price)
+
+
+def main():
+    """Print the time of each aggregate over objects and over the table."""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    random.seed(0)
+    cities = [str(uuid4()) for i in range(100)]
+    with tempfile.TemporaryDirectory() as tmpdir:
+        storage = FileStorage(path=os.path.join(tmpdir, "file.json"))
+        with patch.object(models, "storage", storage):
+            for i in range(count):
+                place = Place()
+                place.city_id = random.choice(cities)
+                place.price_by_night = random.randrange(20, 500)
+                place.max_guest = random.randrange(1, 10)
+            table, build = timed(lambda: storage.columns(Place))
+            scans = (timed(lambda: scan_mean_by_city(storage)),
+                     timed(lambda: scan_capacity(storage, 100)))
+            columns = (timed(lambda: table.mean("price_by_night",
+                                                by="city_id")),
+                       timed(lambda: table.sum("max_guest",
+                                               price_by_night__lt=100)))
+        FileStorage._FileStorage__objects = {}
+    assert scans[0][0].keys() == columns[0][0].keys()
+    assert scans[1][0] == columns[1][0]
+    print("{} places, indexes built in {:.1f} ms".format(count, build))
+    print("{:<22} {:>10} {:>10}".format("aggregate", "scan ms", "table ms"))
+    for name, scan, column in zip(("mean price by city",
+                                   "capacity under price"), scans, columns):
+        print("{:<22} {:>10.1f} {:>10.1f}".format(name, scan[1], column[1]))
+
+
+if __name__ == "__main__":
+    main()
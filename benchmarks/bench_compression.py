@@ -0,0 +1,78 @@
+#!/usr/bin/python3
+"""Compare the save and reload costs of compressed storage files.
+
+Reports the wall-clock and CPU time of a full save and of a reload of
+each snapshot format, uncompressed and compressed with gzip and lzma,
+along with the size of the file.
+
+Usage: ./benchmarks/bench_compression.py [objects]
+"""
+import os
+import sys
+import tempfile
+from time import perf_counter, process_time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import models  # noqa: E402
+from models.engine.file_storage import FileStorage  # noqa: E402
+from models.place import Place  # noqa: E402
+from models.user import User  # noqa: E402
+
+NAMES = ("file.json", "file.json.gz", "file.json.xz",
+         "file.bin", "file.bin.gz", "file.bin.xz")
+
+
+def timed(function):
+    """Return the wall-clock and CPU durations of a call, in ms."""
+    wall, cpu = perf_counter(), process_time()
+    function()
+    return (perf_counter() - wall) * 1000, (process_time() - cpu) * 1000
+
+
+def populate(count):
+    """Store count objects shaped like a real dataset."""
+    for i in range(count):
+        if i % 2:
+            place = Place()
+            place.name = "Place {}".format(i)
+            place.number_rooms = i % 5
+            place.price_by_night = 50 + i % 200
+            place.latitude = 37.77
+            place.longitude = -122.41
+        else:
+            user = User()
+            user.email = "user{}@hbnb.io".format(i)
+            user.first_name = "Betty"
+
+
+def bench(path):
+    """Return the save and reload durations and the size of a file."""
+    storage = FileStorage(path=path)
+    objects = FileStorage._FileStorage__objects
+    save = timed(storage.save)
+    FileStorage._FileStorage__objects = {}
+    reload = timed(storage.reload)
+    FileStorage._FileStorage__objects = objects
+    return save + reload + (os.path.getsize(path),)
+
+
+def main():
+    """Print the save time, reload time and size of each file."""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    FileStorage._FileStorage__objects = {}
+    with tempfile.TemporaryDirectory() as tmpdir:
+        models.storage = FileStorage(path=os.path.join(tmpdir, "unused"))
+        populate(count)
+        results = [(name,) + bench(os.path.join(tmpdir, name))
+                   for name in NAMES]
+    print("{} objects".format(count))
+    print("{:<13} {:>10} {:>10} {:>10} {:>10} {:>12}".format(
+        "file", "save ms", "save cpu", "load ms", "load cpu", "bytes"))
+    for result in results:
+        print("{:<13} {:>10.1f} {:>10.1f} {:>10.1f} {:>10.1f} {:>12}".format(
+            *result))
+
+
+if __name__ == "__main__":
+    main()
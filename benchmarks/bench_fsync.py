@@ -0,0 +1,47 @@
+#!/usr/bin/python3
+"""Benchmark FileStorage write throughput under each fsync policy.
+
+Usage: ./benchmarks/bench_fsync.py [objects] [saves]
+"""
+import os
+import sys
+import tempfile
+from time import perf_counter
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import models  # noqa: E402
+from models.engine.file_storage import FileStorage  # noqa: E402
+from models.user import User  # noqa: E402
+
+POLICIES = ("never", "100", "10ms", "always")
+
+
+def bench(policy, journal, objects, saves):
+    """Return the mean duration of a save under a policy, in ms."""
+    FileStorage._FileStorage__objects = {}
+    with tempfile.TemporaryDirectory() as tmpdir:
+        models.storage = FileStorage(path=os.path.join(tmpdir, "file.json"),
+                                     journal=journal, fsync=policy)
+        users = [User() for _ in range(objects)]
+        models.storage.save()
+        start = perf_counter()
+        for i in range(saves):
+            users[i % objects].save()
+        return (perf_counter() - start) * 1000 / saves
+
+
+def main():
+    """Print the mean save duration of each policy and mode."""
+    objects = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    saves = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    print("{} objects, {} saves".format(objects, saves))
+    print("{:<8} {:>12} {:>12}".format("fsync", "snapshot ms", "journal ms"))
+    for policy in POLICIES:
+        print("{:<8} {:>12.3f} {:>12.3f}".format(
+            policy, bench(policy, False, objects, saves),
+            bench(policy, True, objects, saves)))
+
+
+if __name__ == "__main__":
+    main()
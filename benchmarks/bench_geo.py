@@ -0,0 +1,95 @@
+#!/usr/bin/python3
+"""Benchmark the spatial index against a full scan of the places.
+
+Points are clustered around a few cities, like real listings. Reports the
+time to build the index and the mean time of radius, bounding-box and
+nearest-neighbour queries with the index and with a full scan, around the
+cities and, for nearest neighbours, at random points of the globe, most
+of them far from any city.
+
+Usage: ./benchmarks/bench_geo.py [places] [queries]
+"""
+import heapq
+import os
+import random
+import sys
+from time import perf_counter
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from models.engine.geo_index import GeoIndex, haversine  # noqa: E402
+
+CITIES = ((37.77, -122.42), (40.71, -74.01), (48.86, 2.35), (35.68, 139.69),
+          (-33.87, 151.21), (-23.55, -46.63), (6.52, 3.38), (55.76, 37.62))
+
+
+def points(count, rng):
+    """Return count (key, (latitude, longitude)) pairs."""
+    found = []
+    for i in range(count):
+        if i % 10:
+            latitude, longitude = rng.choice(CITIES)
+            point = (max(-90, min(90, rng.gauss(latitude, 0.5))),
+                     (rng.gauss(longitude, 0.5) + 180) % 360 - 180)
+        else:
+            point = (rng.uniform(-90, 90), rng.uniform(-180, 180))
+        found.append(("Place.{}".format(i), point))
+    return found
+
+
+def timed(function, queries):
+    """Return the mean duration of a call to function per query, in ms."""
+    start = perf_counter()
+    for query in queries:
+        function(*query)
+    return (perf_counter() - start) * 1000 / len(queries)
+
+
+def main():
+    """Print the build time and the query times with and without index."""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    nqueries = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    rng = random.Random(0)
+    data = points(count, rng)
+    centers = [(rng.gauss(latitude, 0.5), rng.gauss(longitude, 0.5))
+               for latitude, longitude in (rng.choice(CITIES)
+                                           for _ in range(nqueries))]
+    start = perf_counter()
+    index = GeoIndex()
+    for key, point in data:
+        index.add(key, point)
+    build = (perf_counter() - start) * 1000
+
+    def scan_radius(latitude, longitude, km):
+        return sorted((d, key) for d, key in (
+            (haversine(latitude, longitude, *point), key)
+            for key, point in data) if d <= km)
+
+    def scan_bbox(south, west, north, east):
+        return [key for key, (latitude, longitude) in data
+                if south <= latitude <= north and west <= longitude <= east]
+
+    def scan_nearest(latitude, longitude, k):
+        return heapq.nsmallest(k, ((haversine(latitude, longitude, *point),
+                                    key) for key, point in data))
+
+    radius = [(latitude, longitude, 5) for latitude, longitude in centers]
+    bbox = [(latitude - 0.05, longitude - 0.05, latitude + 0.05,
+             longitude + 0.05) for latitude, longitude in centers]
+    nearest = [(latitude, longitude, 10) for latitude, longitude in centers]
+    far = [(rng.uniform(-90, 90), rng.uniform(-180, 180), 10)
+           for _ in range(nqueries)]
+    scans = centers[:max(1, nqueries // 10)]
+    print("{} places, index built in {:.0f} ms".format(count, build))
+    print("{:<16} {:>10} {:>10}".format("query", "index ms", "scan ms"))
+    for name, query, scan, args in (
+            ("radius 5 km", index.radius, scan_radius, radius),
+            ("bbox 0.1 deg", index.bbox, scan_bbox, bbox),
+            ("nearest 10", index.nearest, scan_nearest, nearest),
+            ("nearest 10 far", index.nearest, scan_nearest, far)):
+        print("{:<16} {:>10.3f} {:>10.1f}".format(
+            name, timed(query, args), timed(scan, args[:len(scans)])))
+
+
+if __name__ == "__main__":
+    main()
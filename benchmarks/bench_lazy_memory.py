@@ -0,0 +1,66 @@
+#!/usr/bin/python3
+"""Compare the memory held by eager, lazy and cached storages.
+
+Writes a snapshot of Place and User records, then reloads it with each
+storage mode and reports the memory allocated once reload() returns and
+once every object has been accessed, along with the peak, in MB. Lazy
+storages keep the objects not instantiated yet, and the objects evicted
+from their cache, encoded rather than as dictionaries.
+
+Usage: ./benchmarks/bench_lazy_memory.py [objects]
+"""
+import gc
+import json
+import os
+import sys
+import tempfile
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from bench_reload import records  # noqa: E402
+from models.engine.file_storage import FileStorage  # noqa: E402
+
+MODES = (("eager", {}),
+         ("lazy", {"lazy": True}),
+         ("cache 100", {"cache_size": 100}),
+         ("mmap", {"mmap": True}),
+         ("mmap cache 100", {"mmap": True, "cache_size": 100}))
+
+
+def measure(path, options):
+    """Return the memory after reload(), after access and at peak, in MB."""
+    FileStorage._FileStorage__objects = {}
+    gc.collect()
+    tracemalloc.start()
+    storage = FileStorage(path=path, **options)
+    storage.reload()
+    loaded = tracemalloc.get_traced_memory()[0]
+    objects = storage.all()
+    for key in list(objects):
+        objects[key]
+    accessed, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del storage, objects
+    FileStorage._FileStorage__objects = {}
+    return loaded / 2 ** 20, accessed / 2 ** 20, peak / 2 ** 20
+
+
+def main():
+    """Print the memory held by each storage mode."""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, "file.json")
+        with open(path, "w") as f:
+            json.dump(records(count), f)
+        results = [(name,) + measure(path, options)
+                   for name, options in MODES]
+    print("{} objects".format(count))
+    print("{:<16} {:>10} {:>12} {:>10}".format("mode", "loaded MB",
+                                               "accessed MB", "peak MB"))
+    for result in results:
+        print("{:<16} {:>10.1f} {:>12.1f} {:>10.1f}".format(*result))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+#!/usr/bin/python3
+"""Compare class dispatch through the model registry and through eval().
+
+Writes a snapshot of Place and User records, then reports the time to
+look the class of every record up and the time of a full reload(), first
+through the registry and then through eval() of the class name, as
+reload() did before.
+
+Usage: ./benchmarks/bench_reload.py [objects]
+"""
+import json
+import os
+import sys
+import tempfile
+from datetime import datetime
+from time import perf_counter
+from unittest.mock import patch
+from uuid import uuid4
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from models.base_model import classes  # noqa: E402
+from models.engine.file_storage import FileStorage  # noqa: E402
+from models.place import Place  # noqa: E402, F401
+from models.user import User  # noqa: E402, F401
+
+
+def records(count):
+    """Return count dictionaries shaped like those of the models."""
+    now = datetime.today().isoformat()
+    document = {}
+    for i in range(count):
+        id = str(uuid4())
+        if i % 2:
+            record = {"id": id, "created_at": now, "updated_at": now,
+                      "city_id": str(uuid4()), "name": "Place {}".format(i),
+                      "price_by_night": 50 + i % 200, "__class__": "Place"}
+        else:
+            record = {"id": id, "created_at": now, "updated_at": now,
+                      "email": "user{}@hbnb.io".format(i),
+                      "__class__": "User"}
+        document["{}.{}".format(record["__class__"], id)] = record
+    return document
+
+
+def eval_instantiate(self, objct):
+    """Instantiate an object the way reload() did before the registry."""
+    objct = dict(objct)
+    class_name = objct.pop("__class__")
+    return eval(class_name)(**objct)
+
+
+def timed(function):
+    """Return the duration of a call to function, in ms."""
+    start = perf_counter()
+    function()
+    return (perf_counter() - start) * 1000
+
+
+def main():
+    """Print the dispatch and reload times with the registry and eval()."""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    document = records(count)
+    names = [record["__class__"] for record in document.values()]
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, "file.json")
+        with open(path, "w") as f:
+            json.dump(document, f)
+        storage = FileStorage(path=path)
+
+        def reload():
+            FileStorage._FileStorage__objects = {}
+            storage.reload()
+
+        registry = (timed(lambda: [classes[name] for name in names]),
+                    timed(reload))
+        with patch.object(FileStorage, "_FileStorage__instantiate",
+                          eval_instantiate):
+            evaluated = (timed(lambda: [eval(name) for name in names]),
+                         timed(reload))
+    print("{} objects".format(count))
+    print("{:<10} {:>12} {:>10}".format("dispatch", "lookup ms", "reload ms"))
+    print("{:<10} {:>12.1f} {:>10.1f}".format("registry", *registry))
+    print("{:<10} {:>12.1f} {:>10.1f}".format("eval", *evaluated))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+#!/usr/bin/python3
+"""Compare the memory used by model instances with and without slots.
+
+Builds Place instances with every declared attribute set, from dictionaries
+shaped like those reload() reads, and reports the bytes allocated per
+instance, beyond the values they share with the dictionaries, first for
+the Place class and then for its slotted variant, along with the time to
+build them, measured separately as tracing allocations slows Python down.
+
+Usage: ./benchmarks/bench_slots.py [objects]
+"""
+import gc
+import os
+import sys
+import tracemalloc
+from datetime import datetime
+from time import perf_counter
+from uuid import uuid4
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from models.place import Place  # noqa: E402
+from models.slotted import slotted  # noqa: E402
+
+
+def records(count):
+    """Return count dictionaries of places with every attribute set."""
+    now = datetime.today().isoformat()
+    return [{"id": str(uuid4()), "created_at": now, "updated_at": now,
+             "city_id": str(uuid4()), "user_id": str(uuid4()),
+             "name": "Place {}".format(i), "description": "Cosy",
+             "number_rooms": i % 5, "number_bathrooms": i % 3,
+             "max_guest": i % 8, "price_by_night": 50 + i % 200,
+             "latitude": 37.7, "longitude": -122.4, "amenity_ids": []}
+            for i in range(count)]
+
+
+def measure(cls, documents):
+    """Return the bytes per instance and the build time in ms of cls."""
+    gc.collect()
+    start = perf_counter()
+    objects = [cls(**record) for record in documents]
+    elapsed = (perf_counter() - start) * 1000
+    del objects
+    gc.collect()
+    tracemalloc.start()
+    objects = [cls(**record) for record in documents]
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del objects
+    return size / len(documents), elapsed
+
+
+def main():
+    """Print the bytes per instance of Place and of its slotted variant."""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    documents = records(count)
+    sample = documents[0]
+    plain = Place(**sample)
+    compact = slotted(Place)(**sample)
+    assert plain.to_dict() == compact.to_dict()
+    assert str(plain) == str(compact)
+    print("{} places".format(count))
+    print("{:<10} {:>14} {:>10}".format("class", "bytes/object", "build ms"))
+    print("{:<10} {:>14.0f} {:>10.1f}".format(
+        "Place", *measure(Place, documents)))
+    print("{:<10} {:>14.0f} {:>10.1f}".format(
+        "slotted", *measure(slotted(Place), documents)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+#!/usr/bin/python3
+"""Compare the JSON and binary snapshot formats on load, save and size.
+
+JSON is loaded both with json.load(), which decodes the whole document in
+C, and with the streamed reader FileStorage uses, one entry at a time.
+The scan column is the time to find the key and span of every record, as
+a memory-mapped storage does on start-up when its index file is missing.
+
+Usage: ./benchmarks/bench_snapshot_format.py [objects]
+"""
+import json
+import os
+import sys
+import tempfile
+from datetime import datetime
+from time import perf_counter
+from uuid import uuid4
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from models.engine import binary_snapshot, json_stream  # noqa: E402
+
+
+def records(count):
+    """Return count dictionaries shaped like those of the models."""
+    now = datetime.today().isoformat()
+    document = {}
+    for i in range(count):
+        id = str(uuid4())
+        if i % 2:
+            record = {"id": id, "created_at": now, "updated_at": now,
+                      "city_id": str(uuid4()), "user_id": str(uuid4()),
+                      "name": "Place {}".format(i), "number_rooms": i % 5,
+                      "price_by_night": 50 + i % 200, "latitude": 37.77,
+                      "longitude": -122.41, "__class__": "Place"}
+        else:
+            record = {"id": id, "created_at": now, "updated_at": now,
+                      "email": "user{}@hbnb.io".format(i),
+                      "first_name": "Betty", "__class__": "User"}
+        document["{}.{}".format(record["__class__"], id)] = record
+    return document
+
+
+def timed(function):
+    """Return the duration of a call to function, in ms."""
+    start = perf_counter()
+    function()
+    return (perf_counter() - start) * 1000
+
+
+def main():
+    """Print the save time, load time and size of each format."""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    document = records(count)
+    with tempfile.TemporaryDirectory() as tmpdir:
+        json_path = os.path.join(tmpdir, "file.json")
+        bin_path = os.path.join(tmpdir, "file.bin")
+
+        def save_json():
+            with open(json_path, "w") as f:
+                json.dump(document, f)
+
+        def load_json():
+            with open(json_path) as f:
+                json.load(f)
+
+        def stream_json():
+            with open(json_path) as f:
+                for _ in json_stream.iter_entries(f):
+                    pass
+
+        def scan_json():
+            with open(json_path) as f:
+                for _ in json_stream.iter_spans(f.read()):
+                    pass
+
+        def save_binary():
+            with open(bin_path, "wb") as f:
+                binary_snapshot.write_entries(
+                    f, ((key, binary_snapshot.encode(key, record))
+                        for key, record in document.items()))
+
+        def load_binary():
+            with open(bin_path, "rb") as f:
+                for _ in binary_snapshot.iter_entries(f):
+                    pass
+
+        def scan_binary():
+            with open(bin_path, "rb") as f:
+                for _ in binary_snapshot.iter_spans(f.read()):
+                    pass
+
+        results = [("json", timed(save_json), timed(load_json),
+                    timed(stream_json), timed(scan_json),
+                    os.path.getsize(json_path)),
+                   ("binary", timed(save_binary), timed(load_binary),
+                    timed(load_binary), timed(scan_binary),
+                    os.path.getsize(bin_path))]
+    print("{} objects".format(count))
+    print("{:<8} {:>10} {:>10} {:>10} {:>10} {:>12}".format(
+        "format", "save ms", "load ms", "stream ms", "scan ms", "bytes"))
+    for result in results:
+        print("{:<8} {:>10.1f} {:>10.1f} {:>10.1f} {:>10.1f} {:>12}".format(
+            *result))
+
+
+if __name__ == "__main__":
+    main()
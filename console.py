@@ -1,16 +1,21 @@
 #!/usr/bin/python3
 """Defining the HBnB console command"""
+import ast
 import cmd as cmd
+import inspect
+import json
 import re as regexp
+from math import isfinite
 from shlex import split
 from models import storage
-from models.base_model import BaseModel
-from models.amenity import Amenity
-from models.city import City
-from models.place import Place
-from models.review import Review
-from models.state import State
-from models.user import User
+from models.base_model import classes
+# Imported to register the model classes in classes
+from models.amenity import Amenity  # noqa: F401
+from models.city import City  # noqa: F401
+from models.place import Place  # noqa: F401
+from models.review import Review  # noqa: F401
+from models.state import State  # noqa: F401
+from models.user import User  # noqa: F401
 
 
 def parse(arg):
@@ -31,6 +36,57 @@ def parse(arg):
         return bracket_retl
 
 
+def literal(arg):
+    """Return the value of a literal, such as an update dictionary.
+
+    The literal is read as JSON first, which covers most payloads and is
+    parsed in C, then as a Python literal for single-quoted strings and
+    the like. Unlike eval(), no other expression is evaluated.
+
+    Raises:
+        ValueError: If arg is not a literal.
+    """
+    try:
+        return json.loads(arg)
+    except ValueError:
+        pass
+    try:
+        return ast.literal_eval(arg)
+    except (SyntaxError, TypeError, ValueError, MemoryError,
+            RecursionError):
+        raise ValueError("not a literal: {!r}".format(arg)) from None
+
+
+_MISSING = object()
+
+# The attributes that update leaves to the model itself
+RESERVED = ("__class__", "id", "created_at", "updated_at")
+
+
+def class_default(cls, name):
+    """Return the default a model class itself declares for an attribute.
+
+    The default of a slotted class is that of the model class it derives
+    from, rather than the slot found in its __dict__.
+
+    Returns:
+        The default, or _MISSING if cls does not declare the attribute.
+    """
+    if name not in cls.__dict__:
+        return _MISSING
+    return getattr(cls, name, _MISSING)
+
+
+def read_only(cls, name):
+    """Return whether an attribute of a model class is computed rather
+    than stored, such as the relationship properties.
+
+    The slots of a slotted class read as the default of their model
+    class, so they are not mistaken for computed attributes.
+    """
+    return inspect.isdatadescriptor(getattr(cls, name, None))
+
+
 class HBNBCommand(cmd.Cmd):
     """Defines the Holbertomdcmd interpreter.
 
@@ -39,15 +95,6 @@ class HBNBCommand(cmd.Cmd):
     """
 
     prompt = "(hbnb) "
-    __classes = {
-        "BaseModel",
-        "Amenity",
-        "City",
-        "Place",
-        "Review",
-        "State",
-        "User"
-    }
 
     def emptyline(self):
         """Do nothing when receiving an empty line."""
@@ -98,6 +145,11 @@ class HBNBCommand(cmd.Cmd):
         print("")
         return True
 
+    def do_compact(self, arg):
+        """Usage: compact
+        Fold the storage journal into a fresh snapshot of the JSON file."""
+        storage.compact()
+
     def do_create(self, arg):
         """Create a new instance of a class and print its ID.
 
@@ -116,10 +168,10 @@ class HBNBCommand(cmd.Cmd):
         arglen = parse(arg)
         if len(arglen) == 0:
             print("** class name missing **")
-        elif arglen[0] not in HBNBCommand.__classes:
+        elif arglen[0] not in classes:
             print("** class doesn't exist **")
         else:
-            print(eval(arglen[0])().id)
+            print(classes[arglen[0]]().id)
             storage.save()
 
     def do_show(self, arg):
@@ -127,33 +179,31 @@ class HBNBCommand(cmd.Cmd):
         Display the string representation of a class instance of a given id.
         """
         arglen = parse(arg)
-        objdictionary = storage.all()
         if len(arglen) == 0:
             print("** class name missing **")
-        elif arglen[0] not in HBNBCommand.__classes:
+        elif arglen[0] not in classes:
             print("** class doesn't exist **")
         elif len(arglen) == 1:
             print("** instance id missing **")
-        elif "{}.{}".format(arglen[0], arglen[1]) not in objdictionary:
+        elif storage.get(arglen[0], arglen[1]) is None:
             print("** no instance found **")
         else:
-            print(objdictionary["{}.{}".format(arglen[0], arglen[1])])
+            print(storage.get(arglen[0], arglen[1]))
 
     def do_destroy(self, arg):
         """Usage: destroy <class> <id> or <class>.destroy(<id>)
         Delete a class instance of a given id."""
         arglen = parse(arg)
-        objdictionary = storage.all()
         if len(arglen) == 0:
             print("** class name missing **")
-        elif arglen[0] not in HBNBCommand.__classes:
+        elif arglen[0] not in classes:
             print("** class doesn't exist **")
         elif len(arglen) == 1:
             print("** instance id missing **")
-        elif "{}.{}".format(arglen[0], arglen[1]) not in objdictionary.keys():
+        elif storage.get(arglen[0], arglen[1]) is None:
             print("** no instance found **")
         else:
-            del objdictionary["{}.{}".format(arglen[0], arglen[1])]
+            storage.delete(storage.get(arglen[0], arglen[1]))
             storage.save()
 
     def do_all(self, arg):
@@ -161,46 +211,92 @@ class HBNBCommand(cmd.Cmd):
         Display string representations of all instances of a given class.
         If no class is specified, displays all instantiated objects."""
         arglen = parse(arg)
-        if len(arglen) > 0 and arglen[0] not in HBNBCommand.__classes:
+        if len(arglen) > 0 and arglen[0] not in classes:
             print("** class doesn't exist **")
         else:
             objlen = []
-            for obj in storage.all().values():
-                if len(arglen) > 0 and arglen[0] == obj.__class__.__name__:
-                    objlen.append(obj.__str__())
-                elif len(arglen) == 0:
-                    objlen.append(obj.__str__())
+            cls = arglen[0] if len(arglen) > 0 else None
+            for obj in storage.all(cls).values():
+                objlen.append(obj.__str__())
             print(objlen)
 
     def do_count(self, arg):
         """Usage: count <class> or <class>.count()
         Retrieve the number of instances of a given class."""
         arglen = parse(arg)
-        counter = 0
-        for obj in storage.all().values():
-            if arglen[0] == obj.__class__.__name__:
-                counter += 1
-        print(counter)
+        print(storage.count(arglen[0]))
+
+    def do_geo(self, arg):
+        """Usage: geo <class> radius <latitude> <longitude> <km> or
+        geo <class> bbox <south> <west> <north> <east> or
+        geo <class> nearest <latitude> <longitude> <k>
+        Display string representations of the instances of a class within
+        a distance of a point, within a bounding box, or closest to a
+        point."""
+        arglen = parse(arg)
+        queries = {"radius": 3, "bbox": 4, "nearest": 3}
+        if len(arglen) == 0:
+            print("** class name missing **")
+        elif arglen[0] not in classes:
+            print("** class doesn't exist **")
+        elif len(arglen) == 1 or arglen[1] not in queries:
+            print("** query missing **")
+        elif len(arglen) != 2 + queries[arglen[1]]:
+            print("** coordinates missing **")
+        else:
+            try:
+                values = [float(value) for value in arglen[2:]]
+            except ValueError:
+                values = None
+            if values is None or not all(map(isfinite, values)):
+                print("** invalid coordinates **")
+                return
+            if arglen[1] == "radius":
+                found = storage.near(arglen[0], *values)
+            elif arglen[1] == "bbox":
+                found = storage.within(arglen[0], *values)
+            else:
+                found = storage.nearest(arglen[0], values[0], values[1],
+                                        int(values[2]))
+            print([obj.__str__() for obj in found])
+
+    def do_search(self, arg):
+        """Usage: search <class> <words>
+        Display string representations of the instances of a class whose
+        text holds every word, best match first. Separate alternatives
+        with OR."""
+        arglen = arg.split(None, 1)
+        if len(arglen) == 0:
+            print("** class name missing **")
+        elif arglen[0] not in classes:
+            print("** class doesn't exist **")
+        elif len(arglen) == 1:
+            print("** query missing **")
+        else:
+            found = storage.search(arglen[0], arglen[1])
+            print([obj.__str__() for obj in found])
 
     def do_update(self, arg):
         """Usage: update <class> <id> <attribute_name> <attribute_value> or
         <class>.update(<id>, <attribute_name>, <attribute_value>) or
         <class>.update(<id>, <dictionary>)
         Update a class instance of a given id by adding or updating
-        a given attribute key/value pair or dictionary."""
+        a given attribute key/value pair or dictionary. The __class__, id,
+        created_at and updated_at attributes are left unchanged, and
+        computed attributes such as reviews are refused."""
         arglen = parse(arg)
-        objdict = storage.all()
 
         if len(arglen) == 0:
             print("** class name missing **")
             return False
-        if arglen[0] not in HBNBCommand.__classes:
+        if arglen[0] not in classes:
             print("** class doesn't exist **")
             return False
         if len(arglen) == 1:
             print("** instance id missing **")
             return False
-        if "{}.{}".format(arglen[0], arglen[1]) not in objdict.keys():
+        obj = storage.get(arglen[0], arglen[1])
+        if obj is None:
             print("** no instance found **")
             return False
         if len(arglen) == 2:
@@ -208,27 +304,33 @@ class HBNBCommand(cmd.Cmd):
             return False
         if len(arglen) == 3:
             try:
-                type(eval(arglen[2])) != dict
-            except NameError:
+                value = literal(arglen[2])
+            except ValueError:
                 print("** value missing **")
                 return False
 
         if len(arglen) == 4:
-            obj = objdict["{}.{}".format(arglen[0], arglen[1])]
-            if arglen[2] in obj.__class__.__dict__.keys():
-                val_type = type(obj.__class__.__dict__[arglen[2]])
-                obj.__dict__[arglen[2]] = val_type(arglen[3])
+            if arglen[2] in RESERVED or read_only(obj.__class__, arglen[2]):
+                print("** attribute can't be updated **")
+                return False
+            default = class_default(obj.__class__, arglen[2])
+            if default is not _MISSING:
+                setattr(obj, arglen[2], type(default)(arglen[3]))
             else:
-                obj.__dict__[arglen[2]] = arglen[3]
-        elif type(eval(arglen[2])) == dict:
-            obj = objdict["{}.{}".format(arglen[0], arglen[1])]
-            for k, v in eval(arglen[2]).items():
-                if (k in obj.__class__.__dict__.keys() and
-                        type(obj.__class__.__dict__[k]) in {str, int, float}):
-                    val_type = type(obj.__class__.__dict__[k])
-                    obj.__dict__[k] = val_type(v)
+                setattr(obj, arglen[2], arglen[3])
+        elif len(arglen) == 3 and type(value) is dict:
+            if any(read_only(obj.__class__, k) for k in value
+                   if k not in RESERVED):
+                print("** attribute can't be updated **")
+                return False
+            for k, v in value.items():
+                if k in RESERVED:
+                    continue
+                default = class_default(obj.__class__, k)
+                if type(default) in {str, int, float}:
+                    setattr(obj, k, type(default)(v))
                 else:
-                    obj.__dict__[k] = v
+                    setattr(obj, k, v)
         storage.save()
 
 
@@ -1,9 +1,57 @@
 #!/usr/bin/python3
-"""Initialize the models package and create a FileStorage instance."""
+"""Initialize the models package and create the storage instance."""
+from multiprocessing import parent_process
+from os import getenv
+from models.base_model import classes
 from models.engine.file_storage import FileStorage
+from models.slotted import slotted
 
-# Create a FileStorage instance to manage object serialization/deserialization
-storage = FileStorage()
 
-# Reload previously stored objects from the serialized file (if any)
-storage.reload()
+def _number(name):
+    """Return the numeric value of an environment variable, if set."""
+    value = getenv(name)
+    return float(value) if value else None
+
+
+def _count(name):
+    """Return the integer value of an environment variable, if set."""
+    value = getenv(name)
+    return int(value) if value else None
+
+
+def _shard(name):
+    """Return the shard option held by an environment variable, if set."""
+    value = getenv(name)
+    return int(value) if value and value.isdigit() else value
+
+
+# Instantiate the slotted variants of the model classes instead
+if getenv("HBNB_SLOTS") == "1":
+    for cls in list(classes.values()):
+        slotted(cls)
+
+# Create the storage instance to manage object serialization/deserialization
+if getenv("HBNB_TYPE_STORAGE") == "sqlite":
+    from models.engine.sqlite_storage import SQLiteStorage
+    storage = SQLiteStorage(path=getenv("HBNB_SQLITE_PATH", "hbnb.db"))
+else:
+    storage = FileStorage(path=getenv("HBNB_STORAGE_PATH"),
+                          journal=getenv("HBNB_STORAGE_JOURNAL") == "1",
+                          compact_threshold=_number("HBNB_COMPACT_THRESHOLD"),
+                          compact_interval=(_number("HBNB_COMPACT_INTERVAL")
+                                            if parent_process() is None
+                                            else None),
+                          fsync=getenv("HBNB_FSYNC", "never"),
+                          coalesce_ms=_number("HBNB_COALESCE_MS") or 0,
+                          lazy=getenv("HBNB_STORAGE_LAZY") == "1",
+                          shard=_shard("HBNB_STORAGE_SHARD"),
+                          shard_pool=getenv("HBNB_SHARD_POOL", "thread"),
+                          mmap=getenv("HBNB_STORAGE_MMAP") == "1",
+                          cache_size=_count("HBNB_STORAGE_CACHE_SIZE"))
+
+# Reload previously stored objects from the serialized file (if any).
+# Processes started by multiprocessing, such as the spawned workers of
+# the pool reading the shard files, leave loading and compaction to the
+# process that started them, which would otherwise start them again.
+if parent_process() is None:
+    storage.reload()
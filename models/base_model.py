@@ -4,9 +4,50 @@ from uuid import uuid4
 import models
 from datetime import datetime
 
+# The model classes by name, filled in as BaseModel is subclassed
+classes = {}
+
+# The format of the dates of the dictionaries given to __init__
+TIME_FORMAT = "%Y-%m-%dT%H:%M:%S.%f"
+
+
+def stored(obj):
+    """Return whether a model instance is stored under its key."""
+    id = getattr(obj, "id", None)
+    return id is not None and models.storage.get(type(obj), id) is obj
+
 
 class BaseModel:
-    """Stands for the BaseModel of the HBnB application"""
+    """Stands for the BaseModel of the HBnB application
+
+    Attributes:
+        __indexes__ (tuple): The names of the attributes the storage keeps
+            a hash index of, for storage.find() to look objects up by.
+        __ranges__ (tuple): The names of the numeric attributes the storage
+            keeps a sorted index of, for storage.find_range().
+        __sets__ (tuple): The names of the list attributes the storage
+            keeps a bitmap index of, for storage.find() to look objects up
+            by the items they hold.
+        __geo__ (tuple): The names of the latitude and longitude attributes
+            the storage keeps a spatial index of, for storage.near(),
+            within() and nearest().
+        __text__ (tuple): The names of the text attributes the storage
+            keeps an inverted index of, for storage.search().
+        __columns__ (tuple): The names of the numeric and id attributes the
+            storage keeps in a columnar table, for storage.columns().
+    """
+
+    __indexes__ = ()
+    __ranges__ = ()
+    __sets__ = ()
+    __geo__ = ()
+    __text__ = ()
+    __columns__ = ()
+
+    def __init_subclass__(cls, **kwargs):
+        """Register a model class in classes under its name."""
+        super().__init_subclass__(**kwargs)
+        classes[cls.__name__] = cls
 
     def __init__(self, *args, **kwargs):
         """BaseModel is the base class for all models in this application.
@@ -16,19 +57,31 @@ class BaseModel:
             created_at (datetime): When an instance is created.
             updated_at (datetime): When an instance is last updated.
         """
-        time_format = "%Y-%m-%dT%H:%M:%S.%f"
         self.id = str(uuid4())
         self.created_at = datetime.today()
         self.updated_at = datetime.today()
         if len(kwargs) != 0:
             for k, v in kwargs.items():
                 if k == "created_at" or k == "updated_at":
-                    self.__dict__[k] = datetime.strptime(v, time_format)
+                    self.__dict__[k] = datetime.strptime(v, TIME_FORMAT)
                 else:
                     self.__dict__[k] = v
         else:
             models.storage.new(self)
 
+    def __setattr__(self, name, value):
+        """Set an attribute and mark the instance as modified in storage.
+
+        A stored instance whose id changes is moved to its new key.
+        """
+        moved = name == "id" and stored(self)
+        if moved:
+            models.storage.delete(self)
+        super().__setattr__(name, value)
+        if moved:
+            models.storage.new(self)
+        models.storage.touch(self)
+
     def save(self):
         """Update the 'updated_at' attribute with the current datetime
         and save the instance to the storage system.
@@ -56,3 +109,6 @@ class BaseModel:
         """Return the print/str representation of the BaseModel instance."""
         class_name = self.__class__.__name__
         return "[{}] ({}) {}".format(class_name, self.id, self.__dict__)
+
+
+classes["BaseModel"] = BaseModel
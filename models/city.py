@@ -1,6 +1,8 @@
 #!/usr/bin/python3
 """Defines the City class."""
+import models
 from models.base_model import BaseModel
+from models.place import Place
 
 
 class City(BaseModel):
@@ -9,7 +11,14 @@ class City(BaseModel):
     Attributes:
         state_id (str): The state id.
         name (str): The name of the city.
+        __indexes__ (tuple): The attributes indexed by the storage.
     """
 
+    __indexes__ = ("state_id",)
     state_id = ""
     name = ""
+
+    @property
+    def places(self):
+        """list: The places of the city."""
+        return models.storage.find(Place, city_id=self.id)
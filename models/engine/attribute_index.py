@@ -0,0 +1,65 @@
+#!/usr/bin/python3
+"""Defines the AttributeIndex class."""
+
+
+class AttributeIndex:
+    """Hash index of the objects of one class by the value of an attribute.
+
+    Objects whose value cannot be hashed, such as a list, are left out of
+    the index; no hashable value looked up can be equal to theirs.
+
+    Attributes:
+        name (str): The name of the indexed attribute.
+        __keys (dict): The keys of the objects holding each value, each
+            held in a dict to keep their order.
+        __values (dict): The indexed value of each key.
+    """
+
+    def __init__(self, name):
+        """Initialize an AttributeIndex.
+
+        Args:
+            name (str): The name of the indexed attribute.
+        """
+        self.name = name
+        self.__keys = {}
+        self.__values = {}
+
+    def add(self, key, value):
+        """Index the object of key under value, replacing its old value.
+
+        Args:
+            key (str): The "<class>.<id>" key of the object.
+            value: The value of the attribute of the object.
+        """
+        if key in self.__values:
+            if self.__values[key] == value:
+                return
+            self.remove(key)
+        try:
+            self.__keys.setdefault(value, {})[key] = None
+        except TypeError:
+            return
+        self.__values[key] = value
+
+    def remove(self, key):
+        """Remove the object of key from the index, if it is indexed."""
+        if key not in self.__values:
+            return
+        value = self.__values.pop(key)
+        keys = self.__keys[value]
+        del keys[key]
+        if not keys:
+            del self.__keys[value]
+
+    def lookup(self, value):
+        """Return the keys of the objects holding value, in index order.
+
+        Raises:
+            TypeError: If value cannot be hashed.
+        """
+        return list(self.__keys.get(value, ()))
+
+    def __len__(self):
+        """Return the number of indexed objects."""
+        return len(self.__values)
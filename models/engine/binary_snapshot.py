@@ -0,0 +1,617 @@
+#!/usr/bin/python3
+"""Defines a compact binary format for storage snapshots.
+
+A snapshot starts with the MAGIC bytes and a table of the names it uses
+(class and attribute names), followed by one length-prefixed record per
+object and a zero length ending the file. Within records:
+    - class and attribute names are 2-byte indexes into the name table,
+    - ids and other UUID strings are stored as 16 bytes,
+    - created_at and updated_at are 8-byte microsecond timestamps,
+    - other values are tagged with their type.
+Records that do not fit this shape (foreign ids, timezone-aware dates)
+fall back to generic tagged values, so every dictionary round-trips.
+
+Records are encoded independently of each other, so FileStorage can cache
+the encoding of each object just like it caches its JSON form.
+"""
+import json
+import struct
+from datetime import datetime, timedelta
+from models.engine import json_stream
+from models.base_model import BaseModel
+from models.amenity import Amenity
+from models.city import City
+from models.place import Place
+from models.review import Review
+from models.state import State
+from models.user import User
+
+MAGIC = b"HBNB\x01"
+
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+_MINUTE = timedelta(minutes=1)
+_INLINE = 0xFFFF
+
+_U8 = struct.Struct("<B")
+_U16 = struct.Struct("<H")
+_U32 = struct.Struct("<I")
+_I64 = struct.Struct("<q")
+_F64 = struct.Struct("<d")
+_TIMESTAMPS = struct.Struct("<qq")
+# The flags, class name, id, timestamps and attribute count of a record
+# with a UUID id, timestamps and no explicit key
+_HEADER = struct.Struct("<BH16sqqH")
+# A name index followed by the tag of its value
+_NAME_TAG = struct.Struct("<HB")
+# A tag followed by a number or a length
+_TAG_I64 = struct.Struct("<Bq")
+_TAG_F64 = struct.Struct("<Bd")
+_TAG_U32 = struct.Struct("<BI")
+
+_UUID_ID = 1
+_FIXED_TIMESTAMPS = 2
+_EXPLICIT_KEY = 4
+
+_NONE, _TRUE, _FALSE, _INT, _FLOAT, _STR, _UUID, _LIST, _DICT, _BIGINT = \
+    range(10)
+
+
+def _default_names():
+    """Return the class and attribute names of the models."""
+    names = ["id", "created_at", "updated_at"]
+    for cls in (BaseModel, Amenity, City, Place, Review, State, User):
+        names.append(cls.__name__)
+        names.extend(k for k, v in vars(cls).items()
+                     if not k.startswith("_") and not callable(v) and
+                     not isinstance(v, property) and k not in names)
+    return names
+
+
+NAMES = _default_names()
+_REFS = {name: i for i, name in enumerate(NAMES)}
+_NAME_BYTES = {name: _U16.pack(i) for i, name in enumerate(NAMES)}
+_TAGS = [_U8.pack(tag) for tag in range(_BIGINT + 1)]
+# The keys of a record stored in its header rather than as attributes
+_SKIP = frozenset(("__class__", "id"))
+_SKIP_TIMESTAMPS = _SKIP | {"created_at", "updated_at"}
+
+
+def _uuid_bytes(value):
+    """Return the 16 bytes of a canonical UUID string, or None."""
+    if (len(value) != 36 or value[8] != "-" or value[13] != "-" or
+            value[18] != "-" or value[23] != "-"):
+        return None
+    digits = value.replace("-", "")
+    try:
+        data = bytes.fromhex(digits)
+    except ValueError:
+        return None
+    return data if data.hex() == digits else None
+
+
+def _uuid_str(data):
+    """Return the canonical string of the UUID of 16 bytes."""
+    h = data.hex()
+    return "-".join((h[:8], h[8:12], h[12:16], h[16:20], h[20:]))
+
+
+def _timestamp(value):
+    """Return value as microseconds since the epoch, or None.
+
+    Only the strings datetime.isoformat() returns for naive datetimes are
+    converted, so that decoding gives the string back.
+    """
+    if (type(value) is not str or len(value) not in (19, 26) or
+            value[4] != "-" or value[7] != "-" or value[10] != "T" or
+            value[13] != ":" or value[16] != ":"):
+        return None
+    try:
+        dt = datetime.fromisoformat(value)
+    except ValueError:
+        return None
+    if dt.tzinfo is not None:
+        return None
+    if len(value) == 26 and (value[19] != "." or not dt.microsecond):
+        return None
+    return (dt - _EPOCH) // _MICROSECOND
+
+
+def _str(value):
+    """Encode a length-prefixed UTF-8 string."""
+    data = value.encode()
+    return _U32.pack(len(data)) + data
+
+
+def _name(value):
+    """Encode a name as an index into the name table, or inline."""
+    ref = _REFS.get(value)
+    if ref is None:
+        return _U16.pack(_INLINE) + _str(value)
+    return _U16.pack(ref)
+
+
+def _value(value, out):
+    """Append the tagged encoding of a JSON value to out."""
+    kind = type(value)
+    if kind is str:
+        data = _uuid_bytes(value)
+        if data is not None:
+            out.append(_TAGS[_UUID] + data)
+        else:
+            data = value.encode()
+            out.append(_TAG_U32.pack(_STR, len(data)) + data)
+    elif kind is int:
+        if -2 ** 63 <= value < 2 ** 63:
+            out.append(_TAG_I64.pack(_INT, value))
+        else:
+            out.append(_TAGS[_BIGINT] + _str(str(value)))
+    elif kind is float:
+        out.append(_TAG_F64.pack(_FLOAT, value))
+    elif value is None:
+        out.append(_TAGS[_NONE])
+    elif kind is bool:
+        out.append(_TAGS[_TRUE if value else _FALSE])
+    elif kind is list or kind is tuple:
+        out.append(_TAG_U32.pack(_LIST, len(value)))
+        for item in value:
+            _value(item, out)
+    elif kind is dict:
+        out.append(_TAG_U32.pack(_DICT, len(value)))
+        for k, item in value.items():
+            out.append(_str(k))
+            _value(item, out)
+    else:
+        raise TypeError("cannot encode {!r}".format(value))
+
+
+def encode(key, record):
+    """Return the binary encoding of a record.
+
+    Args:
+        key (str): The "<class>.<id>" key of the record.
+        record (dict): The dictionary of the object, as returned by its
+            to_dict() method.
+    """
+    class_name = record["__class__"]
+    id = record["id"]
+    flags = 0
+    id_bytes = _uuid_bytes(id) if type(id) is str else None
+    if id_bytes is not None:
+        flags |= _UUID_ID
+    created_at = _timestamp(record.get("created_at"))
+    updated_at = _timestamp(record.get("updated_at"))
+    skip = _SKIP
+    if created_at is not None and updated_at is not None:
+        flags |= _FIXED_TIMESTAMPS
+        skip = _SKIP_TIMESTAMPS
+    if key != "{}.{}".format(class_name, id):
+        flags |= _EXPLICIT_KEY
+    count = len(record) - len(skip)
+    ref = _REFS.get(class_name)
+    if flags == _UUID_ID | _FIXED_TIMESTAMPS and ref is not None:
+        out = [_HEADER.pack(flags, ref, id_bytes, created_at, updated_at,
+                            count)]
+    else:
+        out = [_U8.pack(flags)]
+        if flags & _EXPLICIT_KEY:
+            out.append(_str(key))
+        out.append(_name(class_name))
+        if flags & _UUID_ID:
+            out.append(id_bytes)
+        else:
+            _value(id, out)
+        if flags & _FIXED_TIMESTAMPS:
+            out.append(_TIMESTAMPS.pack(created_at, updated_at))
+        out.append(_U16.pack(count))
+    for name, value in record.items():
+        if name in skip:
+            continue
+        out.append(_NAME_BYTES.get(name) or _name(name))
+        if type(value) is str and len(value) != 36:
+            # Not a UUID
+            data = value.encode()
+            out.append(_TAG_U32.pack(_STR, len(data)) + data)
+        else:
+            _value(value, out)
+    return b"".join(out)
+
+
+class Decoder:
+    """Decode the records of one snapshot against its name table.
+
+    The records of the models, with a UUID id and timestamps, are read
+    through a single struct for their fixed header, and the values of
+    their attributes in one loop, without a call per value for strings,
+    UUIDs and numbers.
+    """
+
+    def __init__(self, names):
+        """Initialize a Decoder with the name table of the snapshot."""
+        self.names = names
+        self.__minutes = {}
+
+    def record(self, data, pos=0):
+        """Return the (key, dictionary) pair of an encoded record.
+
+        Args:
+            data (bytes): The record, or a buffer holding it.
+            pos (int): The offset of the record in data.
+        """
+        names = self.names
+        if data[pos] == _UUID_ID | _FIXED_TIMESTAMPS:
+            (flags, ref, id, created_at, updated_at,
+             count) = _HEADER.unpack_from(data, pos)
+        else:
+            ref = _INLINE
+        if ref != _INLINE:
+            class_name = names[ref]
+            id = _uuid_str(id)
+            record = {"id": id, "created_at": self.__isoformat(created_at),
+                      "updated_at": self.__isoformat(updated_at)}
+            key = None
+            pos += _HEADER.size
+        else:
+            key, class_name, record, count, pos = self.__header(data, pos)
+        for _ in range(count):
+            ref, tag = _NAME_TAG.unpack_from(data, pos)
+            pos += _NAME_TAG.size
+            if ref == _INLINE:
+                name, pos = _read_str(data, pos - 1)
+                tag = data[pos]
+                pos += 1
+            else:
+                name = names[ref]
+            if tag == _STR:
+                size = _U32.unpack_from(data, pos)[0]
+                pos += _U32.size + size
+                record[name] = str(data[pos - size:pos], "utf-8")
+            elif tag == _UUID:
+                pos += 16
+                record[name] = _uuid_str(data[pos - 16:pos])
+            elif tag == _INT:
+                record[name] = _I64.unpack_from(data, pos)[0]
+                pos += _I64.size
+            elif tag == _FLOAT:
+                record[name] = _F64.unpack_from(data, pos)[0]
+                pos += _F64.size
+            else:
+                record[name], pos = _read_value(data, pos - 1)
+        record["__class__"] = class_name
+        if key is None:
+            key = "{}.{}".format(class_name, record["id"])
+        return key, record
+
+    def key(self, data, pos=0):
+        """Return the key of an encoded record, decoding nothing else.
+
+        Args:
+            data (bytes): The record, or a buffer holding it.
+            pos (int): The offset of the record in data.
+        """
+        if data[pos] == _UUID_ID | _FIXED_TIMESTAMPS:
+            ref = _U16.unpack_from(data, pos + 1)[0]
+            if ref != _INLINE:
+                return "{}.{}".format(self.names[ref], _uuid_str(
+                    data[pos + 3:pos + 19]))
+        return self.__header(data, pos)[0]
+
+    def __isoformat(self, timestamp):
+        """Return the ISO format of a timestamp in microseconds since the
+        epoch, as datetime.isoformat() does.
+
+        The date, hour and minute are formatted once per minute, which the
+        timestamps of objects created together share.
+        """
+        minute, micro = divmod(timestamp, 60000000)
+        prefix = self.__minutes.get(minute)
+        if prefix is None:
+            prefix = (_EPOCH + minute * _MINUTE).isoformat()[:16]
+            self.__minutes[minute] = prefix
+        seconds, micro = divmod(micro, 1000000)
+        if micro:
+            return "%s:%02d.%06d" % (prefix, seconds, micro)
+        return "%s:%02d" % (prefix, seconds)
+
+    def __header(self, data, pos):
+        """Decode the header of any record.
+
+        Returns:
+            tuple: The key of the record, its class name, its dictionary
+                holding its id and timestamps, its number of attributes
+                and the offset of the first one.
+        """
+        flags = data[pos]
+        pos += 1
+        key = None
+        if flags & _EXPLICIT_KEY:
+            key, pos = _read_str(data, pos)
+        ref = _U16.unpack_from(data, pos)[0]
+        pos += _U16.size
+        if ref == _INLINE:
+            class_name, pos = _read_str(data, pos)
+        else:
+            class_name = self.names[ref]
+        record = {}
+        if flags & _UUID_ID:
+            record["id"] = _uuid_str(data[pos:pos + 16])
+            pos += 16
+        else:
+            record["id"], pos = _read_value(data, pos)
+        if flags & _FIXED_TIMESTAMPS:
+            created_at, updated_at = _TIMESTAMPS.unpack_from(data, pos)
+            pos += _TIMESTAMPS.size
+            record["created_at"] = self.__isoformat(created_at)
+            record["updated_at"] = self.__isoformat(updated_at)
+        count = _U16.unpack_from(data, pos)[0]
+        pos += _U16.size
+        if key is None:
+            key = "{}.{}".format(class_name, record["id"])
+        return key, class_name, record, count, pos
+
+
+_decoder = Decoder(NAMES)
+
+
+def decode(fragment):
+    """Return the dictionary of a binary encoding.
+
+    Args:
+        fragment (bytes): The record, as returned by encode().
+    """
+    return _decoder.record(fragment)[1]
+
+
+def _read_str(data, pos):
+    """Return a length-prefixed string of data and the offset after it."""
+    size = _U32.unpack_from(data, pos)[0]
+    pos += _U32.size + size
+    return str(data[pos - size:pos], "utf-8"), pos
+
+
+def _read_value(data, pos):
+    """Return the tagged value of data at pos and the offset after it."""
+    tag = data[pos]
+    pos += 1
+    if tag == _STR:
+        return _read_str(data, pos)
+    if tag == _UUID:
+        return _uuid_str(data[pos:pos + 16]), pos + 16
+    if tag == _INT:
+        return _I64.unpack_from(data, pos)[0], pos + _I64.size
+    if tag == _FLOAT:
+        return _F64.unpack_from(data, pos)[0], pos + _F64.size
+    if tag == _NONE:
+        return None, pos
+    if tag == _TRUE:
+        return True, pos
+    if tag == _FALSE:
+        return False, pos
+    if tag == _LIST:
+        count = _U32.unpack_from(data, pos)[0]
+        pos += _U32.size
+        value = []
+        for _ in range(count):
+            item, pos = _read_value(data, pos)
+            value.append(item)
+        return value, pos
+    if tag == _DICT:
+        count = _U32.unpack_from(data, pos)[0]
+        pos += _U32.size
+        value = {}
+        for _ in range(count):
+            k, pos = _read_str(data, pos)
+            value[k], pos = _read_value(data, pos)
+        return value, pos
+    if tag == _BIGINT:
+        value, pos = _read_str(data, pos)
+        return int(value), pos
+    raise ValueError("unknown value tag {}".format(tag))
+
+
+def _read_exactly(f, size):
+    """Read size bytes from f, raising ValueError on a truncated file."""
+    data = f.read(size)
+    if len(data) != size:
+        raise ValueError("truncated snapshot")
+    return data
+
+
+def write_entries(f, entries):
+    """Write a snapshot to f one record at a time.
+
+    Args:
+        f (file): A binary file opened for writing.
+        entries (iterable): The (key, record) pairs of the snapshot, where
+            record is already encoded with encode().
+
+    Returns:
+        list: The (key, start, end) span of each record in the file, as
+            produced by iter_spans().
+    """
+    header = MAGIC + _U32.pack(len(NAMES)) + b"".join(
+        _str(name) for name in NAMES)
+    f.write(header)
+    spans = []
+    offset = len(header)
+    for key, record in entries:
+        f.write(_U32.pack(len(record)) + record)
+        start = offset + _U32.size
+        offset = start + len(record)
+        spans.append((key, start, offset))
+    f.write(_U32.pack(0))
+    return spans
+
+
+def read_header(data):
+    """Return the name table of a snapshot and the offset of its records.
+
+    Args:
+        data (bytes): The content of the snapshot, or a buffer over it.
+
+    Raises:
+        ValueError: If data does not hold a snapshot.
+    """
+    if data[:len(MAGIC)] != MAGIC:
+        raise ValueError("not a binary snapshot")
+    try:
+        pos = len(MAGIC)
+        count = _U32.unpack_from(data, pos)[0]
+        pos += _U32.size
+        names = []
+        for _ in range(count):
+            size = _U32.unpack_from(data, pos)[0]
+            pos += _U32.size
+            names.append(bytes(data[pos:pos + size]).decode())
+            pos += size
+    except struct.error:
+        raise ValueError("truncated snapshot")
+    return names, pos
+
+
+def iter_spans(data):
+    """Yield the key and the span of each record of a snapshot.
+
+    Args:
+        data (bytes): The content of the snapshot, or a buffer over it.
+
+    Yields:
+        tuple: (key, start, end) where data[start:end] is the record of
+            key, to decode with a Decoder of the snapshot name table.
+
+    Raises:
+        ValueError: If data does not hold a snapshot.
+    """
+    names, pos = read_header(data)
+    decoder = Decoder(names)
+    while True:
+        try:
+            size = _U32.unpack_from(data, pos)[0]
+        except struct.error:
+            raise ValueError("truncated snapshot")
+        if not size:
+            return
+        start = pos + _U32.size
+        pos = start + size
+        if pos > len(data):
+            raise ValueError("truncated snapshot")
+        yield decoder.key(data, start), start, pos
+
+
+def _fill(f, buffer, pos, size, chunk_size):
+    """Return buffer from pos on, extended to hold at least size bytes.
+
+    Raises:
+        ValueError: If f ends first.
+    """
+    chunks = [buffer[pos:]]
+    missing = size - len(chunks[0])
+    while missing > 0:
+        chunk = f.read(max(chunk_size, missing))
+        if not chunk:
+            raise ValueError("truncated snapshot")
+        chunks.append(chunk)
+        missing -= len(chunk)
+    return b"".join(chunks)
+
+
+def iter_entries(f, chunk_size=1 << 20):
+    """Yield the (key, dictionary) pairs of the snapshot stored in f.
+
+    Args:
+        f (file): A binary file opened for reading.
+        chunk_size (int): The number of bytes read at a time.
+
+    Raises:
+        ValueError: If f does not hold a snapshot.
+    """
+    decoder = Decoder(_read_names(f))
+    for buffer, start, end in _iter_records(f, chunk_size):
+        yield decoder.record(buffer, start)
+
+
+def iter_fragments(f, chunk_size=1 << 20):
+    """Yield the key and the encoding of each record of the snapshot in f.
+
+    Only the key of each record is decoded. The encoding is a copy of the
+    record as stored, as returned by encode(), unless the snapshot was
+    written with another name table, in which case the record is decoded
+    and encoded again.
+
+    Args:
+        f (file): A binary file opened for reading.
+        chunk_size (int): The number of bytes read at a time.
+
+    Raises:
+        ValueError: If f does not hold a snapshot.
+    """
+    names = _read_names(f)
+    decoder = Decoder(names)
+    for buffer, start, end in _iter_records(f, chunk_size):
+        if names == NAMES:
+            yield decoder.key(buffer, start), buffer[start:end]
+        else:
+            key, record = decoder.record(buffer, start)
+            yield key, encode(key, record)
+
+
+def _read_names(f):
+    """Read the header of the snapshot in f and return its name table.
+
+    Raises:
+        ValueError: If f does not hold a snapshot.
+    """
+    if f.read(len(MAGIC)) != MAGIC:
+        raise ValueError("not a binary snapshot")
+    names = []
+    for _ in range(_U32.unpack(_read_exactly(f, 4))[0]):
+        size = _U32.unpack(_read_exactly(f, 4))[0]
+        names.append(_read_exactly(f, size).decode())
+    return names
+
+
+def _iter_records(f, chunk_size):
+    """Yield the (buffer, start, end) span of each record following the header.
+
+    Raises:
+        ValueError: If f ends before the end marker.
+    """
+    buffer = b""
+    pos = 0
+    while True:
+        if pos + _U32.size > len(buffer):
+            buffer = _fill(f, buffer, pos, _U32.size, chunk_size)
+            pos = 0
+        size = _U32.unpack_from(buffer, pos)[0]
+        if not size:
+            return
+        if pos + _U32.size + size > len(buffer):
+            buffer = _fill(f, buffer, pos, _U32.size + size, chunk_size)
+            pos = 0
+        pos += _U32.size
+        yield buffer, pos, pos + size
+        pos += size
+
+
+def json_to_binary(src, dst):
+    """Convert a JSON storage file into a binary snapshot.
+
+    Args:
+        src (str): The path of the JSON file.
+        dst (str): The path of the snapshot to write.
+    """
+    with open(src) as fin, open(dst, "wb") as fout:
+        write_entries(fout, ((key, encode(key, record)) for key, record
+                             in json_stream.iter_entries(fin)))
+
+
+def binary_to_json(src, dst):
+    """Convert a binary snapshot into a JSON storage file.
+
+    Args:
+        src (str): The path of the snapshot.
+        dst (str): The path of the JSON file to write.
+    """
+    with open(src, "rb") as fin, open(dst, "w") as fout:
+        json_stream.write_entries(fout, ((key, json.dumps(record)) for
+                                         key, record in iter_entries(fin)))
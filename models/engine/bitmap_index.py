@@ -0,0 +1,119 @@
+#!/usr/bin/python3
+"""Defines the BitmapIndex class."""
+
+
+class BitmapIndex:
+    """Bitmap index of the objects of one class by the items of a list.
+
+    Every indexed object is given a bit, and every item found in the list
+    attribute of some object a bitmap, stored as a Python int, with the
+    bits of the objects holding it set. Objects holding all or any of
+    several items are then found with bitwise AND or OR.
+
+    Attributes:
+        name (str): The name of the indexed list attribute.
+        __bits (dict): The bit of each key.
+        __keys (list): The key of each bit, or None for a free bit.
+        __free (list): The free bits, reused before new ones.
+        __bitmaps (dict): The bitmap of each item.
+        __values (dict): The indexed items of each key.
+    """
+
+    def __init__(self, name):
+        """Initialize a BitmapIndex.
+
+        Args:
+            name (str): The name of the indexed list attribute.
+        """
+        self.name = name
+        self.__bits = {}
+        self.__keys = []
+        self.__free = []
+        self.__bitmaps = {}
+        self.__values = {}
+
+    def add(self, key, value):
+        """Index the object of key under the items of value.
+
+        Args:
+            key (str): The "<class>.<id>" key of the object.
+            value (list): The items of the list attribute of the object.
+                Values that are not lists, tuples or sets hold no item,
+                and items that cannot be hashed are left out.
+        """
+        items = set()
+        if type(value) in (list, tuple, set, frozenset):
+            for item in value:
+                try:
+                    items.add(item)
+                except TypeError:
+                    pass
+        if key in self.__values:
+            if self.__values[key] == items:
+                return
+            self.remove(key)
+        if self.__free:
+            bit = self.__free.pop()
+            self.__keys[bit] = key
+        else:
+            bit = len(self.__keys)
+            self.__keys.append(key)
+        self.__bits[key] = bit
+        self.__values[key] = items
+        for item in items:
+            self.__bitmaps[item] = self.__bitmaps.get(item, 0) | 1 << bit
+
+    def remove(self, key):
+        """Remove the object of key from the index, if it is indexed."""
+        if key not in self.__values:
+            return
+        bit = self.__bits.pop(key)
+        mask = ~(1 << bit)
+        for item in self.__values.pop(key):
+            bitmap = self.__bitmaps[item] & mask
+            if bitmap:
+                self.__bitmaps[item] = bitmap
+            else:
+                del self.__bitmaps[item]
+        self.__keys[bit] = None
+        self.__free.append(bit)
+
+    def having_all(self, items):
+        """Return the keys of the objects holding every item.
+
+        Raises:
+            TypeError: If an item cannot be hashed.
+        """
+        items = list(items)
+        if not items:
+            return [key for key in self.__keys if key is not None]
+        bitmap = -1
+        for item in items:
+            bitmap &= self.__bitmaps.get(item, 0)
+            if not bitmap:
+                return []
+        return self.__decode(bitmap)
+
+    def having_any(self, items):
+        """Return the keys of the objects holding at least one item.
+
+        Raises:
+            TypeError: If an item cannot be hashed.
+        """
+        bitmap = 0
+        for item in items:
+            bitmap |= self.__bitmaps.get(item, 0)
+        return self.__decode(bitmap)
+
+    def __len__(self):
+        """Return the number of indexed objects."""
+        return len(self.__values)
+
+    def __decode(self, bitmap):
+        """Return the keys of the bits set in bitmap, in order of bits."""
+        keys = []
+        while bitmap:
+            low = bitmap & -bitmap
+            keys.append(self.__keys[low.bit_length() - 1])
+            bitmap ^= low
+        return keys
@@ -0,0 +1,278 @@
+#!/usr/bin/python3
+"""Defines the ColumnTable class."""
+import operator
+from array import array
+from itertools import compress, repeat
+from math import fsum, nan
+from models.engine.criteria import parse
+
+_COMPARISONS = {None: operator.eq, "lt": operator.lt, "lte": operator.le,
+                "gt": operator.gt, "gte": operator.ge}
+
+
+class ColumnTable:
+    """Columnar table of the objects of one class.
+
+    Every object is a row of the table. A numeric column holds the values
+    of an attribute in an array of doubles, NaN standing for values that
+    are not numbers. An id column holds the strings of an attribute, such
+    as Place.city_id, as codes in an array of integers, each string being
+    stored once in a table shared by the id columns, -1 standing for
+    values that are not strings. Rows stay contiguous: removing an object
+    moves the last row into its place.
+
+    Filters and aggregates run over the arrays through the C loops of
+    map(), compress() and fsum() instead of reading the attributes of
+    objects one at a time. The arrays support the buffer protocol, so
+    numpy.frombuffer(table.column(name)) views a column without copying.
+
+    Attributes:
+        name (tuple): The names of the columns.
+        __kinds (dict): The kind of each column, by name: float for a
+            numeric column, str for an id column.
+        __columns (dict): The array of each column, by name.
+        __nans (dict): The number of NaN values of each numeric column.
+        __strings (list): The strings of the id columns, by code.
+        __codes (dict): The code of each string.
+        __keys (list): The key of each row.
+        __rows (dict): The row of each key.
+    """
+
+    def __init__(self, name, kinds):
+        """Initialize a ColumnTable.
+
+        Args:
+            name (tuple): The names of the columns.
+            kinds (tuple): The kind of each column: str for an id column,
+                int or float for a numeric one.
+        """
+        self.name = name
+        self.__kinds = {}
+        self.__columns = {}
+        self.__nans = {}
+        for column, kind in zip(name, kinds):
+            if kind is str:
+                self.__kinds[column] = str
+                self.__columns[column] = array("q")
+            else:
+                self.__kinds[column] = float
+                self.__columns[column] = array("d")
+                self.__nans[column] = 0
+        self.__strings = []
+        self.__codes = {}
+        self.__keys = []
+        self.__rows = {}
+
+    def add(self, key, value):
+        """Store the values of the object of key in its row.
+
+        Args:
+            key (str): The "<class>.<id>" key of the object.
+            value (tuple): The values of the columns of the object.
+        """
+        row = self.__rows.get(key)
+        if row is None:
+            row = self.__rows[key] = len(self.__keys)
+            self.__keys.append(key)
+            for column in self.name:
+                self.__columns[column].append(0)
+        for column, cell in zip(self.name, value):
+            self.__set(column, row, cell)
+
+    def remove(self, key):
+        """Remove the row of the object of key, if it has one."""
+        row = self.__rows.pop(key, None)
+        if row is None:
+            return
+        last = self.__keys.pop()
+        for column, values in self.__columns.items():
+            value = values.pop()
+            if row != len(self.__keys):
+                removed, values[row] = values[row], value
+            else:
+                removed = value
+            if column in self.__nans and removed != removed:
+                self.__nans[column] -= 1
+        if row != len(self.__keys):
+            self.__keys[row] = last
+            self.__rows[last] = row
+
+    def column(self, name):
+        """Return the array of a column, in row order.
+
+        The array is the one the table keeps up to date, and must not be
+        modified. The codes of an id column are turned back into strings
+        by string().
+
+        Raises:
+            KeyError: If the table has no such column.
+        """
+        return self.__columns[name]
+
+    def string(self, code):
+        """Return the string of a code of an id column, or None for -1."""
+        return self.__strings[code] if code >= 0 else None
+
+    def keys(self, **criteria):
+        """Return the keys of the rows matching criteria, in row order.
+
+        Args:
+            **criteria: The value of each criterion, as described in
+                models.engine.criteria: an equality on any column, or
+                bounds on a numeric column.
+
+        Raises:
+            ValueError: If a criterion is not on a column of the table or
+                its operator is not supported by it.
+        """
+        mask = self.__mask(criteria)
+        if mask is None:
+            return list(self.__keys)
+        return list(compress(self.__keys, mask))
+
+    def count(self, **criteria):
+        """Return the number of rows matching criteria, as keys() does."""
+        mask = self.__mask(criteria)
+        if mask is None:
+            return len(self.__keys)
+        return sum(mask)
+
+    def sum(self, name, by=None, **criteria):
+        """Return the sum of a numeric column over the rows matching
+        criteria, as described in aggregate()."""
+        return self.aggregate(fsum, name, by, **criteria)
+
+    def mean(self, name, by=None, **criteria):
+        """Return the mean of a numeric column over the rows matching
+        criteria, as described in aggregate()."""
+        return self.aggregate(_mean, name, by, **criteria)
+
+    def min(self, name, by=None, **criteria):
+        """Return the minimum of a numeric column over the rows matching
+        criteria, as described in aggregate()."""
+        return self.aggregate(_min, name, by, **criteria)
+
+    def max(self, name, by=None, **criteria):
+        """Return the maximum of a numeric column over the rows matching
+        criteria, as described in aggregate()."""
+        return self.aggregate(_max, name, by, **criteria)
+
+    def aggregate(self, function, name, by=None, **criteria):
+        """Aggregate the values of a numeric column.
+
+        NaN values are left out of the aggregate.
+
+        Args:
+            function (function): Returns the aggregate of a sequence of
+                values.
+            name (str): The name of the numeric column.
+            by (str): The name of an id column to group the rows by, if
+                any.
+            **criteria: The criteria the rows must match, as described in
+                keys().
+
+        Returns:
+            The aggregate of the values of the rows matching criteria, or
+            with by, the aggregate of each group by string of the id
+            column, None standing for values that were not strings.
+
+        Raises:
+            ValueError: If name is not a numeric column of the table, by
+                is not an id column of the table, or a criterion is
+                invalid.
+        """
+        if self.__kinds.get(name) is not float:
+            raise ValueError("not a numeric column: {}".format(name))
+        if by is not None and self.__kinds.get(by) is not str:
+            raise ValueError("not an id column: {}".format(by))
+        mask = self.__mask(criteria)
+        values = self.__columns[name]
+        if by is None:
+            if mask is not None:
+                values = list(compress(values, mask))
+            if self.__nans[name]:
+                values = [value for value in values if value == value]
+            return function(values)
+        codes = self.__columns[by]
+        pairs = zip(codes, values)
+        if mask is not None:
+            pairs = compress(pairs, mask)
+        groups = {}
+        for code, value in pairs:
+            if value == value:
+                groups.setdefault(code, []).append(value)
+        return {self.string(code): function(group)
+                for code, group in groups.items()}
+
+    def __len__(self):
+        """Return the number of rows."""
+        return len(self.__keys)
+
+    def __set(self, column, row, value):
+        """Store the value of a cell."""
+        values = self.__columns[column]
+        if self.__kinds[column] is str:
+            values[row] = self.__intern(value) if type(value) is str else -1
+            return
+        if type(value) not in (int, float):
+            value = nan
+        old = values[row]
+        values[row] = value
+        if old != old:
+            self.__nans[column] -= 1
+        if value != value:
+            self.__nans[column] += 1
+
+    def __intern(self, string):
+        """Return the code of a string, adding it to the table if needed."""
+        code = self.__codes.get(string)
+        if code is None:
+            code = self.__codes[string] = len(self.__strings)
+            self.__strings.append(string)
+        return code
+
+    def __mask(self, criteria):
+        """Return the bytes flagging the rows matching criteria with 1, or
+        None if there are no criteria."""
+        mask = None
+        for criterion, value in criteria.items():
+            name, op = parse(criterion)
+            kind = self.__kinds.get(name)
+            if kind is None:
+                raise ValueError("not a column: {}".format(name))
+            if op not in _COMPARISONS or (kind is str and op is not None):
+                raise ValueError("unsupported criterion on column {}: {}"
+                                 .format(name, criterion))
+            if kind is str:
+                value = self.__codes.get(value, -2) if type(value) is str \
+                    else -2
+            elif type(value) not in (int, float):
+                mask = bytes(len(self.__keys))
+                continue
+            matched = bytes(map(_COMPARISONS[op], self.__columns[name],
+                                repeat(value)))
+            if mask is not None:
+                matched = bytes(map(operator.and_, mask, matched))
+            mask = matched
+        return mask
+
+
+def kinds(cls):
+    """Return the kinds of the __columns__ of a model class, as taken by
+    ColumnTable: the type of the default of each column."""
+    return tuple(type(getattr(cls, name, None)) for name in cls.__columns__)
+
+
+def _mean(values):
+    """Return the mean of values, or None if there are none."""
+    return fsum(values) / len(values) if values else None
+
+
+def _min(values):
+    """Return the smallest of values, or None if there are none."""
+    return min(values, default=None)
+
+
+def _max(values):
+    """Return the largest of values, or None if there are none."""
+    return max(values, default=None)
@@ -0,0 +1,33 @@
+#!/usr/bin/python3
+"""Defines the Compactor class."""
+import threading
+
+
+class Compactor(threading.Thread):
+    """Background thread folding a storage journal into its snapshot.
+
+    Attributes:
+        storage (FileStorage): The storage to compact.
+        interval (float): The number of seconds between two compactions.
+    """
+
+    def __init__(self, storage, interval):
+        """Initialize a Compactor.
+
+        Args:
+            storage (FileStorage): The storage to compact.
+            interval (float): The number of seconds between two compactions.
+        """
+        super().__init__(name="hbnb-compactor", daemon=True)
+        self.storage = storage
+        self.interval = interval
+        self.__stopped = threading.Event()
+
+    def run(self):
+        """Compact the storage every interval until stopped."""
+        while not self.__stopped.wait(self.interval):
+            self.storage.compact()
+
+    def stop(self):
+        """Stop the thread after the compaction in progress, if any."""
+        self.__stopped.set()
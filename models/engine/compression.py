@@ -0,0 +1,63 @@
+#!/usr/bin/python3
+"""Defines the transparent compression of storage files.
+
+A storage file ending in ".gz" is compressed with gzip and one ending in
+".xz" with lzma; the rest of the path names the file as if it was not
+compressed, so "file.json.gz" is a gzip-compressed JSON snapshot and
+"file.bin.xz" a lzma-compressed binary snapshot.
+
+Both formats allow a file to hold several compressed streams one after the
+other, so a compressed journal is appended to one stream per append.
+"""
+import builtins
+import gzip
+import lzma
+import os
+import zlib
+
+MODULES = {".gz": gzip, ".xz": lzma}
+
+# The errors raised when reading a truncated or corrupted compressed file
+ERRORS = (EOFError, gzip.BadGzipFile, lzma.LZMAError, zlib.error)
+
+
+def split(path):
+    """Split path into the uncompressed path and the compression suffix.
+
+    Returns:
+        tuple: (path, suffix) where suffix is "" for an uncompressed file.
+    """
+    for suffix in MODULES:
+        if path.endswith(suffix):
+            return path[:-len(suffix)], suffix
+    return path, ""
+
+
+def open(path, mode, name=None):
+    """Open a storage file, compressed or not according to its suffix.
+
+    Args:
+        path (str): The path of the file, which selects the compression.
+        mode (str): "r", "w" or "a", followed by "b" for a binary file.
+        name (str): The file to open, when it is not path itself, such as
+            a temporary file replacing path.
+    """
+    module = MODULES.get(split(path)[1])
+    if module is None:
+        return builtins.open(name or path, mode)
+    if "b" not in mode:
+        mode += "t"
+    return module.open(name or path, mode)
+
+
+def sync(path):
+    """Flush a closed file to disk.
+
+    Compressed streams are only complete once their file is closed, so
+    files are flushed after being closed rather than before.
+    """
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
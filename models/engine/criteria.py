@@ -0,0 +1,76 @@
+#!/usr/bin/python3
+"""Defines the matching of objects against storage.find() criteria.
+
+A criterion is an attribute name and a value. A name ending in "__all"
+or "__any" applies to a list attribute, such as Place.amenity_ids, and
+matches objects holding all or any of the items of the value; a name
+ending in "__lt", "__lte", "__gt" or "__gte" matches objects whose
+attribute is less than, at most, greater than or at least the value; any
+other name matches objects whose attribute equals the value.
+"""
+
+OPERATORS = ("all", "any", "lt", "lte", "gt", "gte")
+
+# The operators bounding the value of an attribute
+BOUNDS = ("lt", "lte", "gt", "gte")
+
+
+def parse(name):
+    """Split a criterion name into its attribute and operator.
+
+    Returns:
+        tuple: (attribute, operator) where operator is one of OPERATORS,
+            or None for an equality.
+    """
+    attribute, _, operator = name.rpartition("__")
+    if attribute and operator in OPERATORS:
+        return attribute, operator
+    return name, None
+
+
+def compare(actual, operator, value):
+    """Return whether the value of an attribute satisfies a criterion.
+
+    Args:
+        actual: The value of the attribute.
+        operator (str): The operator of the criterion, as returned by
+            parse().
+        value: The value of the criterion.
+    """
+    if operator is None:
+        return actual == value
+    if operator in BOUNDS:
+        try:
+            if operator == "lt":
+                return actual < value
+            if operator == "lte":
+                return actual <= value
+            if operator == "gt":
+                return actual > value
+            return actual >= value
+        except TypeError:
+            return False
+    try:
+        items = set(actual)
+        wanted = set(value)
+    except TypeError:
+        return False
+    if operator == "all":
+        return wanted <= items
+    return bool(wanted & items)
+
+
+def matches(obj, criteria):
+    """Return whether an object matches every criterion.
+
+    Args:
+        obj (BaseModel): The object.
+        criteria (dict): The value of each criterion, by name.
+    """
+    for name, value in criteria.items():
+        attribute, operator = parse(name)
+        if not hasattr(obj, attribute):
+            return False
+        if not compare(getattr(obj, attribute), operator, value):
+            return False
+    return True
@@ -1,32 +1,466 @@
 #!/usr/bin/python3
 """Defines the FileStorage class."""
-import json
-from models.base_model import BaseModel
-from models.amenity import Amenity
-from models.city import City
-from models.place import Place
-from models.review import Review
-from models.state import State
-from models.user import User
+import atexit
+import glob
+import os
+import threading
+import weakref
+import zlib
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import contextmanager
+from time import monotonic
+from models.base_model import classes
+# Imported to register the model classes in classes
+from models.amenity import Amenity  # noqa: F401
+from models.city import City  # noqa: F401
+from models.place import Place  # noqa: F401
+from models.review import Review  # noqa: F401
+from models.state import State  # noqa: F401
+from models.user import User  # noqa: F401
+from models.engine.attribute_index import AttributeIndex
+from models.engine.bitmap_index import BitmapIndex
+from models.engine.column_table import ColumnTable, kinds
+from models.engine.compactor import Compactor
+from models.engine.criteria import BOUNDS, matches, parse
+from models.engine.fsync_policy import FsyncPolicy
+from models.engine.geo_index import GeoIndex
+from models.engine.range_index import RangeIndex
+from models.engine.text_index import TextIndex
+from models.engine.journal import Journal
+from models.engine import binary_snapshot, compression, json_stream
+from models.engine import mmap_snapshot
+from models.engine.lazy_objects import LazyObjects
+from models.engine.mmap_snapshot import MmapSnapshot
+from models.engine.query import Query
+from models.slotted import assign, attributes
+
+
+def _format(path):
+    """Return the module reading and writing the snapshot format of path.
+
+    Files ending in ".bin" are binary snapshots, other files are JSON,
+    either of which can be compressed.
+    """
+    if compression.split(path)[0].endswith(".bin"):
+        return binary_snapshot
+    return json_stream
+
+
+def _open(path, mode, name=None):
+    """Open a snapshot file in the mode matching its format and compression.
+
+    Args:
+        path (str): The path of the snapshot, which selects the format.
+        mode (str): "r" or "w".
+        name (str): The file to open, when it is not path itself, such as
+            a temporary file replacing path.
+    """
+    if _format(path) is binary_snapshot:
+        mode += "b"
+    return compression.open(path, mode, name)
+
+
+def _splitext(path):
+    """Split path into its root and its extension, compression included."""
+    root, suffix = compression.split(path)
+    root, ext = os.path.splitext(root)
+    return root, ext + suffix
+
+
+def _value(cls, obj, name):
+    """Return the value of an indexed attribute of an object.
+
+    Args:
+        cls (type): The class of the object.
+        obj (BaseModel): The object, or its dictionary as read from disk.
+        name (str): The name of the attribute, or a tuple of names for the
+            tuple of their values.
+    """
+    if type(name) is tuple:
+        return tuple(_value(cls, obj, n) for n in name)
+    if type(obj) is dict:
+        return obj.get(name, getattr(cls, name, None))
+    return getattr(obj, name, None)
+
+
+def _read_shard(path):
+    """Return the (key, dictionary) pairs stored in a shard file."""
+    with _open(path, "r") as f:
+        return list(_format(path).iter_entries(f))
 
 
 class FileStorage:
     """Manage the storage of objects in JSON format.
 
+    A __file_path ending in ".bin" selects the binary snapshot format of
+    models.engine.binary_snapshot instead, and a further ".gz" or ".xz"
+    compresses the file and its journal.
+
     Attributes:
         __file_path (str): The file path to save objects to.
         __objects (dict): A dictionary of instantiated objects.
+        __classes (dict): The keys of __objects by class name, each held in
+            a dict to keep their order.
+        __indexed (dict): The __objects that __classes indexes. __classes is
+            rebuilt when __objects is replaced.
+        __attributes (dict): The indexes of each class, by class name: an
+            AttributeIndex for each attribute listed in its __indexes__, a
+            RangeIndex for each one listed in its __ranges__, a BitmapIndex
+            for each one listed in its __sets__, a GeoIndex for
+            its __geo__ coordinates and a TextIndex for its __text__ fields.
+            The indexes of a class are built the first time they are
+            queried.
+        __attributes_of (dict): The __objects that __attributes indexes.
+        __live (WeakValueDictionary): The identity map of the stored
+            objects still referenced, by key, including the objects
+            evicted from the cache of a lazy storage. Looking a key up
+            returns its live object rather than a new one, and reload()
+            refreshes live objects in place.
+        __live_of (dict): The __objects that __live maps.
     """
     __file_path = "file.json"
     __objects = {}
+    __classes = {}
+    __indexed = None
+    __attributes = {}
+    __attributes_of = None
+    __live = weakref.WeakValueDictionary()
+    __live_of = None
+
+    def __init__(self, *, path=None, journal=False, compact_threshold=None,
+                 compact_interval=None, fsync="never", coalesce_ms=0,
+                 lazy=False, shard=None, shard_pool="thread",
+                 shard_workers=None, mmap=False, cache_size=None):
+        """Initialize a FileStorage.
+
+        Args:
+            path (str): The file path to save objects to, when it differs
+                from the default.
+            journal (bool): Append mutations to a journal next to the file
+                instead of rewriting the whole file on every save.
+            compact_threshold (int): Compact the journal once it grows past
+                this number of bytes.
+            compact_interval (float): Compact the journal in a background
+                thread every this number of seconds.
+            fsync (str): The FsyncPolicy of the JSON file and journal.
+            coalesce_ms (float): Merge the saves requested within this
+                number of milliseconds of a flush into a single flush.
+            lazy (bool): Instantiate the objects read by reload() on first
+                access instead of all at once, keeping them encoded until
+                then.
+            shard (str or int): Split the objects into one file per class
+                with "class", or into this number of files by hash of
+                their key. Each file is named after __file_path with the
+                class name or hash inserted before the extension.
+            shard_pool (str): Read the shard files in parallel with a
+                "thread" or "process" pool.
+            shard_workers (int): The number of workers of the pool.
+            mmap (bool): Map the file in memory on reload() and decode each
+                object from the mapping on first access, using an index of
+                the offset of every object kept next to the file. Implies
+                lazy.
+            cache_size (int): Keep at most this number of objects
+                instantiated, evicting the least recently used ones without
+                unsaved changes to their encoding and instantiating them
+                again on their next access, or reusing them if they are
+                still referenced.
+                Implies lazy.
+
+        Raises:
+            ValueError: If shard is combined with journal or mmap, or is
+                neither "class" nor a positive number, if mmap is combined
+                with a compressed file, or if cache_size is not a positive
+                number.
+        """
+        if path is not None:
+            self.__file_path = path
+        if shard is not None:
+            if journal:
+                raise ValueError("shard cannot be combined with journal")
+            if mmap:
+                raise ValueError("shard cannot be combined with mmap")
+            if shard != "class" and (type(shard) is not int or shard < 1):
+                raise ValueError("invalid shard: {}".format(shard))
+        if mmap and compression.split(self.__file_path)[1]:
+            raise ValueError("mmap cannot be combined with compression")
+        if cache_size is not None and (type(cache_size) is not int or
+                                       cache_size < 1):
+            raise ValueError("invalid cache_size: {}".format(cache_size))
+        self.__format = _format(self.__file_path)
+        self.__shard = shard
+        self.__shard_pool = shard_pool
+        self.__shard_workers = shard_workers
+        self.__journal = None
+        if journal:
+            root, suffix = compression.split(self.__file_path)
+            self.__journal = Journal(root + ".log" + suffix)
+        self.__pending = {}
+        self.__fragments = {}
+        self.__stale = set()
+        self.__lock = threading.RLock()
+        self.__compact_threshold = compact_threshold
+        self.__fsync = FsyncPolicy(fsync)
+        self.__lazy = lazy or mmap or cache_size is not None
+        self.__cache_size = cache_size
+        self.__mmap = mmap
+        self.__snapshot = None
+        self.__window = coalesce_ms / 1000
+        self.__flushed_at = None
+        self.__timer = None
+        self.__batch_depth = 0
+        self.__deferred = False
+        if self.__window:
+            atexit.register(self.__flush_waiting)
+        self.compactor = None
+        if journal and compact_interval:
+            self.compactor = Compactor(self, compact_interval)
+            self.compactor.start()
+
+    def all(self, cls=None):
+        """Retrieve all stored objects, or those of one class.
+
+        Args:
+            cls (str): The class, or class name, of the objects to retrieve.
+
+        Returns:
+            dict: A dictionary containing all instantiated objects, or only
+                those of cls.
+        """
+        if cls is None:
+            return FileStorage.__objects
+        class_name = cls if isinstance(cls, str) else cls.__name__
+        keys = self.__class_index().get(class_name, ())
+        return {key: FileStorage.__objects[key] for key in keys}
+
+    def count(self, cls=None):
+        """Count the stored objects, or those of one class.
+
+        Args:
+            cls (str): The class, or class name, of the objects to count.
+
+        Returns:
+            int: The number of objects.
+        """
+        if cls is None:
+            return len(FileStorage.__objects)
+        class_name = cls if isinstance(cls, str) else cls.__name__
+        return len(self.__class_index().get(class_name, ()))
+
+    def cache_info(self):
+        """Return the statistics of the cache of instantiated objects.
+
+        Outside of lazy mode every object is instantiated and stays so.
+
+        Returns:
+            dict: The number of "hits" and "misses" of accesses to objects,
+                depending on whether they were instantiated already, the
+                number of "evictions" of objects from the cache, the
+                "size" of the cache, in instantiated objects, and its
+                "capacity", or None if it is not bounded.
+        """
+        odict = FileStorage.__objects
+        if not isinstance(odict, LazyObjects):
+            return {"hits": 0, "misses": 0, "evictions": 0,
+                    "size": len(odict), "capacity": None}
+        return {"hits": odict.hits, "misses": odict.misses,
+                "evictions": odict.evictions, "size": odict.count_loaded(),
+                "capacity": self.__cache_size}
+
+    def get(self, cls, id):
+        """Retrieve one stored object.
+
+        Args:
+            cls (str): The class, or class name, of the object.
+            id (str): The id of the object.
+
+        Returns:
+            BaseModel: The object, or None if it is not stored.
+        """
+        class_name = cls if isinstance(cls, str) else cls.__name__
+        return FileStorage.__objects.get("{}.{}".format(class_name, id))
+
+    def find(self, cls, **criteria):
+        """Retrieve the objects of a class matching criteria.
+
+        A criterion matches objects whose attribute equals its value, or
+        for a name ending in "__all" or "__any", objects whose list
+        attribute holds all or any of the items of its value, as in
+        find(Place, city_id=city.id, amenity_ids__all=[wifi.id, pool.id]).
+
+        Equalities on the attributes listed in the __indexes__ of the class
+        are looked up in hash indexes, item criteria on the attributes
+        listed in its __sets__ are answered with bitwise operations on
+        bitmap indexes, and bounds on the attributes listed in its
+        __ranges__ with sorted indexes. The smallest of these candidate
+        sets is checked against the other criteria one object at a time.
+
+        Args:
+            cls (str): The class, or class name, of the objects.
+            **criteria: The value of each criterion.
+
+        Returns:
+            list: The matching objects.
+        """
+        class_name = cls if isinstance(cls, str) else cls.__name__
+        keys = self.__candidates(class_name, criteria)[0]
+        if keys is None:
+            keys = list(self.__class_index().get(class_name, ()))
+        found = []
+        for key in keys:
+            obj = FileStorage.__objects.get(key)
+            if obj is not None and matches(obj, criteria):
+                found.append(obj)
+        return found
+
+    def query(self, cls):
+        """Start a query on the objects of a class.
+
+        The query is planned against the indexes of the class: its objects
+        are read from the smallest set of candidates its indexed criteria
+        select. When it is ordered by a single attribute listed in the
+        __ranges__ of the class and these candidates come from its sorted
+        index, or no index selects any, they are read in the order of that
+        index, so that a limited query stops reading once it is complete.
+
+        Args:
+            cls (str): The class, or class name, of the objects.
+
+        Returns:
+            Query: The query, as described in models.engine.query.
+        """
+        class_name = cls if isinstance(cls, str) else cls.__name__
+
+        def plan(criteria, order):
+            return self.__plan(class_name, criteria, order)
+        return Query(classes.get(class_name), plan, self.__read)
+
+    def find_range(self, cls, name, low=None, high=None):
+        """Retrieve the objects of a class whose attribute is within bounds.
+
+        Attributes listed in the __ranges__ of the class are looked up in a
+        sorted index, others are checked one object at a time.
+
+        Args:
+            cls (str): The class, or class name, of the objects.
+            name (str): The name of the numeric attribute.
+            low (float): The lowest value to match, if any.
+            high (float): The highest value to match, if any.
+
+        Returns:
+            list: The matching objects, in increasing order of the
+                attribute.
+        """
+        class_name = cls if isinstance(cls, str) else cls.__name__
+        for index in self.__attribute_indexes(class_name):
+            if type(index) is RangeIndex and index.name == name:
+                return [FileStorage.__objects[key] for key in
+                        index.range(low, high)]
+        found = []
+        for obj in self.all(class_name).values():
+            value = getattr(obj, name, None)
+            if (type(value) in (int, float) and
+                    (low is None or low <= value) and
+                    (high is None or value <= high)):
+                found.append(obj)
+        found.sort(key=lambda obj: getattr(obj, name))
+        return found
+
+    def near(self, cls, latitude, longitude, km):
+        """Retrieve the objects of a class within a distance of a point.
+
+        Args:
+            cls (str): The class, or class name, of the objects.
+            latitude (float): The latitude of the point.
+            longitude (float): The longitude of the point.
+            km (float): The distance, in km.
+
+        Returns:
+            list: The matching objects, closest first.
+        """
+        index = self.__geo_index(cls)
+        return [FileStorage.__objects[key] for distance, key in
+                index.radius(latitude, longitude, km)]
+
+    def within(self, cls, south, west, north, east):
+        """Retrieve the objects of a class within a bounding box.
+
+        Args:
+            cls (str): The class, or class name, of the objects.
+            south (float): The lowest latitude.
+            west (float): The western longitude. A box whose west edge is
+                east of its east edge crosses the antimeridian.
+            north (float): The highest latitude.
+            east (float): The eastern longitude.
+
+        Returns:
+            list: The matching objects.
+        """
+        index = self.__geo_index(cls)
+        return [FileStorage.__objects[key] for key in
+                index.bbox(south, west, north, east)]
+
+    def nearest(self, cls, latitude, longitude, k=1):
+        """Retrieve the objects of a class closest to a point.
+
+        Args:
+            cls (str): The class, or class name, of the objects.
+            latitude (float): The latitude of the point.
+            longitude (float): The longitude of the point.
+            k (int): The number of objects.
+
+        Returns:
+            list: The k closest objects, closest first.
+        """
+        index = self.__geo_index(cls)
+        return [FileStorage.__objects[key] for distance, key in
+                index.nearest(latitude, longitude, k)]
+
+    def search(self, cls, query):
+        """Retrieve the objects of a class matching a full-text query.
+
+        The words of the fields listed in the __text__ of the class are
+        looked up in an inverted index; classes without __text__ fields
+        match nothing.
+
+        Args:
+            cls (str): The class, or class name, of the objects.
+            query (str): Words that must all appear in a matching object,
+                with OR separating alternatives, as in "wifi pool OR
+                beach".
+
+        Returns:
+            list: The matching objects, ranked by BM25 score.
+        """
+        class_name = cls if isinstance(cls, str) else cls.__name__
+        for index in self.__attribute_indexes(class_name):
+            if type(index) is TextIndex:
+                return [FileStorage.__objects[key] for score, key in
+                        index.search(query)]
+        return []
+
+    def columns(self, cls):
+        """Return the columnar table of the objects of a class.
 
-    def all(self):
-        """Retrieve all stored objects.
+        The table of a class listing __columns__ is built along with its
+        other indexes and kept up to date as objects are created, modified
+        and destroyed. Other classes get a table of their keys without
+        columns.
+
+        Args:
+            cls (str): The class, or class name, of the objects.
 
         Returns:
-            dict: A dictionary containing all instantiated objects.
+            ColumnTable: The table, as described in
+                models.engine.column_table, which must not be modified.
         """
-        return FileStorage.__objects
+        class_name = cls if isinstance(cls, str) else cls.__name__
+        for index in self.__attribute_indexes(class_name):
+            if type(index) is ColumnTable:
+                return index
+        table = ColumnTable((), ())
+        for key in self.__class_index().get(class_name, ()):
+            table.add(key, ())
+        return table
 
     def new(self, obj):
         """Add a new object to the storage.
@@ -37,31 +471,604 @@ class FileStorage:
         Returns:
             None
         """
-        obj_classname = obj.__class__.__name__
-        FileStorage.__objects["{}.{}".format(obj_classname, obj.id)] = obj
+        with self.__lock:
+            self.__pending[self.__register(obj)] = "create"
+
+    def touch(self, obj):
+        """Record that a stored object has been modified.
+
+        BaseModel calls this on every attribute assignment. Changes that do
+        not go through attribute assignment, such as appending to a list
+        attribute, must be followed by a call to touch() or save().
+
+        Args:
+            obj (BaseModel): The modified object.
+        """
+        key = "{}.{}".format(obj.__class__.__name__, obj.id)
+        with self.__lock:
+            odict = FileStorage.__objects
+            if key not in odict or self.__identity().get(key) is not obj:
+                return
+            if isinstance(odict, LazyObjects):
+                odict[key]
+                odict.touch(key)
+            self.__fragments.pop(key, None)
+            self.__reindex(key, obj)
+            if self.__pending.get(key) != "create":
+                self.__pending[key] = "update"
+
+    def delete(self, obj):
+        """Remove an object from the storage.
+
+        Args:
+            obj (BaseModel): The object to be removed.
+        """
+        key = "{}.{}".format(obj.__class__.__name__, obj.id)
+        with self.__lock:
+            self.__remove(key)
+            self.__pending[key] = "delete"
 
     def save(self):
-        """Serialize __objects to the JSON file __file_path."""
-        odict = FileStorage.__objects
-        objdictionary = {obj: odict[obj].to_dict() for obj in odict.keys()}
-        with open(FileStorage.__file_path, "w") as f:
-            json.dump(objdictionary, f)
+        """Serialize __objects to the JSON file __file_path.
+
+        Inside a batch() block the flush is deferred to the end of the
+        block. When a coalescing window is set, saves requested within the
+        window of the previous flush are merged into a single flush at the
+        end of the window.
+        """
+        with self.__lock:
+            if self.__batch_depth:
+                self.__deferred = True
+                return
+            if self.__window and self.__flushed_at is not None:
+                delay = self.__flushed_at + self.__window - monotonic()
+                if delay > 0:
+                    if self.__timer is None:
+                        self.__timer = threading.Timer(delay, self.flush)
+                        self.__timer.daemon = True
+                        self.__timer.start()
+                    return
+        self.flush()
+
+    def flush(self):
+        """Write the pending changes to disk now.
+
+        The JSON form of each object is cached until the object is
+        modified, so only the objects changed since the last save are
+        serialized again. In journal mode only the mutations recorded
+        since the last save are appended to the journal.
+
+        The file is replaced atomically, so a crash leaves either the
+        previous or the new content on disk.
+        """
+        with self.__lock:
+            if self.__timer is not None:
+                self.__timer.cancel()
+                self.__timer = None
+            self.__deferred = False
+            if self.__journal is not None:
+                self.__append_pending()
+                if (self.__compact_threshold is not None and
+                        self.__journal.size() >= self.__compact_threshold):
+                    self.compact()
+            else:
+                self.__write_snapshot()
+            self.__flushed_at = monotonic()
+
+    @contextmanager
+    def batch(self):
+        """Defer every save requested inside the block to a single flush.
+
+        Blocks can be nested; the flush happens when the outermost block
+        exits.
+        """
+        with self.__lock:
+            self.__batch_depth += 1
+        try:
+            yield self
+        finally:
+            with self.__lock:
+                self.__batch_depth -= 1
+                if not self.__batch_depth and self.__deferred:
+                    self.flush()
 
     def reload(self):
         """Load serialized objects from the JSON file.
 
         Deserialize the JSON file specified by __file_path, if it exists,
         and populate the __objects dictionary with the deserialized objects.
+        The file is decoded one object at a time. In journal mode the
+        journal is then replayed on top of it. In lazy mode the objects are
+        only instantiated when first accessed. In mmap mode the file is
+        mapped in memory and objects are decoded from it when first
+        accessed.
+
+        A save still waiting for its coalescing window is written first,
+        so that it is not undone by the objects read back.
 
         Returns:
             None
         """
+        with self.__lock:
+            self.__flush_waiting()
+            self.__reload()
+
+    def __reload(self):
+        """Load serialized objects from the JSON file, as reload() does."""
+        FileStorage.__attributes = {}
+        if self.__lazy and not isinstance(FileStorage.__objects, LazyObjects):
+            live = self.__identity()
+            FileStorage.__objects = LazyObjects(
+                self.__build, FileStorage.__objects, self.__cache_size,
+                lambda key: key in self.__pending, self.__fragment,
+                self.__format.decode)
+            FileStorage.__live_of = FileStorage.__objects
+            FileStorage.__live = live
+        if self.__shard is not None:
+            self.__reload_shards()
+            return
+        if self.__mmap:
+            self.__attach_snapshot()
+        else:
+            self.__read_snapshot()
+        if self.__journal is None:
+            return
+        for record in self.__journal.replay():
+            if record["op"] == "delete":
+                self.__remove(record["key"])
+            else:
+                self.__load(record["key"], record["data"])
+
+    def compact(self):
+        """Fold the journal into a fresh snapshot of the JSON file.
+
+        The snapshot is streamed to a temporary file and renamed over
+        __file_path, after which the journal is emptied. Does nothing
+        outside of journal mode or when the journal is empty. A save still
+        waiting for its coalescing window is written first.
+        """
+        with self.__lock:
+            self.__flush_waiting()
+            if self.__journal is None or self.__journal.size() == 0:
+                return
+            latest = {}
+            for record in self.__journal.replay():
+                latest[record["key"]] = record.get("data")
+            self.__write(self.__file_path, self.__fold(latest), True)
+            self.__journal.truncate()
+
+    def __read_snapshot(self):
+        """Load every object of the JSON file.
+
+        In lazy mode each object is kept as the encoding read from the
+        file, which is also its cached fragment, until its first access.
+        """
+        if isinstance(FileStorage.__objects, LazyObjects):
+            read = self.__format.iter_fragments
+        else:
+            read = self.__format.iter_entries
         try:
-            with open(FileStorage.__file_path) as f:
-                objdictionary = json.load(f)
-                for objct in objdictionary.values():
-                    class_name = objct["__class__"]
-                    del objct["__class__"]
-                    self.new(eval(class_name)(**objct))
+            with _open(self.__file_path, "r") as f:
+                for key, objct in read(f):
+                    self.__load(key, objct)
         except FileNotFoundError:
+            pass
+
+    def __attach_snapshot(self):
+        """Map the JSON file in memory and attach it to __objects."""
+        try:
+            snapshot = MmapSnapshot(self.__file_path)
+        except FileNotFoundError:
+            return
+        FileStorage.__objects.attach(snapshot)
+        FileStorage.__indexed = None
+        for key in snapshot:
+            self.__fragments.pop(key, None)
+        for key, obj in list(self.__identity().items()):
+            if key in snapshot:
+                self.__refresh(obj, snapshot[key])
+                FileStorage.__objects[key] = obj
+        if self.__snapshot is not None:
+            self.__snapshot.close()
+        self.__snapshot = snapshot
+
+    def __fold(self, latest):
+        """Yield the entries of the JSON file updated with latest.
+
+        Args:
+            latest (dict): The last journaled dictionary of each key, or
+                None for deleted keys.
+        """
+        try:
+            with _open(self.__file_path, "r") as f:
+                for key, objct in self.__format.iter_entries(f):
+                    if key in latest:
+                        objct = latest.pop(key)
+                    if objct is not None:
+                        yield key, self.__format.encode(key, objct)
+        except FileNotFoundError:
+            pass
+        for key, objct in latest.items():
+            if objct is not None:
+                yield key, self.__format.encode(key, objct)
+
+    def __write(self, path, entries, sync):
+        """Atomically replace a snapshot file.
+
+        In mmap mode the offset index of the file is written next to it.
+
+        Args:
+            path (str): The path of the file.
+            entries (iterable): The (key, encoded record) pairs of the
+                snapshot, written one at a time.
+            sync (bool): Flush the file and its directory to disk before
+                returning.
+        """
+        tmp_path = "{}.{}-{}.tmp".format(path, os.getpid(),
+                                         threading.get_ident())
+        try:
+            with _open(path, "w", tmp_path) as f:
+                spans = _format(path).write_entries(f, entries)
+            if sync:
+                compression.sync(tmp_path)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+        if self.__mmap:
+            mmap_snapshot.write_index(path, spans)
+        if sync and hasattr(os, "O_DIRECTORY"):
+            directory = os.path.dirname(path) or "."
+            dir_fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+            try:
+                os.fsync(dir_fd)
+            finally:
+                os.close(dir_fd)
+
+    def __register(self, obj):
+        """Store an object under its key and return the key."""
+        key = "{}.{}".format(obj.__class__.__name__, obj.id)
+        self.__class_index()
+        self.__identity()[key] = obj
+        FileStorage.__objects[key] = obj
+        self.__fragments.pop(key, None)
+        self.__index(key)
+        self.__reindex(key, obj)
+        return key
+
+    def __load(self, key, objct):
+        """Store an object read from disk under key.
+
+        objct is the dictionary of the object or, in lazy mode, its
+        encoding. A live object of key is refreshed in place rather than
+        replaced.
+        """
+        obj = self.__identity().get(key)
+        if obj is not None:
+            if type(objct) is not dict:
+                objct = self.__format.decode(objct)
+            self.__refresh(obj, objct)
+            self.__register(obj)
+        elif isinstance(FileStorage.__objects, LazyObjects):
+            self.__class_index()
+            FileStorage.__objects.load(key, objct)
+            if type(objct) is dict:
+                self.__fragments.pop(key, None)
+            else:
+                self.__fragments[key] = objct
+            self.__index(key)
+        else:
+            self.__register(self.__build(objct))
+
+    def __remove(self, key):
+        """Remove the object stored under key, if any."""
+        keys = self.__class_index().get(key.split(".", 1)[0])
+        if keys is not None:
+            keys.pop(key, None)
+        if key in FileStorage.__objects:
+            del FileStorage.__objects[key]
+        self.__fragments.pop(key, None)
+        for index in self.__built_indexes(key):
+            index.remove(key)
+
+    def __index(self, key):
+        """Add the key of a stored object to __classes."""
+        FileStorage.__classes.setdefault(key.split(".", 1)[0], {})[key] = None
+
+    def __class_index(self):
+        """Return __classes, rebuilt if __objects has been replaced."""
+        if FileStorage.__indexed is not FileStorage.__objects:
+            classes = {}
+            for key in FileStorage.__objects:
+                classes.setdefault(key.split(".", 1)[0], {})[key] = None
+            FileStorage.__classes = classes
+            FileStorage.__indexed = FileStorage.__objects
+        return FileStorage.__classes
+
+    def __attribute_indexes(self, class_name):
+        """Return the attribute indexes of a class, building them if needed.
+
+        Objects not instantiated yet are indexed from their record.
+        """
+        if FileStorage.__attributes_of is not FileStorage.__objects:
+            FileStorage.__attributes = {}
+            FileStorage.__attributes_of = FileStorage.__objects
+        indexes = FileStorage.__attributes.get(class_name)
+        if indexes is not None:
+            return indexes
+        cls = classes.get(class_name)
+        indexes = []
+        if cls is not None:
+            indexes.extend(AttributeIndex(name) for name in cls.__indexes__)
+            indexes.extend(RangeIndex(name) for name in cls.__ranges__)
+            indexes.extend(BitmapIndex(name) for name in cls.__sets__)
+            if cls.__geo__:
+                indexes.append(GeoIndex(cls.__geo__))
+            if cls.__text__:
+                indexes.append(TextIndex(cls.__text__))
+            if cls.__columns__:
+                indexes.append(ColumnTable(cls.__columns__, kinds(cls)))
+        if indexes:
+            odict = FileStorage.__objects
+            keys = self.__class_index().get(class_name, ())
+            if isinstance(odict, LazyObjects):
+                items = odict.peek(list(keys))
+            else:
+                items = [(key, odict[key]) for key in keys]
+            for key, obj in items:
+                for index in indexes:
+                    index.add(key, _value(cls, obj, index.name))
+        FileStorage.__attributes[class_name] = indexes
+        return indexes
+
+    def __candidates(self, class_name, criteria):
+        """Return the keys of the objects of a class that can match criteria.
+
+        Returns:
+            tuple: (keys, index) where keys is the list of keys of the
+                smallest set of candidates selected by an index, in the
+                order of that index, or None if no index selects any.
+        """
+        indexes = {(type(index), index.name): index for index in
+                   self.__attribute_indexes(class_name)}
+        keys, source = None, None
+        bounds = {}
+        for name, value in criteria.items():
+            attribute, operator = parse(name)
+            if operator in BOUNDS:
+                bounds.setdefault(attribute, {})[operator] = value
+                continue
+            index = indexes.get((BitmapIndex if operator else AttributeIndex,
+                                 attribute))
+            if index is None:
+                continue
+            try:
+                if operator is None:
+                    candidates = index.lookup(value)
+                elif operator == "all":
+                    candidates = index.having_all(value)
+                else:
+                    candidates = index.having_any(value)
+            except TypeError:
+                continue
+            if keys is None or len(candidates) < len(keys):
+                keys, source = candidates, index
+        for attribute, bound in bounds.items():
+            index = indexes.get((RangeIndex, attribute))
+            if index is None or not all(
+                    type(v) in (int, float) and v == v
+                    for v in bound.values()):
+                continue
+            lows = [bound[op] for op in ("gt", "gte") if op in bound]
+            highs = [bound[op] for op in ("lt", "lte") if op in bound]
+            candidates = index.range(max(lows, default=None),
+                                     min(highs, default=None))
+            if keys is None or len(candidates) < len(keys):
+                keys, source = candidates, index
+        return keys, source
+
+    def __plan(self, class_name, criteria, order):
+        """Return the (keys, ordered) plan of a query, as used by Query."""
+        keys, source = self.__candidates(class_name, criteria)
+        if len(order) == 1:
+            name, reverse = order[0]
+            for index in self.__attribute_indexes(class_name):
+                if type(index) is not RangeIndex or index.name != name:
+                    continue
+                if keys is None and len(index) == self.count(class_name):
+                    keys, source = index.range(), index
+                if source is index:
+                    return (keys[::-1] if reverse else keys), True
+        if keys is None:
+            keys = list(self.__class_index().get(class_name, ()))
+        return keys, False
+
+    def __read(self, key, record=False):
+        """Return the object stored under key, as used by Query."""
+        odict = FileStorage.__objects
+        if key not in odict:
+            return None
+        if record and isinstance(odict, LazyObjects):
+            return odict.peek([key])[0][1]
+        return odict[key]
+
+    def __built_indexes(self, key):
+        """Return the attribute indexes built for the class of key."""
+        if FileStorage.__attributes_of is not FileStorage.__objects:
+            return ()
+        return FileStorage.__attributes.get(key.split(".", 1)[0], ())
+
+    def __reindex(self, key, obj):
+        """Update the attribute indexes of a stored object."""
+        for index in self.__built_indexes(key):
+            index.add(key, _value(type(obj), obj, index.name))
+
+    def __geo_index(self, cls):
+        """Return the GeoIndex of a class.
+
+        Classes without __geo__ coordinates are indexed by their latitude
+        and longitude attributes for the duration of the query.
+        """
+        class_name = cls if isinstance(cls, str) else cls.__name__
+        for index in self.__attribute_indexes(class_name):
+            if type(index) is GeoIndex:
+                return index
+        index = GeoIndex()
+        for key, obj in self.all(class_name).items():
+            index.add(key, _value(type(obj), obj, index.name))
+        return index
+
+    def __identity(self):
+        """Return __live, emptied if __objects has been replaced."""
+        if FileStorage.__live_of is not FileStorage.__objects:
+            FileStorage.__live = weakref.WeakValueDictionary()
+            FileStorage.__live_of = FileStorage.__objects
+        return FileStorage.__live
+
+    def __build(self, objct):
+        """Return the object of a serialized dictionary.
+
+        The live object of its key is returned if there is one: the
+        dictionary of a key is only kept while its live object, if any,
+        holds the same values, as reload() refreshes live objects.
+        """
+        live = self.__identity()
+        key = "{}.{}".format(objct["__class__"], objct["id"])
+        obj = live.get(key)
+        if obj is None:
+            obj = live[key] = self.__instantiate(objct)
+        return obj
+
+    def __instantiate(self, objct):
+        """Instantiate a new object from its serialized dictionary."""
+        objct = dict(objct)
+        return classes[objct.pop("__class__")](**objct)
+
+    def __refresh(self, obj, objct):
+        """Replace the attributes of obj with those of a dictionary."""
+        assign(obj, attributes(self.__instantiate(objct)))
+
+    def __fragment(self, key, obj):
+        """Return the cached encoding of the object stored under key.
+
+        obj is either the object, its dictionary or its encoding, as read
+        from disk.
+        """
+        fragment = self.__fragments.get(key)
+        if fragment is None:
+            if type(obj) in (str, bytes):
+                fragment = obj
+            else:
+                if type(obj) is not dict:
+                    obj = obj.to_dict()
+                fragment = self.__format.encode(key, obj)
+            self.__fragments[key] = fragment
+        return fragment
+
+    def __write_snapshot(self):
+        """Write every object to __file_path, or to the changed shards."""
+        odict = FileStorage.__objects
+        if len(self.__fragments) > len(odict):
+            for key in [k for k in list(self.__fragments) if k not in odict]:
+                self.__fragments.pop(key, None)
+        if isinstance(odict, LazyObjects):
+            items = odict.peek(encoded=True)
+        else:
+            items = list(odict.items())
+        pending, self.__pending = self.__pending, {}
+        if self.__shard is None:
+            entries = ((key, self.__fragment(key, obj)) for key, obj in items)
+            self.__write(self.__file_path, entries, self.__fsync.due())
             return
+        shards = {self.__shard_of(key): [] for key in pending}
+        for key, obj in items:
+            shard = shards.get(self.__shard_of(key))
+            if shard is not None:
+                shard.append((key, self.__fragment(key, obj)))
+        sync = self.__fsync.due()
+        written = set()
+        for shard, entries in shards.items():
+            path = self.__shard_path(shard)
+            self.__write(path, entries, sync)
+            written.add(path)
+        for path in self.__stale - written:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+        self.__stale = set()
+
+    def __shard_of(self, key):
+        """Return the shard of the object stored under key."""
+        if self.__shard == "class":
+            return key.split(".", 1)[0]
+        return str(zlib.crc32(key.encode()) % self.__shard)
+
+    def __shard_path(self, shard):
+        """Return the file path of a shard."""
+        root, ext = _splitext(self.__file_path)
+        return "{}.{}{}".format(root, shard, ext)
+
+    def __reload_shards(self):
+        """Read every shard file in parallel and load their objects.
+
+        Files written with another layout, such as another number of hash
+        shards or an unsharded __file_path, are read as well, and every
+        object is then marked as modified so that the next save rewrites
+        all the shards of the current layout and removes the other files.
+        """
+        root, ext = _splitext(self.__file_path)
+        pattern = "{}.*{}".format(glob.escape(root), glob.escape(ext))
+        paths = [path for path in sorted(glob.glob(pattern))
+                 if "." not in path[len(root) + 1:len(path) - len(ext)]]
+        if os.path.exists(self.__file_path):
+            paths.append(self.__file_path)
+        if not paths:
+            return
+        if self.__shard_pool == "process":
+            from shard_reader import read_shard
+            pool = ProcessPoolExecutor(self.__shard_workers)
+        else:
+            read_shard = _read_shard
+            pool = ThreadPoolExecutor(self.__shard_workers)
+        migrate = False
+        with pool:
+            for path, entries in zip(paths, pool.map(read_shard, paths)):
+                shard = path[len(root) + 1:len(path) - len(ext)]
+                for key, objct in entries:
+                    if (path == self.__file_path or
+                            self.__shard_of(key) != shard):
+                        migrate = True
+                    self.__load(key, objct)
+                if not entries and path == self.__file_path:
+                    migrate = True
+        if migrate:
+            self.__stale = set(paths)
+            for key in list(FileStorage.__objects):
+                self.__pending.setdefault(key, "update")
+
+    def __append_pending(self):
+        """Append the pending mutations to the journal."""
+        pending, self.__pending = self.__pending, {}
+        records = []
+        for key, op in pending.items():
+            obj = FileStorage.__objects.get(key)
+            if op == "delete":
+                records.append(Journal.encode(op, key))
+            elif obj is None:
+                continue
+            elif self.__format is json_stream:
+                records.append(Journal.encode(op, key,
+                                              self.__fragment(key, obj)))
+            else:
+                records.append(Journal.encode(
+                    op, key, json_stream.encode(key, obj.to_dict())))
+        if records:
+            self.__journal.append(records, self.__fsync.due())
+
+    def __flush_waiting(self):
+        """Flush the saves still waiting for their coalescing window."""
+        with self.__lock:
+            if self.__timer is not None:
+                self.flush()
@@ -0,0 +1,59 @@
+#!/usr/bin/python3
+"""Defines the FsyncPolicy class."""
+from time import monotonic
+
+
+class FsyncPolicy:
+    """Decide which writes are flushed to disk with os.fsync().
+
+    A policy is described by one of the following strings:
+        "always": every write is flushed.
+        "never": writes are left to the operating system.
+        "<n>": one write out of n is flushed.
+        "<n>ms": at most one write per n ms is flushed: the first write
+            made once the last flush is n ms old. Nothing is flushed
+            until that write, so the last writes of a quiet period stay
+            in the page cache, as they do between flushes of "<n>".
+
+    Attributes:
+        spec (str): The description of the policy.
+    """
+
+    def __init__(self, spec="never"):
+        """Initialize a FsyncPolicy.
+
+        Args:
+            spec (str): The description of the policy.
+
+        Raises:
+            ValueError: If spec does not describe a policy.
+        """
+        self.spec = spec
+        self.__every = None
+        self.__interval = None
+        if spec == "always":
+            self.__every = 1
+        elif spec.endswith("ms"):
+            self.__interval = int(spec[:-2]) / 1000
+        elif spec != "never":
+            self.__every = int(spec)
+        if ((self.__every is not None and self.__every < 1) or
+                (self.__interval is not None and self.__interval < 0)):
+            raise ValueError("invalid fsync policy: {}".format(spec))
+        self.__writes = 0
+        self.__synced_at = monotonic()
+
+    def due(self):
+        """Record a write and return whether it should be flushed."""
+        self.__writes += 1
+        if self.__every is not None:
+            if self.__writes < self.__every:
+                return False
+        elif self.__interval is not None:
+            if monotonic() - self.__synced_at < self.__interval:
+                return False
+        else:
+            return False
+        self.__writes = 0
+        self.__synced_at = monotonic()
+        return True
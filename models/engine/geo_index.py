@@ -0,0 +1,279 @@
+#!/usr/bin/python3
+"""Defines the GeoIndex class."""
+import heapq
+from math import asin, ceil, cos, degrees, inf, isfinite, radians, sin, sqrt
+
+EARTH_RADIUS_KM = 6371.0088
+
+
+def haversine(lat1, lon1, lat2, lon2):
+    """Return the great-circle distance between two points, in km."""
+    phi1, phi2 = radians(lat1), radians(lat2)
+    a = (sin((phi2 - phi1) / 2) ** 2 +
+         cos(phi1) * cos(phi2) * sin(radians(lon2 - lon1) / 2) ** 2)
+    return 2 * EARTH_RADIUS_KM * asin(min(1.0, sqrt(a)))
+
+
+def _coordinate(value, limit):
+    """Return whether value is a number within [-limit, limit]."""
+    return (type(value) in (int, float) and isfinite(value) and
+            -limit <= value <= limit)
+
+
+class GeoIndex:
+    """Grid index of the objects of one class by latitude and longitude.
+
+    The globe is divided into square cells of cell degrees, each holding
+    the points that fall into it, so radius and bounding-box searches only
+    look at the points of the cells they overlap, and nearest-neighbour
+    searches visit rings of cells around the query point until no point
+    left outside can be closer, or check every point once the rings have
+    visited more cells than hold points. Longitudes wrap around the
+    antimeridian.
+
+    Objects whose coordinates are not numbers within range are left out of
+    the index.
+
+    Attributes:
+        name (tuple): The names of the latitude and longitude attributes.
+        cell (float): The size of a cell, in degrees.
+        __cells (dict): The (latitude, longitude) of each key, by cell.
+        __points (dict): The (latitude, longitude) of each key.
+    """
+
+    def __init__(self, name=("latitude", "longitude"), cell=0.1):
+        """Initialize a GeoIndex.
+
+        Args:
+            name (tuple): The names of the latitude and longitude
+                attributes.
+            cell (float): The size of a cell, in degrees.
+        """
+        self.name = name
+        self.cell = cell
+        self.__rows = ceil(180 / cell)
+        self.__cols = ceil(360 / cell)
+        self.__cells = {}
+        self.__points = {}
+
+    def add(self, key, value):
+        """Index the object of key at value, replacing its old position.
+
+        Args:
+            key (str): The "<class>.<id>" key of the object.
+            value (tuple): The (latitude, longitude) of the object.
+        """
+        if self.__points.get(key) == value:
+            return
+        self.remove(key)
+        latitude, longitude = value
+        if not (_coordinate(latitude, 90) and _coordinate(longitude, 180)):
+            return
+        point = (latitude, longitude)
+        self.__cells.setdefault(self.__cell(*point), {})[key] = point
+        self.__points[key] = point
+
+    def remove(self, key):
+        """Remove the object of key from the index, if it is indexed."""
+        point = self.__points.pop(key, None)
+        if point is None:
+            return
+        cell = self.__cell(*point)
+        points = self.__cells[cell]
+        del points[key]
+        if not points:
+            del self.__cells[cell]
+
+    def bbox(self, south, west, north, east):
+        """Return the keys of the points within a bounding box.
+
+        A box whose west edge is east of its east edge crosses the
+        antimeridian.
+
+        Args:
+            south (float): The lowest latitude.
+            west (float): The western longitude.
+            north (float): The highest latitude.
+            east (float): The eastern longitude.
+
+        Returns:
+            list: The keys of the points within the box, edges included,
+                or none if a bound is not a finite number.
+        """
+        if not all(map(isfinite, (south, west, north, east))):
+            return []
+        if south > north:
+            return []
+        south, north = max(south, -90), min(north, 90)
+        rows = range(self.__row(south), self.__row(north) + 1)
+        if west <= east:
+            cols = self.__col_span(west, east)
+        else:
+            cols = self.__col_span(west, 180) | self.__col_span(-180, east)
+        if len(rows) * len(cols) > len(self.__cells):
+            cells = [points for (row, col), points in self.__cells.items()
+                     if row in rows and col in cols]
+        else:
+            cells = [self.__cells[(row, col)] for row in rows for col in cols
+                     if (row, col) in self.__cells]
+        found = []
+        for points in cells:
+            for key, (latitude, longitude) in points.items():
+                if not south <= latitude <= north:
+                    continue
+                if west <= east:
+                    inside = west <= longitude <= east
+                else:
+                    inside = longitude >= west or longitude <= east
+                if inside:
+                    found.append(key)
+        return found
+
+    def radius(self, latitude, longitude, km):
+        """Return the points within a distance of a point.
+
+        Args:
+            latitude (float): The latitude of the point.
+            longitude (float): The longitude of the point.
+            km (float): The distance, in km.
+
+        Returns:
+            list: The (distance, key) pairs of the points, closest first,
+                or none if an argument is not a finite number.
+        """
+        if not all(map(isfinite, (latitude, longitude, km))) or km < 0:
+            return []
+        angle = km / EARTH_RADIUS_KM
+        delta = degrees(angle)
+        south, north = latitude - delta, latitude + delta
+        if south <= -90 or north >= 90:
+            west, east = -180, 180
+        else:
+            delta = degrees(asin(sin(angle) / cos(radians(latitude))))
+            west, east = longitude - delta, longitude + delta
+            if west < -180:
+                west += 360
+            if east > 180:
+                east -= 360
+        found = []
+        for key in self.bbox(south, west, north, east):
+            distance = haversine(latitude, longitude, *self.__points[key])
+            if distance <= km:
+                found.append((distance, key))
+        found.sort()
+        return found
+
+    def nearest(self, latitude, longitude, k):
+        """Return the k points closest to a point.
+
+        Args:
+            latitude (float): The latitude of the point.
+            longitude (float): The longitude of the point.
+            k (int): The number of points.
+
+        Returns:
+            list: The (distance, key) pairs of the points, closest first,
+                or none if the point is not finite.
+        """
+        if not (isfinite(latitude) and isfinite(longitude)) or k <= 0:
+            return []
+        if k >= len(self.__points):
+            return self.__scan(latitude, longitude, k)
+        row0, col0 = self.__cell(latitude, longitude)
+        best = []
+        ring = 0
+        visited = 0
+        while True:
+            cells = self.__ring(row0, col0, ring)
+            visited += len(cells)
+            for cell in cells:
+                for key, point in self.__cells.get(cell, {}).items():
+                    item = (-haversine(latitude, longitude, *point), key)
+                    if len(best) < k:
+                        heapq.heappush(best, item)
+                    elif item > best[0]:
+                        heapq.heapreplace(best, item)
+            bound = self.__bound(latitude, longitude, row0, col0, ring)
+            if len(best) == k and -best[0][0] <= bound:
+                break
+            if bound == inf:
+                break
+            if visited > len(self.__cells):
+                return self.__scan(latitude, longitude, k)
+            ring += 1
+        return sorted((-distance, key) for distance, key in best)
+
+    def __len__(self):
+        """Return the number of indexed objects."""
+        return len(self.__points)
+
+    def __row(self, latitude):
+        """Return the row of the cells holding latitude."""
+        return min(int((latitude + 90) // self.cell), self.__rows - 1)
+
+    def __col(self, longitude):
+        """Return the column of the cells holding longitude."""
+        return int((longitude + 180) // self.cell) % self.__cols
+
+    def __cell(self, latitude, longitude):
+        """Return the cell holding a point."""
+        return self.__row(latitude), self.__col(longitude)
+
+    def __col_span(self, west, east):
+        """Return the columns of the cells between two longitudes."""
+        first = int((west + 180) // self.cell)
+        last = int((east + 180) // self.cell)
+        if last - first + 1 >= self.__cols:
+            return set(range(self.__cols))
+        return {col % self.__cols for col in range(first, last + 1)}
+
+    def __ring(self, row0, col0, ring):
+        """Return the cells at a distance of ring cells from a cell.
+
+        Only the edge of the square of cells within ring is returned: its
+        first and last rows, and the first and last columns of the rows in
+        between.
+        """
+        if 2 * ring + 1 >= self.__cols:
+            cols = range(self.__cols)
+        else:
+            cols = [(col0 + d) % self.__cols for d in range(-ring, ring + 1)]
+        cells = set()
+        for row in {row0 - ring, row0 + ring}:
+            if 0 <= row < self.__rows:
+                cells.update((row, col) for col in cols)
+        if 0 < ring <= self.__cols // 2:
+            sides = {(col0 - ring) % self.__cols, (col0 + ring) % self.__cols}
+            for row in range(max(row0 - ring + 1, 0),
+                             min(row0 + ring - 1, self.__rows - 1) + 1):
+                cells.update((row, col) for col in sides)
+        return cells
+
+    def __bound(self, latitude, longitude, row0, col0, ring):
+        """Return the smallest distance, in km, of a point outside a ring.
+
+        Points outside the square of cells within ring of (row0, col0)
+        either lie beyond its northern or southern edge, at least as far
+        as that latitude, or beyond the meridian of its eastern or western
+        edge, at least as far as the great circle of that meridian.
+        """
+        bound = inf
+        offset = latitude + 90 - row0 * self.cell
+        if row0 - ring > 0:
+            bound = radians(offset + ring * self.cell) * EARTH_RADIUS_KM
+        if row0 + ring + 1 < self.__rows:
+            bound = min(bound, radians(
+                (ring + 1) * self.cell - offset) * EARTH_RADIUS_KM)
+        if 2 * ring + 1 < self.__cols:
+            offset = (longitude + 180 - col0 * self.cell) % 360
+            delta = min(offset + ring * self.cell,
+                        (ring + 1) * self.cell - offset, 90)
+            bound = min(bound, EARTH_RADIUS_KM * asin(
+                sin(radians(delta)) * cos(radians(latitude))))
+        return bound
+
+    def __scan(self, latitude, longitude, k):
+        """Return the k points closest to a point by checking them all."""
+        return heapq.nsmallest(k, (
+            (haversine(latitude, longitude, *point), key)
+            for key, point in self.__points.items()))
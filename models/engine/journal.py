@@ -0,0 +1,84 @@
+#!/usr/bin/python3
+"""Defines the Journal class."""
+import json
+import os
+from models.engine import compression
+
+
+class Journal:
+    """Append-only log of storage mutations.
+
+    Each line of the journal holds one JSON record:
+        {"op": "create", "key": "<class>.<id>", "data": {...}}
+        {"op": "update", "key": "<class>.<id>", "data": {...}}
+        {"op": "delete", "key": "<class>.<id>"}
+
+    A path ending in ".gz" or ".xz" is compressed, one stream per append.
+
+    Attributes:
+        path (str): The file path of the journal.
+    """
+
+    def __init__(self, path):
+        """Initialize a Journal.
+
+        Args:
+            path (str): The file path of the journal.
+        """
+        self.path = path
+
+    @staticmethod
+    def encode(op, key, data=None):
+        """Return the journal line of a record.
+
+        Args:
+            op (str): The mutation, one of "create", "update" or "delete".
+            key (str): The "<class>.<id>" key of the mutated object.
+            data (str): The JSON-encoded dictionary of the object, for
+                "create" and "update" records.
+        """
+        if data is None:
+            return '{{"op": "{}", "key": {}}}\n'.format(op, json.dumps(key))
+        return '{{"op": "{}", "key": {}, "data": {}}}\n'.format(
+            op, json.dumps(key), data)
+
+    def append(self, lines, sync=False):
+        """Append records to the end of the journal.
+
+        Args:
+            lines (list): The lines of the records to write, in order, as
+                returned by encode().
+            sync (bool): Flush the journal to disk before returning.
+        """
+        with compression.open(self.path, "a") as f:
+            f.write("".join(lines))
+        if sync:
+            compression.sync(self.path)
+
+    def replay(self):
+        """Yield the records of the journal in the order they were written.
+
+        A trailing record that cannot be decoded is the result of an
+        interrupted append and ends the replay.
+        """
+        try:
+            with compression.open(self.path, "r") as f:
+                for line in f:
+                    try:
+                        yield json.loads(line)
+                    except ValueError:
+                        return
+        except (FileNotFoundError,) + compression.ERRORS:
+            return
+
+    def size(self):
+        """Return the size of the journal in bytes."""
+        try:
+            return os.path.getsize(self.path)
+        except OSError:
+            return 0
+
+    def truncate(self):
+        """Discard every record of the journal."""
+        with compression.open(self.path, "w"):
+            pass
@@ -0,0 +1,216 @@
+#!/usr/bin/python3
+"""Defines functions to read and write a JSON object one entry at a time.
+
+The storage file is a single JSON object mapping "<class>.<id>" keys to the
+dictionaries of the objects. These functions let it be read and written
+without holding the whole document in memory.
+"""
+import json
+
+_decoder = json.JSONDecoder()
+_WHITESPACE = " \t\n\r"
+
+
+class _Reader:
+    """Buffered view of a text file for incremental JSON decoding."""
+
+    def __init__(self, f, chunk_size):
+        """Initialize a _Reader over f, reading chunk_size characters."""
+        self.f = f
+        self.chunk_size = chunk_size
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+
+    def fill(self):
+        """Read one more chunk, dropping the consumed part of the buffer."""
+        chunk = self.f.read(self.chunk_size)
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+        self.eof = not chunk
+
+    def char(self):
+        """Skip whitespace and return the next character, or ""."""
+        while True:
+            while (self.pos < len(self.buffer) and
+                   self.buffer[self.pos] in _WHITESPACE):
+                self.pos += 1
+            if self.pos < len(self.buffer) or self.eof:
+                return self.buffer[self.pos:self.pos + 1]
+            self.fill()
+
+    def expect(self, chars):
+        """Consume the next character, which must be one of chars."""
+        c = self.char()
+        if not c or c not in chars:
+            raise json.JSONDecodeError(
+                "Expecting one of {!r}".format(chars), self.buffer, self.pos)
+        self.pos += 1
+        return c
+
+    def value(self, text=False):
+        """Decode and consume the next JSON value.
+
+        Args:
+            text (bool): Return the JSON text of the value instead.
+        """
+        self.char()
+        while True:
+            start = self.pos
+            try:
+                value, end = _decoder.raw_decode(self.buffer, start)
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+                self.fill()
+                continue
+            if end == len(self.buffer) and not self.eof:
+                self.fill()
+                continue
+            self.pos = end
+            if text:
+                return self.buffer[start:end]
+            return value
+
+
+def iter_entries(f, chunk_size=65536):
+    """Yield the (key, value) pairs of the JSON object stored in f.
+
+    Only one entry is decoded at a time, so memory use is proportional to
+    the largest entry rather than to the whole file.
+
+    Args:
+        f (file): A text file opened for reading.
+        chunk_size (int): The number of characters read at a time.
+
+    Raises:
+        json.JSONDecodeError: If f does not hold a JSON object.
+    """
+    return _iter_values(f, chunk_size, False)
+
+
+def iter_fragments(f, chunk_size=65536):
+    """Yield the key and the JSON text of each value of the object in f.
+
+    Each value is still decoded to be validated, but only its text is
+    kept, which is far smaller than the decoded dictionary and is a valid
+    encoding of it as returned by encode().
+
+    Args:
+        f (file): A text file opened for reading.
+        chunk_size (int): The number of characters read at a time.
+
+    Raises:
+        json.JSONDecodeError: If f does not hold a JSON object.
+    """
+    return _iter_values(f, chunk_size, True)
+
+
+def _iter_values(f, chunk_size, text):
+    """Yield the entries of the JSON object in f, as iter_entries() does.
+
+    Args:
+        text (bool): Yield the JSON text of each value instead of the value.
+    """
+    reader = _Reader(f, chunk_size)
+    reader.expect("{")
+    if reader.char() == "}":
+        return
+    while True:
+        key = reader.value()
+        if type(key) is not str:
+            raise json.JSONDecodeError("Expecting property name",
+                                       reader.buffer, reader.pos)
+        reader.expect(":")
+        yield key, reader.value(text)
+        if reader.expect(",}") == "}":
+            return
+
+
+def iter_spans(text):
+    """Yield the key and the span of each value of a JSON object.
+
+    Args:
+        text (str): The complete JSON object.
+
+    Yields:
+        tuple: (key, start, end) where text[start:end] is the JSON form of
+            the value of key.
+
+    Raises:
+        json.JSONDecodeError: If text is not a JSON object.
+    """
+    def skip(pos):
+        while pos < len(text) and text[pos] in _WHITESPACE:
+            pos += 1
+        return pos
+
+    def expect(pos, chars):
+        pos = skip(pos)
+        if pos >= len(text) or text[pos] not in chars:
+            raise json.JSONDecodeError(
+                "Expecting one of {!r}".format(chars), text, pos)
+        return pos + 1, text[pos]
+
+    pos = expect(0, "{")[0]
+    if text[skip(pos):skip(pos) + 1] == "}":
+        return
+    while True:
+        key, pos = _decoder.raw_decode(text, skip(pos))
+        if type(key) is not str:
+            raise json.JSONDecodeError("Expecting property name", text, pos)
+        start = skip(expect(pos, ":")[0])
+        end = _decoder.raw_decode(text, start)[1]
+        yield key, start, end
+        pos, c = expect(end, ",}")
+        if c == "}":
+            return
+
+
+def encode(key, record):
+    """Return the JSON encoding of a record.
+
+    Args:
+        key (str): The "<class>.<id>" key of the record.
+        record (dict): The dictionary of the object, as returned by its
+            to_dict() method.
+    """
+    return json.dumps(record)
+
+
+def decode(fragment):
+    """Return the record of a JSON encoding.
+
+    Args:
+        fragment (str): The record, as returned by encode().
+    """
+    return json.loads(fragment)
+
+
+def write_entries(f, entries):
+    """Write a JSON object to f one entry at a time.
+
+    The output is identical to json.dump() of the same object.
+
+    Args:
+        f (file): A text file opened for writing.
+        entries (iterable): The (key, value) pairs of the object, where
+            value is already encoded in JSON.
+
+    Returns:
+        list: The (key, start, end) span of each value in the file, in
+            bytes, as produced by iter_spans().
+    """
+    f.write("{")
+    spans = []
+    offset = 1
+    separator = ""
+    for key, value in entries:
+        prefix = separator + json.dumps(key) + ": "
+        f.write(prefix + value)
+        start = offset + len(prefix.encode())
+        offset = start + len(value.encode())
+        spans.append((key, start, offset))
+        separator = ", "
+    f.write("}")
+    return spans
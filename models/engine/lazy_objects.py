@@ -0,0 +1,230 @@
+#!/usr/bin/python3
+"""Defines the LazyObjects class."""
+from collections import OrderedDict
+from collections.abc import MutableMapping
+
+_UNREAD = object()
+
+
+class LazyObjects(MutableMapping):
+    """Dictionary of objects instantiated on first access.
+
+    Serialized records are stored as they are read from disk and only turned
+    into objects when they are looked up, so loading a large file does not
+    pay for the instantiation of objects that are never used. With a decode
+    function, records can be kept encoded, as str or bytes, which takes far
+    less memory than their dictionary, and are only decoded when looked up.
+
+    Records can also be left in a source mapping, such as a MmapSnapshot,
+    and only read from it when needed.
+
+    With a capacity, at most that many objects stay instantiated: once it
+    is exceeded, the least recently used objects without unsaved changes
+    are evicted, turned back into their record by encode, or left to be
+    read from the source again when they have not been modified since they
+    were read from it, and built again on their next access, which returns
+    the evicted object itself if build keeps track of live objects.
+
+    Attributes:
+        hits (int): The number of accesses to instantiated objects.
+        misses (int): The number of accesses that instantiated an object.
+        evictions (int): The number of evicted objects.
+        __entries (dict): The objects, or the records of the objects not
+            instantiated yet, by "<class>.<id>" key.
+        __build (function): Instantiates an object from its record.
+        __source (Mapping): The records not read yet, by key.
+        __capacity (int): The maximum number of instantiated objects, or
+            None for no maximum.
+        __dirty (function): Returns whether the object of a key has unsaved
+            changes, which keep it from being evicted.
+        __encode (function): Returns the record of an evicted object.
+        __decode (function): Returns the dictionary of an encoded record,
+            or None if records are only kept as dictionaries.
+        __resident (OrderedDict): The keys of the instantiated objects,
+            least recently used first, when there is a capacity.
+        __sourced (set): The keys of the objects read from the source and
+            not modified since.
+    """
+
+    def __init__(self, build, objects=None, capacity=None, dirty=None,
+                 encode=None, decode=None):
+        """Initialize a LazyObjects.
+
+        Args:
+            build (function): Instantiates an object from its record.
+            objects (dict): The objects already instantiated.
+            capacity (int): The maximum number of instantiated objects, or
+                None for no maximum.
+            dirty (function): Returns whether the object of a key has
+                unsaved changes. Objects are all evictable by default.
+            encode (function): Returns the record of an evicted object from
+                its key and the object, its to_dict() dictionary by default.
+            decode (function): Returns the dictionary of a record encoded
+                as str or bytes, by encode or as passed to load().
+
+        Raises:
+            ValueError: If capacity is not a positive number.
+        """
+        if capacity is not None and (type(capacity) is not int or
+                                     capacity < 1):
+            raise ValueError("invalid capacity: {}".format(capacity))
+        self.__build = build
+        self.__entries = dict(objects or {})
+        self.__source = None
+        self.__capacity = capacity
+        self.__dirty = dirty or (lambda key: False)
+        self.__encode = encode or (lambda key, obj: obj.to_dict())
+        self.__decode = decode
+        self.__resident = OrderedDict()
+        self.__sourced = set()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        if capacity is not None:
+            self.__resident.update(dict.fromkeys(self.__entries))
+            self.__shrink()
+
+    def __getitem__(self, key):
+        """Return the object of key, instantiating it if needed."""
+        value = self.__entries[key]
+        if value is _UNREAD:
+            value = self.__source[key]
+            self.__sourced.add(key)
+        elif self.__encoded(value):
+            value = self.__decode(value)
+        if type(value) is dict:
+            value = self.__entries[key] = self.__build(value)
+            self.misses += 1
+        else:
+            self.hits += 1
+        if self.__capacity is not None:
+            self.__resident[key] = None
+            self.__resident.move_to_end(key)
+            self.__shrink()
+        return value
+
+    def __setitem__(self, key, obj):
+        """Store an object under key."""
+        self.__entries[key] = obj
+        self.__sourced.discard(key)
+        if self.__capacity is not None:
+            self.__resident[key] = None
+            self.__resident.move_to_end(key)
+            self.__shrink()
+
+    def __delitem__(self, key):
+        """Remove the object or record of key."""
+        del self.__entries[key]
+        self.__resident.pop(key, None)
+        self.__sourced.discard(key)
+
+    def __iter__(self):
+        """Iterate over the keys."""
+        return iter(list(self.__entries))
+
+    def __len__(self):
+        """Return the number of objects and records."""
+        return len(self.__entries)
+
+    def __contains__(self, key):
+        """Return whether an object or record is stored under key."""
+        return key in self.__entries
+
+    def load(self, key, record):
+        """Store the record of an object to instantiate on first access.
+
+        Args:
+            key (str): The "<class>.<id>" key of the object.
+            record (dict): The dictionary of the object, as returned by
+                its to_dict() method, or its encoding as str or bytes if
+                there is a decode function.
+        """
+        self.__entries[key] = record
+        self.__resident.pop(key, None)
+        self.__sourced.discard(key)
+
+    def attach(self, source):
+        """Store every record of source, to read on first access.
+
+        The records left unread from a previously attached source are
+        dropped.
+
+        Args:
+            source (Mapping): The dictionaries of the objects, as returned by
+                their to_dict() method, by "<class>.<id>" key.
+        """
+        for key in [k for k, v in self.__entries.items() if v is _UNREAD]:
+            del self.__entries[key]
+        self.__source = source
+        for key in source:
+            self.__entries[key] = _UNREAD
+            self.__resident.pop(key, None)
+        self.__sourced.clear()
+
+    def is_loaded(self, key):
+        """Return whether the object of key has been instantiated."""
+        value = self.__entries.get(key)
+        return (type(value) is not dict and value is not _UNREAD and
+                not self.__encoded(value))
+
+    def count_loaded(self):
+        """Return the number of instantiated objects."""
+        if self.__capacity is not None:
+            return len(self.__resident)
+        return sum(1 for key in self.__entries if self.is_loaded(key))
+
+    def peek(self, keys=None, encoded=False):
+        """Return the (key, object or record) pairs without instantiating.
+
+        Records are the dictionaries returned by to_dict().
+
+        Args:
+            keys (iterable): The keys to return, instead of every key.
+            encoded (bool): Return the records kept encoded as they are,
+                instead of decoding them.
+        """
+        if keys is None:
+            items = list(self.__entries.items())
+        else:
+            items = [(key, self.__entries[key]) for key in keys]
+        decode = not encoded and self.__decode is not None
+        pairs = []
+        for key, value in items:
+            if value is _UNREAD:
+                value = self.__source[key]
+            elif decode and self.__encoded(value):
+                value = self.__decode(value)
+            pairs.append((key, value))
+        return pairs
+
+    def touch(self, key):
+        """Record that the object of key has been modified."""
+        self.__sourced.discard(key)
+
+    def __shrink(self):
+        """Evict the least recently used objects beyond the capacity.
+
+        The most recently used object, just returned or stored, is kept.
+        """
+        excess = len(self.__resident) - self.__capacity
+        if excess <= 0:
+            return
+        last = next(reversed(self.__resident))
+        evicted = []
+        for key in self.__resident:
+            if len(evicted) == excess or key == last:
+                break
+            if not self.__dirty(key):
+                evicted.append(key)
+        for key in evicted:
+            del self.__resident[key]
+            if key in self.__sourced:
+                self.__sourced.discard(key)
+                self.__entries[key] = _UNREAD
+            else:
+                self.__entries[key] = self.__encode(key, self.__entries[key])
+            self.evictions += 1
+
+    def __encoded(self, value):
+        """Return whether value is an encoded record."""
+        return self.__decode is not None and type(value) in (str, bytes)
@@ -0,0 +1,134 @@
+#!/usr/bin/python3
+"""Defines the MmapSnapshot class."""
+import json
+import mmap
+import os
+from collections.abc import Mapping
+from models.engine import binary_snapshot, json_stream
+
+
+def index_path(path):
+    """Return the path of the offset index of a snapshot."""
+    return path + ".idx"
+
+
+def write_index(path, spans):
+    """Write the offset index of a snapshot.
+
+    The index is stamped with the size and modification time of the
+    snapshot so that a stale index is detected and rebuilt.
+
+    Args:
+        path (str): The path of the snapshot.
+        spans (list): The (key, start, end) span of each record, in bytes.
+    """
+    stat = os.stat(path)
+    index = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns,
+             "spans": spans}
+    tmp_path = "{}.{}.tmp".format(index_path(path), os.getpid())
+    with open(tmp_path, "w") as f:
+        json.dump(index, f)
+    os.replace(tmp_path, index_path(path))
+
+
+class MmapSnapshot(Mapping):
+    """Read-only mapping of the records of a snapshot file.
+
+    The snapshot is mapped in memory and each record is decoded straight
+    from the mapped buffer when it is looked up, using an index of the
+    offset of every record. Processes mapping the same file share a single
+    copy of it in the page cache.
+
+    The index is read from the file written by write_index() next to the
+    snapshot, or rebuilt by scanning the snapshot once when it is missing
+    or stale.
+
+    Attributes:
+        path (str): The path of the snapshot.
+    """
+
+    def __init__(self, path):
+        """Initialize a MmapSnapshot.
+
+        Args:
+            path (str): The path of the snapshot. A path ending in ".bin" is
+                a binary snapshot, any other path a JSON file.
+
+        Raises:
+            FileNotFoundError: If the snapshot does not exist.
+            ValueError: If the snapshot cannot be decoded.
+        """
+        self.path = path
+        self.__binary = path.endswith(".bin")
+        with open(path, "rb") as f:
+            stat = os.fstat(f.fileno())
+            if stat.st_size:
+                self.__buffer = mmap.mmap(f.fileno(), 0,
+                                          access=mmap.ACCESS_READ)
+            else:
+                self.__buffer = b""
+        if self.__binary:
+            names = binary_snapshot.read_header(self.__buffer)[0]
+            self.__decoder = binary_snapshot.Decoder(names)
+        self.__spans = self.__read_index(stat)
+        if self.__spans is None:
+            spans = self.__scan()
+            self.__spans = {key: (start, end) for key, start, end in spans}
+            try:
+                write_index(path, spans)
+            except OSError:
+                pass
+
+    def __getitem__(self, key):
+        """Decode and return the record of key."""
+        start, end = self.__spans[key]
+        if self.__binary:
+            return self.__decoder.record(self.__buffer, start)[1]
+        return json.loads(self.__buffer[start:end])
+
+    def __iter__(self):
+        """Iterate over the keys of the snapshot."""
+        return iter(self.__spans)
+
+    def __len__(self):
+        """Return the number of records of the snapshot."""
+        return len(self.__spans)
+
+    def __contains__(self, key):
+        """Return whether the snapshot holds a record for key."""
+        return key in self.__spans
+
+    def close(self):
+        """Unmap the snapshot."""
+        if isinstance(self.__buffer, mmap.mmap):
+            self.__buffer.close()
+
+    def __read_index(self, stat):
+        """Return the spans of the index file, or None if it is stale."""
+        try:
+            with open(index_path(self.path)) as f:
+                index = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if (index.get("size") != stat.st_size or
+                index.get("mtime_ns") != stat.st_mtime_ns):
+            return None
+        return {key: (start, end) for key, start, end in index["spans"]}
+
+    def __scan(self):
+        """Return the spans of every record, in bytes, by scanning."""
+        if self.__binary:
+            return list(binary_snapshot.iter_spans(self.__buffer))
+        text = bytes(self.__buffer).decode()
+        spans = list(json_stream.iter_spans(text))
+        if text.isascii():
+            return spans
+        byte_spans = []
+        pos = offset = 0
+        for key, start, end in spans:
+            offset += len(text[pos:start].encode())
+            byte_start = offset
+            offset += len(text[start:end].encode())
+            byte_spans.append((key, byte_start, offset))
+            pos = end
+        return byte_spans
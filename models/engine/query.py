@@ -0,0 +1,206 @@
+#!/usr/bin/python3
+"""Defines the Query class."""
+import heapq
+from datetime import datetime
+from itertools import islice
+from models.engine.criteria import compare, parse
+
+_MISSING = object()
+
+
+def _field(cls, obj, name):
+    """Return the value of an attribute of an object.
+
+    Args:
+        cls (type): The class of the object.
+        obj (BaseModel): The object, or its dictionary as read from disk,
+            whose dates are then turned back into datetimes.
+        name (str): The name of the attribute.
+
+    Returns:
+        The value, or _MISSING if the object has no such attribute.
+    """
+    if type(obj) is not dict:
+        return getattr(obj, name, _MISSING)
+    if name not in obj:
+        return getattr(cls, name, _MISSING)
+    value = obj[name]
+    if name in ("created_at", "updated_at") and type(value) is str:
+        return datetime.fromisoformat(value)
+    return value
+
+
+class Query:
+    """Lazy query on the objects of one class.
+
+    A query is built by chaining where(), order_by(), limit(), offset() and
+    only(), each returning the query itself, and is run every time it is
+    iterated over, yielding its results one at a time:
+
+        for place in storage.query(Place).where(city_id=city.id,
+                                                price_by_night__lte=100)
+                                         .order_by("-price_by_night")
+                                         .limit(10):
+
+    The storage plans the query against its indexes. Objects that have not
+    been instantiated yet, such as those of a lazy FileStorage, are matched,
+    ordered and projected from their dictionaries, and only instantiated
+    when they are yielded.
+
+    Attributes:
+        __cls (type): The class of the objects.
+        __plan (function): Returns the (keys, ordered) plan of the query
+            from its criteria and order, where keys is an iterable of the
+            keys of the objects that can match, and ordered whether they
+            come in the order of the query.
+        __read (function): Returns the object of a key, or with record set,
+            its dictionary if it has not been instantiated yet; None if the
+            object is no longer stored.
+        __criteria (dict): The value of each criterion, by name.
+        __order (list): The (name, reverse) pairs of the attributes to
+            order by.
+        __limit (int): The maximum number of results, if any.
+        __offset (int): The number of results to skip.
+        __fields (tuple): The names of the attributes to project, if any.
+    """
+
+    def __init__(self, cls, plan, read):
+        """Initialize a Query.
+
+        Args:
+            cls (type): The class of the objects.
+            plan (function): Plans the query, as described above.
+            read (function): Reads an object, as described above.
+        """
+        self.__cls = cls
+        self.__plan = plan
+        self.__read = read
+        self.__criteria = {}
+        self.__order = []
+        self.__limit = None
+        self.__offset = 0
+        self.__fields = None
+
+    def where(self, **criteria):
+        """Restrict the query to the objects matching criteria.
+
+        Args:
+            **criteria: The value of each criterion, as described in
+                models.engine.criteria.
+        """
+        self.__criteria.update(criteria)
+        return self
+
+    def order_by(self, *names):
+        """Order the results by attributes, replacing any previous order.
+
+        Args:
+            *names (str): The names of the attributes, each prefixed with
+                "-" for a decreasing order.
+        """
+        self.__order = [(name[1:], True) if name.startswith("-")
+                        else (name, False) for name in names]
+        return self
+
+    def limit(self, n):
+        """Yield at most n results, or all of them if n is None.
+
+        Raises:
+            ValueError: If n is negative.
+        """
+        if n is not None and n < 0:
+            raise ValueError("invalid limit: {}".format(n))
+        self.__limit = n
+        return self
+
+    def offset(self, n):
+        """Skip the first n results.
+
+        Raises:
+            ValueError: If n is negative.
+        """
+        if n < 0:
+            raise ValueError("invalid offset: {}".format(n))
+        self.__offset = n
+        return self
+
+    def only(self, *names):
+        """Yield dictionaries of some attributes instead of objects.
+
+        Attributes an object does not have are left out of its dictionary.
+
+        Args:
+            *names (str): The names of the attributes.
+        """
+        self.__fields = names
+        return self
+
+    def __iter__(self):
+        """Run the query, yielding its results.
+
+        Raises:
+            TypeError: If the values of an attribute ordered by cannot be
+                compared.
+        """
+        keys, ordered = self.__plan(self.__criteria, self.__order)
+        rows = self.__rows(keys)
+        if self.__order and not ordered:
+            rows = self.__sort(rows)
+        stop = None
+        if self.__limit is not None:
+            stop = self.__offset + self.__limit
+        for key, obj in islice(rows, self.__offset, stop):
+            if self.__fields is None:
+                if type(obj) is dict:
+                    obj = self.__read(key)
+                yield obj
+            else:
+                yield self.__project(obj)
+
+    def __rows(self, keys):
+        """Yield the (key, object or dictionary) pairs matching criteria."""
+        criteria = [parse(name) + (value,)
+                    for name, value in self.__criteria.items()]
+        for key in keys:
+            obj = self.__read(key, record=True)
+            if obj is None:
+                continue
+            for attribute, operator, value in criteria:
+                actual = _field(self.__cls, obj, attribute)
+                if (actual is _MISSING or
+                        not compare(actual, operator, value)):
+                    break
+            else:
+                yield key, obj
+
+    def __sort(self, rows):
+        """Return rows in the order of the query.
+
+        With a limit and every attribute ordered the same way, only the
+        rows within the limit are kept while the others are read.
+        """
+        cls = self.__cls
+        reverse = {reverse for name, reverse in self.__order}
+        if self.__limit is not None and len(reverse) == 1:
+            names = [name for name, reverse in self.__order]
+
+            def key(row):
+                return tuple(_field(cls, row[1], name) for name in names)
+            n = self.__offset + self.__limit
+            if reverse.pop():
+                return iter(heapq.nlargest(n, rows, key))
+            return iter(heapq.nsmallest(n, rows, key))
+        rows = list(rows)
+        for name, reverse in reversed(self.__order):
+            rows.sort(key=lambda row: _field(cls, row[1], name),
+                      reverse=reverse)
+        return iter(rows)
+
+    def __project(self, obj):
+        """Return the dictionary of the projected attributes of obj."""
+        projection = {}
+        for name in self.__fields:
+            value = _field(self.__cls, obj, name)
+            if value is not _MISSING:
+                projection[name] = value
+        return projection
@@ -0,0 +1,75 @@
+#!/usr/bin/python3
+"""Defines the RangeIndex class."""
+from bisect import bisect_left, insort
+
+
+class RangeIndex:
+    """Sorted index of the objects of one class by a numeric attribute.
+
+    The (value, key) pair of every object is kept in a list sorted with
+    bisect, so a range of values is found in O(log N + k) for k matches.
+    Objects whose value is not an int or a float, or is NaN, are left out
+    of the index.
+
+    Attributes:
+        name (str): The name of the indexed attribute.
+        __entries (list): The sorted (value, key) pairs.
+        __values (dict): The indexed value of each key.
+    """
+
+    def __init__(self, name):
+        """Initialize a RangeIndex.
+
+        Args:
+            name (str): The name of the indexed attribute.
+        """
+        self.name = name
+        self.__entries = []
+        self.__values = {}
+
+    def add(self, key, value):
+        """Index the object of key under value, replacing its old value.
+
+        Args:
+            key (str): The "<class>.<id>" key of the object.
+            value: The value of the attribute of the object.
+        """
+        if key in self.__values:
+            if self.__values[key] == value and type(value) in (int, float):
+                return
+            self.remove(key)
+        if type(value) not in (int, float) or value != value:
+            return
+        insort(self.__entries, (value, key))
+        self.__values[key] = value
+
+    def remove(self, key):
+        """Remove the object of key from the index, if it is indexed."""
+        if key not in self.__values:
+            return
+        value = self.__values.pop(key)
+        del self.__entries[bisect_left(self.__entries, (value, key))]
+
+    def range(self, low=None, high=None):
+        """Return the keys of the objects whose value is within bounds.
+
+        Args:
+            low (float): The lowest value to match, if any.
+            high (float): The highest value to match, if any.
+
+        Returns:
+            list: The keys, in increasing order of value.
+        """
+        entries = self.__entries
+        start = 0 if low is None else bisect_left(entries, (low,))
+        if high is None:
+            end = len(entries)
+        else:
+            end = bisect_left(entries, (high,), start)
+            while end < len(entries) and entries[end][0] == high:
+                end += 1
+        return [key for value, key in entries[start:end]]
+
+    def __len__(self):
+        """Return the number of indexed objects."""
+        return len(self.__values)
@@ -0,0 +1,390 @@
+#!/usr/bin/python3
+"""Defines the SQLiteStorage class."""
+import json
+import sqlite3
+from contextlib import contextmanager
+from models.engine.column_table import ColumnTable, kinds
+from models.engine.criteria import matches
+from models.engine.geo_index import GeoIndex
+from models.engine.query import Query
+from models.engine.text_index import TextIndex
+from models.base_model import classes
+# Imported to register the model classes in classes
+from models.amenity import Amenity  # noqa: F401
+from models.city import City  # noqa: F401
+from models.place import Place  # noqa: F401
+from models.review import Review  # noqa: F401
+from models.state import State  # noqa: F401
+from models.user import User  # noqa: F401
+
+
+class SQLiteStorage:
+    """Manage the storage of objects in a SQLite database.
+
+    Each class is stored in a table of its own, one row per object holding
+    the id of the object and its dictionary in JSON format. Objects are only
+    read from the database when they are first looked up.
+
+    Attributes:
+        __objects (dict): The objects read from or added to the database.
+        __tables (set): The names of the classes whose table exists.
+    """
+
+    def __init__(self, *, path="hbnb.db"):
+        """Initialize a SQLiteStorage.
+
+        Args:
+            path (str): The file path of the database.
+        """
+        self.__connection = sqlite3.connect(path)
+        self.__connection.execute("PRAGMA journal_mode=WAL")
+        self.__tables = set()
+        for class_name in list(classes):
+            self.__table(class_name)
+        self.__connection.commit()
+        self.__objects = {}
+        self.__pending = {}
+        self.__batch_depth = 0
+        self.__deferred = False
+
+    def all(self, cls=None):
+        """Retrieve all stored objects, or those of one class.
+
+        Args:
+            cls (str): The class, or class name, of the objects to retrieve.
+
+        Returns:
+            dict: A dictionary containing all stored objects, or only those
+                of cls.
+        """
+        if cls is None:
+            class_names = list(classes)
+        else:
+            class_names = [cls if isinstance(cls, str) else cls.__name__]
+        for class_name in class_names:
+            if class_name not in classes:
+                continue
+            rows = self.__connection.execute(
+                "SELECT id, data FROM {}".format(self.__table(class_name)))
+            for id, data in rows:
+                key = "{}.{}".format(class_name, id)
+                if key not in self.__objects and key not in self.__pending:
+                    self.__objects[key] = self.__build(class_name, data)
+        if cls is None:
+            return self.__objects
+        prefix = class_names[0] + "."
+        return {key: obj for key, obj in self.__objects.items()
+                if key.startswith(prefix)}
+
+    def count(self, cls=None):
+        """Count the stored objects, or those of one class.
+
+        Objects are counted in the database without being read, unless
+        changes to them are waiting to be written.
+
+        Args:
+            cls (str): The class, or class name, of the objects to count.
+
+        Returns:
+            int: The number of objects.
+        """
+        if cls is None:
+            return sum(self.count(class_name) for class_name in classes)
+        class_name = cls if isinstance(cls, str) else cls.__name__
+        if class_name not in classes:
+            return 0
+        prefix = class_name + "."
+        if any(key.startswith(prefix) for key in self.__pending):
+            return len(self.all(class_name))
+        return self.__connection.execute(
+            "SELECT COUNT(*) FROM {}".format(self.__table(class_name))
+        ).fetchone()[0]
+
+    def get(self, cls, id):
+        """Retrieve one stored object.
+
+        Args:
+            cls (str): The class, or class name, of the object.
+            id (str): The id of the object.
+
+        Returns:
+            BaseModel: The object, or None if it is not stored.
+        """
+        class_name = cls if isinstance(cls, str) else cls.__name__
+        key = "{}.{}".format(class_name, id)
+        if key in self.__objects or key in self.__pending:
+            return self.__objects.get(key)
+        if class_name not in classes:
+            return None
+        row = self.__connection.execute(
+            "SELECT data FROM {} WHERE id = ?".format(
+                self.__table(class_name)), (id,)).fetchone()
+        if row is None:
+            return None
+        obj = self.__objects[key] = self.__build(class_name, row[0])
+        return obj
+
+    def find(self, cls, **criteria):
+        """Retrieve the objects of a class matching criteria.
+
+        Args:
+            cls (str): The class, or class name, of the objects.
+            **criteria: The value of each criterion, as described in
+                models.engine.criteria.
+
+        Returns:
+            list: The matching objects.
+        """
+        return [obj for obj in self.all(cls).values()
+                if matches(obj, criteria)]
+
+    def query(self, cls):
+        """Start a query on the objects of a class.
+
+        The objects of the class are read from the database and checked
+        one at a time.
+
+        Args:
+            cls (str): The class, or class name, of the objects.
+
+        Returns:
+            Query: The query, as described in models.engine.query.
+        """
+        class_name = cls if isinstance(cls, str) else cls.__name__
+
+        def plan(criteria, order):
+            return list(self.all(class_name)), False
+        return Query(classes.get(class_name), plan, self.__read)
+
+    def find_range(self, cls, name, low=None, high=None):
+        """Retrieve the objects of a class whose attribute is within bounds.
+
+        Args:
+            cls (str): The class, or class name, of the objects.
+            name (str): The name of the numeric attribute.
+            low (float): The lowest value to match, if any.
+            high (float): The highest value to match, if any.
+
+        Returns:
+            list: The matching objects, in increasing order of the
+                attribute.
+        """
+        found = []
+        for obj in self.all(cls).values():
+            value = getattr(obj, name, None)
+            if (type(value) in (int, float) and
+                    (low is None or low <= value) and
+                    (high is None or value <= high)):
+                found.append(obj)
+        found.sort(key=lambda obj: getattr(obj, name))
+        return found
+
+    def near(self, cls, latitude, longitude, km):
+        """Retrieve the objects of a class within a distance of a point.
+
+        Args:
+            cls (str): The class, or class name, of the objects.
+            latitude (float): The latitude of the point.
+            longitude (float): The longitude of the point.
+            km (float): The distance, in km.
+
+        Returns:
+            list: The matching objects, closest first.
+        """
+        objects = self.all(cls)
+        return [objects[key] for distance, key in
+                self.__geo_index(objects).radius(latitude, longitude, km)]
+
+    def within(self, cls, south, west, north, east):
+        """Retrieve the objects of a class within a bounding box.
+
+        Args:
+            cls (str): The class, or class name, of the objects.
+            south (float): The lowest latitude.
+            west (float): The western longitude.
+            north (float): The highest latitude.
+            east (float): The eastern longitude.
+
+        Returns:
+            list: The matching objects.
+        """
+        objects = self.all(cls)
+        return [objects[key] for key in
+                self.__geo_index(objects).bbox(south, west, north, east)]
+
+    def nearest(self, cls, latitude, longitude, k=1):
+        """Retrieve the objects of a class closest to a point.
+
+        Args:
+            cls (str): The class, or class name, of the objects.
+            latitude (float): The latitude of the point.
+            longitude (float): The longitude of the point.
+            k (int): The number of objects.
+
+        Returns:
+            list: The k closest objects, closest first.
+        """
+        objects = self.all(cls)
+        return [objects[key] for distance, key in
+                self.__geo_index(objects).nearest(latitude, longitude, k)]
+
+    def search(self, cls, query):
+        """Retrieve the objects of a class matching a full-text query.
+
+        Args:
+            cls (str): The class, or class name, of the objects.
+            query (str): Words that must all appear in the __text__ fields
+                of a matching object, with OR separating alternatives.
+
+        Returns:
+            list: The matching objects, ranked by BM25 score.
+        """
+        class_name = cls if isinstance(cls, str) else cls.__name__
+        if class_name not in classes:
+            return []
+        objects = self.all(class_name)
+        names = classes[class_name].__text__
+        index = TextIndex(names)
+        for key, obj in objects.items():
+            index.add(key, tuple(getattr(obj, name, None) for name in names))
+        return [objects[key] for score, key in index.search(query)]
+
+    def columns(self, cls):
+        """Return a columnar table of the objects of a class.
+
+        The table is built from the objects read from the database, over
+        the __columns__ of the class, and is not kept up to date.
+
+        Args:
+            cls (str): The class, or class name, of the objects.
+
+        Returns:
+            ColumnTable: The table, as described in
+                models.engine.column_table.
+        """
+        class_name = cls if isinstance(cls, str) else cls.__name__
+        if class_name not in classes:
+            return ColumnTable((), ())
+        names = classes[class_name].__columns__
+        table = ColumnTable(names, kinds(classes[class_name]))
+        for key, obj in self.all(class_name).items():
+            table.add(key, tuple(getattr(obj, name, None) for name in names))
+        return table
+
+    def new(self, obj):
+        """Add a new object to the storage.
+
+        Args:
+            obj (BaseModel): The object to be added.
+        """
+        key = "{}.{}".format(obj.__class__.__name__, obj.id)
+        self.__objects[key] = obj
+        self.__pending[key] = "create"
+
+    def touch(self, obj):
+        """Record that a stored object has been modified.
+
+        Args:
+            obj (BaseModel): The modified object.
+        """
+        key = "{}.{}".format(obj.__class__.__name__, obj.id)
+        if self.__objects.get(key) is obj and key not in self.__pending:
+            self.__pending[key] = "update"
+
+    def delete(self, obj):
+        """Remove an object from the storage.
+
+        Args:
+            obj (BaseModel): The object to be removed.
+        """
+        key = "{}.{}".format(obj.__class__.__name__, obj.id)
+        self.__objects.pop(key, None)
+        self.__pending[key] = "delete"
+
+    def save(self):
+        """Write the pending changes to the database.
+
+        Inside a batch() block the write is deferred to the end of the block.
+        """
+        if self.__batch_depth:
+            self.__deferred = True
+            return
+        self.flush()
+
+    def flush(self):
+        """Write the pending changes to the database now."""
+        pending, self.__pending = self.__pending, {}
+        self.__deferred = False
+        with self.__connection:
+            for key, op in pending.items():
+                class_name, id = key.split(".", 1)
+                if class_name not in classes:
+                    continue
+                table = self.__table(class_name)
+                if op == "delete":
+                    self.__connection.execute(
+                        "DELETE FROM {} WHERE id = ?".format(table), (id,))
+                elif key in self.__objects:
+                    self.__connection.execute(
+                        "INSERT OR REPLACE INTO {} (id, data) "
+                        "VALUES (?, ?)".format(table),
+                        (id, json.dumps(self.__objects[key].to_dict())))
+
+    @contextmanager
+    def batch(self):
+        """Defer every save requested inside the block to a single write."""
+        self.__batch_depth += 1
+        try:
+            yield self
+        finally:
+            self.__batch_depth -= 1
+            if not self.__batch_depth and self.__deferred:
+                self.flush()
+
+    def reload(self):
+        """Forget the objects read from the database.
+
+        Objects with pending changes are kept; the others are read again
+        from the database when they are next looked up.
+        """
+        self.__objects = {key: obj for key, obj in self.__objects.items()
+                          if key in self.__pending}
+
+    def compact(self):
+        """Rebuild the database file to reclaim the space of deleted rows."""
+        self.flush()
+        self.__connection.execute("VACUUM")
+
+    def close(self):
+        """Write the pending changes and close the database."""
+        self.flush()
+        self.__connection.close()
+
+    def __table(self, class_name):
+        """Return the quoted name of the table of a class, creating the
+        table the first time a class registered after start-up is used."""
+        table = '"{}"'.format(class_name)
+        if class_name not in self.__tables:
+            self.__connection.execute(
+                "CREATE TABLE IF NOT EXISTS {} "
+                "(id TEXT PRIMARY KEY, data TEXT NOT NULL)".format(table))
+            self.__tables.add(class_name)
+        return table
+
+    def __read(self, key, record=False):
+        """Return the object read under key, as used by Query."""
+        return self.__objects.get(key)
+
+    def __geo_index(self, objects):
+        """Return a GeoIndex of objects by latitude and longitude."""
+        index = GeoIndex()
+        for key, obj in objects.items():
+            index.add(key, (getattr(obj, "latitude", None),
+                            getattr(obj, "longitude", None)))
+        return index
+
+    def __build(self, class_name, data):
+        """Instantiate an object from its JSON form."""
+        objct = json.loads(data)
+        del objct["__class__"]
+        return classes[class_name](**objct)
@@ -0,0 +1,144 @@
+#!/usr/bin/python3
+"""Defines the TextIndex class."""
+import re
+from math import log
+
+_TOKEN = re.compile(r"\w+")
+
+
+def tokenize(text):
+    """Return the lowercase words of a text."""
+    return _TOKEN.findall(text.lower())
+
+
+class TextIndex:
+    """Inverted index of the objects of one class by the words of fields.
+
+    The text fields of an object form one document. Every word maps to the
+    objects whose document holds it along with its number of occurrences,
+    so queries only look at the objects holding their words, ranked with
+    BM25.
+
+    Attributes:
+        name (tuple): The names of the indexed text fields.
+        k1 (float): The BM25 term frequency saturation.
+        b (float): The BM25 document length normalization.
+        __postings (dict): The number of occurrences of each word in each
+            document, by word and key.
+        __lengths (dict): The number of words of each document, by key.
+        __values (dict): The indexed field values of each key.
+        __total (int): The number of words of all documents.
+    """
+
+    def __init__(self, name, k1=1.2, b=0.75):
+        """Initialize a TextIndex.
+
+        Args:
+            name (tuple): The names of the indexed text fields.
+            k1 (float): The BM25 term frequency saturation.
+            b (float): The BM25 document length normalization.
+        """
+        self.name = name
+        self.k1 = k1
+        self.b = b
+        self.__postings = {}
+        self.__lengths = {}
+        self.__values = {}
+        self.__total = 0
+
+    def add(self, key, value):
+        """Index the document of key, replacing its old content.
+
+        Args:
+            key (str): The "<class>.<id>" key of the object.
+            value (tuple): The values of the text fields of the object.
+                Values that are not strings are ignored.
+        """
+        if self.__values.get(key) == value:
+            return
+        self.remove(key)
+        words = []
+        for text in value:
+            if type(text) is str:
+                words.extend(tokenize(text))
+        counts = {}
+        for word in words:
+            counts[word] = counts.get(word, 0) + 1
+        for word, count in counts.items():
+            self.__postings.setdefault(word, {})[key] = count
+        self.__lengths[key] = len(words)
+        self.__values[key] = value
+        self.__total += len(words)
+
+    def remove(self, key):
+        """Remove the document of key from the index, if it is indexed."""
+        value = self.__values.pop(key, None)
+        if value is None:
+            return
+        for text in value:
+            if type(text) is not str:
+                continue
+            for word in set(tokenize(text)):
+                postings = self.__postings.get(word)
+                if postings is not None and postings.pop(key, None):
+                    if not postings:
+                        del self.__postings[word]
+        self.__total -= self.__lengths.pop(key)
+
+    def search(self, query):
+        """Return the documents matching a query, best match first.
+
+        A query is a list of words that all have to appear in a document.
+        Lists separated by OR are alternatives: "wifi pool OR beach"
+        matches documents holding wifi and pool, or beach. The AND keyword
+        is accepted between words and ignored.
+
+        Args:
+            query (str): The query.
+
+        Returns:
+            list: The (score, key) pairs of the matching documents.
+        """
+        groups = [[]]
+        for word in query.split():
+            if word == "OR":
+                groups.append([])
+            elif word != "AND":
+                groups[-1].extend(tokenize(word))
+        matches = set()
+        words = set()
+        for group in groups:
+            if not group:
+                continue
+            postings = sorted((self.__postings.get(word, {})
+                               for word in set(group)), key=len)
+            keys = set(postings[0])
+            for other in postings[1:]:
+                keys.intersection_update(other)
+            matches.update(keys)
+            words.update(group)
+        found = [(self.__score(key, words), key) for key in matches]
+        found.sort(key=lambda item: (-item[0], item[1]))
+        return found
+
+    def __len__(self):
+        """Return the number of indexed documents."""
+        return len(self.__values)
+
+    def __score(self, key, words):
+        """Return the BM25 score of the document of key for words."""
+        count = len(self.__lengths)
+        average = self.__total / count if count else 0
+        length = self.__lengths[key]
+        score = 0.0
+        for word in words:
+            postings = self.__postings.get(word, {})
+            frequency = postings.get(key)
+            if not frequency:
+                continue
+            idf = log(1 + (count - len(postings) + 0.5) /
+                      (len(postings) + 0.5))
+            norm = 1 - self.b + self.b * length / average if average else 1
+            score += idf * frequency * (self.k1 + 1) / (
+                frequency + self.k1 * norm)
+        return score
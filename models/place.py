@@ -1,6 +1,8 @@
 #!/usr/bin/python3
 """Defines the Place class."""
+import models
 from models.base_model import BaseModel
+from models.review import Review
 
 
 class Place(BaseModel):
@@ -18,8 +20,23 @@ class Place(BaseModel):
         latitude (float): The latitude coordinates.
         longitude (float): The longitude coordinates.
         amenity_ids (list): A list of Amenity ids.
+        __indexes__ (tuple): The attributes indexed by the storage.
+        __ranges__ (tuple): The numeric attributes indexed by the storage.
+        __sets__ (tuple): The list attributes indexed by the storage.
+        __geo__ (tuple): The coordinates indexed by the storage.
+        __text__ (tuple): The text attributes indexed by the storage.
+        __columns__ (tuple): The attributes kept in a columnar table by
+            the storage.
     """
 
+    __indexes__ = ("city_id", "user_id")
+    __ranges__ = ("number_rooms", "number_bathrooms", "max_guest",
+                  "price_by_night")
+    __sets__ = ("amenity_ids",)
+    __geo__ = ("latitude", "longitude")
+    __text__ = ("name", "description")
+    __columns__ = ("city_id", "user_id", "number_rooms", "number_bathrooms",
+                   "max_guest", "price_by_night", "latitude", "longitude")
     city_id = ""
     user_id = ""
     name = ""
@@ -31,3 +48,8 @@ class Place(BaseModel):
     latitude = 0.0
     longitude = 0.0
     amenity_ids = []
+
+    @property
+    def reviews(self):
+        """list: The reviews of the place."""
+        return models.storage.find(Review, place_id=self.id)
@@ -10,7 +10,11 @@ class Review(BaseModel):
         place_id (str): The Place id.
         user_id (str): The User id.
         text (str): The text of the review.
+        __indexes__ (tuple): The attributes indexed by the storage.
+        __text__ (tuple): The text attributes indexed by the storage.
     """
+    __indexes__ = ("place_id", "user_id")
+    __text__ = ("text",)
     place_id = ""
     user_id = ""
     text = ""
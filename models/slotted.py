@@ -0,0 +1,233 @@
+#!/usr/bin/python3
+"""Defines the slotted variants of the model classes.
+
+A slotted class derives from a model class and keeps the attributes the
+model declares, along with id, created_at and updated_at, in __slots__
+instead of in the __dict__ of each instance. Other attributes, such as
+those added by the console's update command, still go to __dict__, which
+is only allocated for the instances that hold one.
+
+Instances remember the order their attributes were set in, as a tuple
+shared by all the instances that set them in the same order, so that
+to_dict() and str() return what they return for the model class.
+"""
+from datetime import datetime
+from uuid import uuid4
+import models
+from models.base_model import TIME_FORMAT, classes, stored
+
+_MISSING = object()
+
+# The attribute orders of the instances, each kept once
+_orders = {}
+
+# The slotted variants of the model classes, by model class
+_variants = {}
+
+
+class _Slot:
+    """Slot of a slotted class, read as the default of the model class
+    when the instance has not set it.
+
+    Attributes:
+        __member (member_descriptor): The slot.
+        __default: The default of the model class, or _MISSING.
+    """
+
+    __slots__ = ("__member", "__default")
+
+    def __init__(self, member, default):
+        """Initialize a _Slot.
+
+        Args:
+            member (member_descriptor): The slot.
+            default: The default of the model class, or _MISSING.
+        """
+        self.__member = member
+        self.__default = default
+
+    def __get__(self, obj, cls=None):
+        """Return the value of the slot, or its default."""
+        if obj is not None:
+            try:
+                return self.__member.__get__(obj, cls)
+            except AttributeError:
+                if self.__default is _MISSING:
+                    raise
+        elif self.__default is _MISSING:
+            raise AttributeError("type object '{}' has no attribute '{}'"
+                                 .format(cls.__name__, self.__member.__name__))
+        return self.__default
+
+    def __set__(self, obj, value):
+        """Set the value of the slot."""
+        self.__member.__set__(obj, value)
+
+    def __delete__(self, obj):
+        """Unset the slot."""
+        self.__member.__delete__(obj)
+
+
+class SlottedModel:
+    """Mixin of the slotted model classes.
+
+    Attributes:
+        __order (tuple): The names of the attributes of the instance, in the
+            order they were set.
+    """
+
+    __slots__ = ("__order",)
+
+    def __init__(self, *args, **kwargs):
+        """Initialize an instance as BaseModel.__init__ does."""
+        object.__setattr__(self, "_SlottedModel__order", ())
+        if len(kwargs) == 0:
+            super().__init__()
+            return
+        self.__set("id", str(uuid4()))
+        self.__set("created_at", datetime.today())
+        self.__set("updated_at", datetime.today())
+        slots = type(self).__slots__
+        for k, v in kwargs.items():
+            if k == "created_at" or k == "updated_at":
+                v = datetime.strptime(v, TIME_FORMAT)
+            if k in slots:
+                self.__set(k, v)
+            else:
+                self.__set(k, v, overflow=True)
+
+    def __set(self, name, value, overflow=False):
+        """Set an attribute without marking the instance as modified.
+
+        Args:
+            name (str): The name of the attribute.
+            value: Its value.
+            overflow (bool): Whether to store the value in __dict__ even
+                where a descriptor of the class would handle it.
+        """
+        order = self.__order
+        if name not in order:
+            order = order + (name,)
+            object.__setattr__(self, "_SlottedModel__order",
+                               _orders.setdefault(order, order))
+        if overflow:
+            self.__dict__[name] = value
+        else:
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, name, value):
+        """Set an attribute and mark the instance as modified in storage,
+        moving a stored instance whose id changes to its new key."""
+        moved = name == "id" and stored(self)
+        if moved:
+            models.storage.delete(self)
+        self.__set(name, value)
+        if moved:
+            models.storage.new(self)
+        models.storage.touch(self)
+
+    def __delattr__(self, name):
+        """Delete an attribute."""
+        super().__delattr__(name)
+        order = tuple(n for n in self.__order if n != name)
+        object.__setattr__(self, "_SlottedModel__order",
+                           _orders.setdefault(order, order))
+
+    def __getstate__(self):
+        """Return the attributes of the instance, in the order they were
+        set."""
+        slots = type(self).__slots__
+        return {name: getattr(self, name) if name in slots
+                else self.__dict__[name]
+                for name in getattr(self, "_SlottedModel__order", ())}
+
+    def __setstate__(self, state):
+        """Replace the attributes of the instance with those of state,
+        without marking it as modified."""
+        slots = type(self).__slots__
+        for name in getattr(self, "_SlottedModel__order", ()):
+            if name in slots:
+                object.__delattr__(self, name)
+            else:
+                del self.__dict__[name]
+        object.__setattr__(self, "_SlottedModel__order", ())
+        for name, value in state.items():
+            self.__set(name, value, overflow=name not in slots)
+
+    def to_dict(self):
+        """Return the dictionary of the instance, as BaseModel.to_dict()
+        does."""
+        return_dict = self.__getstate__()
+        return_dict["created_at"] = self.created_at.isoformat()
+        return_dict["updated_at"] = self.updated_at.isoformat()
+        return_dict["__class__"] = self.__class__.__name__
+        return return_dict
+
+    def __str__(self):
+        """Return the str representation of the instance, as
+        BaseModel.__str__() does."""
+        class_name = self.__class__.__name__
+        return "[{}] ({}) {}".format(class_name, self.id,
+                                     self.__getstate__())
+
+
+def _schema(cls):
+    """Return the names of id, created_at, updated_at and the attributes a
+    model class declares a str, number or list default for."""
+    names = ["id", "created_at", "updated_at"]
+    for klass in reversed(cls.__mro__):
+        for name, value in vars(klass).items():
+            if (not name.startswith("_") and name not in names and
+                    isinstance(value, (str, int, float, list))):
+                names.append(name)
+    return names
+
+
+def slotted(cls):
+    """Return the slotted variant of a model class.
+
+    The variant is created on the first call and registered in
+    models.base_model.classes under the name of the model class on every
+    call, so that the storage and the console instantiate it in place of
+    the model class from then on. Instances of both can be stored side by side.
+
+    Args:
+        cls (type): A subclass of BaseModel, or BaseModel itself.
+    """
+    if issubclass(cls, SlottedModel):
+        return cls
+    if cls in _variants:
+        classes[cls.__name__] = _variants[cls]
+        return _variants[cls]
+    names = _schema(cls)
+    variant = type(cls.__name__, (SlottedModel, cls),
+                   {"__slots__": tuple(names), "__module__": cls.__module__,
+                    "__qualname__": cls.__qualname__, "__doc__": cls.__doc__})
+    for name in names:
+        setattr(variant, name,
+                _Slot(vars(variant)[name], getattr(cls, name, _MISSING)))
+    _variants[cls] = variant
+    return variant
+
+
+def attributes(obj):
+    """Return the attributes of a model instance, in the order they were
+    set."""
+    if isinstance(obj, SlottedModel):
+        return obj.__getstate__()
+    return obj.__dict__.copy()
+
+
+def assign(obj, attributes):
+    """Replace the attributes of a model instance, without marking it as
+    modified.
+
+    Args:
+        obj (BaseModel): The instance.
+        attributes (dict): Its new attributes.
+    """
+    if isinstance(obj, SlottedModel):
+        obj.__setstate__(attributes)
+    else:
+        obj.__dict__.clear()
+        obj.__dict__.update(attributes)
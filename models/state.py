@@ -1,6 +1,8 @@
 #!/usr/bin/python3
 """Defines the State class."""
+import models
 from models.base_model import BaseModel
+from models.city import City
 
 
 class State(BaseModel):
@@ -11,3 +13,8 @@ class State(BaseModel):
     """
 
     name = ""
+
+    @property
+    def cities(self):
+        """list: The cities of the state."""
+        return models.storage.find(City, state_id=self.id)
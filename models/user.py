@@ -1,6 +1,9 @@
 #!/usr/bin/python3
 """Defines the User class."""
+import models
 from models.base_model import BaseModel
+from models.place import Place
+from models.review import Review
 
 
 class User(BaseModel):
@@ -17,3 +20,13 @@ class User(BaseModel):
     password = ""
     first_name = ""
     last_name = ""
+
+    @property
+    def places(self):
+        """list: The places of the user."""
+        return models.storage.find(Place, user_id=self.id)
+
+    @property
+    def reviews(self):
+        """list: The reviews written by the user."""
+        return models.storage.find(Review, user_id=self.id)
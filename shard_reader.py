@@ -0,0 +1,20 @@
+#!/usr/bin/python3
+"""Defines the function the process pool of FileStorage reads shards with.
+
+The function lives outside the models package so that sending it to a
+worker does not import models: the storage reads its shards while the
+models package is still being imported, and pickling a function of one
+of its modules would wait for that import to finish. Workers import the
+storage modules when they first read a shard, without loading the
+storage, which is left to the process that started them.
+"""
+
+
+def read_shard(path):
+    """Return the (key, dictionary) pairs stored in a shard file.
+
+    Args:
+        path (str): The path of the shard file.
+    """
+    from models.engine.file_storage import _read_shard
+    return _read_shard(path)
@@ -13,6 +13,8 @@ Unittest classes:
     - TestHBNBCommandAll: Tests for console all command.
     - TestHBNBCommandDestroy: Tests for console destroy command.
     - TestHBNBCommandUpdate: Tests for console update command.
+    - TestHBNBCommandGeo: Tests for console geo command.
+    - TestHBNBCommandSearch: Tests for console search command.
     - TestHBNBCommandHelp: Tests for console help command.
 """
 import os
@@ -509,6 +511,174 @@ class TestHBNBCommandUpdate(HBNBCommandTestCase):
             self.assertEqual("** no instance found **",
                              output.getvalue().strip())
 
+    def test_update_dictionary(self):
+        with patch("sys.stdout", new=StringIO()) as output:
+            HBNBCommand().onecmd("create Place")
+        pl = storage.get("Place", output.getvalue().strip())
+        HBNBCommand().onecmd('Place.update({}, {{"max_guest": "4", '
+                             '"name": "Loft"}})'.format(pl.id))
+        self.assertEqual((4, "Loft"), (pl.max_guest, pl.name))
+        HBNBCommand().onecmd("Place.update({}, {{'latitude': 1.5, "
+                             "'amenity_ids': ['a']}})".format(pl.id))
+        self.assertEqual((1.5, ["a"]), (pl.latitude, pl.amenity_ids))
+
+    def test_update_reserved(self):
+        with patch("sys.stdout", new=StringIO()) as output:
+            HBNBCommand().onecmd("create Place")
+        pl = storage.get("Place", output.getvalue().strip())
+        id, created_at = pl.id, pl.created_at
+        for name in ("__class__", "id", "created_at", "updated_at"):
+            with patch("sys.stdout", new=StringIO()) as output:
+                self.assertFalse(HBNBCommand().onecmd(
+                    "update Place {} {} User".format(pl.id, name)))
+                self.assertEqual("** attribute can't be updated **",
+                                 output.getvalue().strip())
+        HBNBCommand().onecmd('Place.update({}, {{"__class__": "User", '
+                             '"id": "1", "created_at": "x", '
+                             '"name": "Loft"}})'.format(pl.id))
+        self.assertEqual("Place", type(pl).__name__)
+        self.assertEqual((id, created_at, "Loft"),
+                         (pl.id, pl.created_at, pl.name))
+        self.assertIs(pl, storage.get("Place", id))
+
+    def test_update_read_only(self):
+        with patch("sys.stdout", new=StringIO()) as output:
+            HBNBCommand().onecmd("create Place")
+        pl = storage.get("Place", output.getvalue().strip())
+        with patch("sys.stdout", new=StringIO()) as output:
+            HBNBCommand().onecmd("create State")
+        st = storage.get("State", output.getvalue().strip())
+        for command in ("update Place {} reviews x".format(pl.id),
+                        'Place.update("{}", {{"reviews": 1, '
+                        '"name": "Loft"}})'.format(pl.id),
+                        "update State {} cities x".format(st.id)):
+            with patch("sys.stdout", new=StringIO()) as output:
+                self.assertFalse(HBNBCommand().onecmd(command))
+                self.assertEqual("** attribute can't be updated **",
+                                 output.getvalue().strip())
+        self.assertEqual("", pl.name)
+        self.assertEqual([], pl.reviews)
+        self.assertEqual([], st.cities)
+
+    def test_update_not_a_literal(self):
+        with patch("sys.stdout", new=StringIO()) as output:
+            HBNBCommand().onecmd("create Place")
+        pl = storage.get("Place", output.getvalue().strip())
+        for value in ("name", "__import__('os')", "{'a': x}"):
+            with patch("sys.stdout", new=StringIO()) as output:
+                self.assertFalse(HBNBCommand().onecmd(
+                    "update Place {} {}".format(pl.id, value)))
+                self.assertEqual("** value missing **",
+                                 output.getvalue().strip())
+
+
+class TestHBNBCommandGeo(HBNBCommandTestCase):
+    """Unittests for the geo command."""
+
+    def setUp(self):
+        super().setUp()
+        self.places = []
+        for latitude, longitude in ((37.77, -122.42), (37.80, -122.27),
+                                    (40.71, -74.01)):
+            with patch("sys.stdout", new=StringIO()) as output:
+                HBNBCommand().onecmd("create Place")
+            place = storage.get("Place", output.getvalue().strip())
+            place.latitude = latitude
+            place.longitude = longitude
+            self.places.append(place)
+        self.addCleanup(self.destroy)
+
+    def destroy(self):
+        for place in self.places:
+            storage.delete(place)
+        storage.save()
+
+    def geo(self, command):
+        with patch("sys.stdout", new=StringIO()) as output:
+            self.assertFalse(HBNBCommand().onecmd(command))
+        return output.getvalue().strip()
+
+    def test_radius(self):
+        output = self.geo("geo Place radius 37.77 -122.42 20")
+        self.assertIn(self.places[0].id, output)
+        self.assertIn(self.places[1].id, output)
+        self.assertNotIn(self.places[2].id, output)
+        self.assertLess(output.index(self.places[0].id),
+                        output.index(self.places[1].id))
+
+    def test_bbox(self):
+        output = self.geo("geo Place bbox 40 -75 41 -74")
+        self.assertIn(self.places[2].id, output)
+        self.assertNotIn(self.places[0].id, output)
+
+    def test_nearest(self):
+        output = self.geo("geo Place nearest 40 -75 1")
+        self.assertIn(self.places[2].id, output)
+        self.assertNotIn(self.places[0].id, output)
+
+    def test_errors(self):
+        self.assertEqual("** class name missing **", self.geo("geo"))
+        self.assertEqual("** class doesn't exist **", self.geo("geo MyModel"))
+        self.assertEqual("** query missing **", self.geo("geo Place"))
+        self.assertEqual("** query missing **", self.geo("geo Place near"))
+        self.assertEqual("** coordinates missing **",
+                         self.geo("geo Place radius 1 2"))
+        self.assertEqual("** invalid coordinates **",
+                         self.geo("geo Place radius a b c"))
+        for command in ("geo Place nearest 0 0 nan",
+                        "geo Place nearest 0 0 inf",
+                        "geo Place radius 10 20 nan",
+                        "geo Place bbox nan 0 10 10",
+                        "geo Place bbox 0 -inf 10 10"):
+            self.assertEqual("** invalid coordinates **", self.geo(command))
+
+
+class TestHBNBCommandSearch(HBNBCommandTestCase):
+    """Unittests for the search command."""
+
+    def setUp(self):
+        super().setUp()
+        self.reviews = []
+        for text in ("Great wifi and a quiet pool",
+                     "The wifi was slow, the wifi router was old",
+                     "Lovely beach"):
+            with patch("sys.stdout", new=StringIO()) as output:
+                HBNBCommand().onecmd("create Review")
+            review = storage.get("Review", output.getvalue().strip())
+            review.text = text
+            self.reviews.append(review)
+        self.addCleanup(self.destroy)
+
+    def destroy(self):
+        for review in self.reviews:
+            storage.delete(review)
+        storage.save()
+
+    def search(self, command):
+        with patch("sys.stdout", new=StringIO()) as output:
+            self.assertFalse(HBNBCommand().onecmd(command))
+        return output.getvalue().strip()
+
+    def test_search(self):
+        output = self.search("search Review wifi")
+        self.assertIn(self.reviews[0].id, output)
+        self.assertIn(self.reviews[1].id, output)
+        self.assertNotIn(self.reviews[2].id, output)
+        self.assertLess(output.index(self.reviews[1].id),
+                        output.index(self.reviews[0].id))
+
+    def test_search_and_or(self):
+        output = self.search("search Review wifi AND pool OR beach")
+        self.assertIn(self.reviews[0].id, output)
+        self.assertNotIn(self.reviews[1].id, output)
+        self.assertIn(self.reviews[2].id, output)
+
+    def test_errors(self):
+        self.assertEqual("** class name missing **", self.search("search"))
+        self.assertEqual("** class doesn't exist **",
+                         self.search("search MyModel wifi"))
+        self.assertEqual("** query missing **", self.search("search Review"))
+
 
 class TestHBNBCommandHelp(HBNBCommandTestCase):
     """Unittests for the help command."""
@@ -516,12 +686,22 @@ class TestHBNBCommandHelp(HBNBCommandTestCase):
         help_msg = (
             "Documented commands (type help <topic>):\n"
             "========================================\n"
-            "EOF  all  count  create  destroy  help  quit  show  update"
+            "EOF  compact  create   geo   quit    show  \n"
+            "all  count    destroy  help  search  update"
         )
         with patch("sys.stdout", new=StringIO()) as output:
             self.assertFalse(HBNBCommand().onecmd("help"))
             self.assertEqual(help_msg, output.getvalue().strip())
 
+    def test_help_compact(self):
+        help_msg = (
+            "Usage: compact\n        "
+            "Fold the storage journal into a fresh snapshot of the JSON file."
+        )
+        with patch("sys.stdout", new=StringIO()) as output:
+            self.assertFalse(HBNBCommand().onecmd("help compact"))
+            self.assertEqual(help_msg, output.getvalue().strip())
+
     def test_help_count(self):
         help_msg = (
             "Usage: count <class> or <class>.count()\n"
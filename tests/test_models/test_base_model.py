@@ -9,13 +9,16 @@ Unittest classes:
     TestBaseModelInstantiation
     TestBaseModelSave
     TestBaseModelDict
+    TestBaseModelRegistry
 """
 from datetime import datetime
 import unittest
 import models
 import os
 from time import sleep
-from models.base_model import BaseModel
+from models.base_model import BaseModel, classes
+from models.engine.file_storage import FileStorage
+from models.user import User
 from console import HBNBCommand
 
 
@@ -195,5 +198,35 @@ class TestBaseModelDict(HBNBCommandTestCase):
             baseModel.to_dict(None)
 
 
+class TestBaseModelRegistry(unittest.TestCase):
+    """Unittests for testing the registry of the model classes."""
+
+    def test_models_registered(self):
+        self.assertIs(BaseModel, classes["BaseModel"])
+        self.assertIs(User, classes["User"])
+        self.assertLessEqual({"BaseModel", "Amenity", "City", "Place",
+                              "Review", "State", "User"}, set(classes))
+
+    def test_subclass_registered(self):
+        class Boat(BaseModel):
+            pass
+        self.addCleanup(classes.pop, "Boat")
+        self.assertIs(Boat, classes["Boat"])
+
+    def test_subclass_reloaded(self):
+        class Boat(BaseModel):
+            pass
+        self.addCleanup(classes.pop, "Boat")
+        bt = Boat()
+        models.storage.save()
+        FileStorage._FileStorage__objects = {}
+        models.storage.reload()
+        boat = models.storage.get("Boat", bt.id)
+        self.assertIs(Boat, type(boat))
+        self.assertEqual(bt.to_dict(), boat.to_dict())
+        models.storage.delete(boat)
+        models.storage.save()
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -9,11 +9,13 @@ Unittest classes:
     TestCityInstantiation
     TestCitySave
     TestCityDict
+    TestCityRelationships
 """
 from console import HBNBCommand
 import os
 import models
 import unittest
+from models.place import Place
 from datetime import datetime
 from time import sleep
 from models.city import City
@@ -204,5 +206,26 @@ class TestCityDict(HBNBCommandTestCase):
             cy.to_dict(None)
 
 
+class TestCity_relationships(unittest.TestCase):
+    """Unittests for testing the relationships of the City class."""
+
+    def test_places(self):
+        cy = City()
+        pl1 = Place()
+        pl1.city_id = cy.id
+        pl2 = Place()
+        pl2.city_id = cy.id
+        Place().city_id = City().id
+        self.assertEqual([pl1, pl2], cy.places)
+
+    def test_places_follow_changes(self):
+        cy = City()
+        pl = Place()
+        pl.city_id = cy.id
+        self.assertEqual([pl], cy.places)
+        pl.city_id = City().id
+        self.assertEqual([], cy.places)
+
+
 if __name__ == "__main__":
     unittest.main()
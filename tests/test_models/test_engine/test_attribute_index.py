@@ -0,0 +1,53 @@
+#!/usr/bin/python3
+"""Defines unittests for models/engine/attribute_index.py.
+
+Unittest classes:
+    TestAttributeIndex
+"""
+import unittest
+from models.engine.attribute_index import AttributeIndex
+
+
+class TestAttributeIndex(unittest.TestCase):
+    """Unittests for testing the AttributeIndex class."""
+
+    def setUp(self):
+        self.index = AttributeIndex("city_id")
+
+    def test_name(self):
+        self.assertEqual("city_id", self.index.name)
+
+    def test_lookup(self):
+        self.index.add("Place.1", "a")
+        self.index.add("Place.2", "b")
+        self.index.add("Place.3", "a")
+        self.assertEqual(["Place.1", "Place.3"], self.index.lookup("a"))
+        self.assertEqual(["Place.2"], self.index.lookup("b"))
+        self.assertEqual([], self.index.lookup("c"))
+        self.assertEqual(3, len(self.index))
+
+    def test_add_replaces_value(self):
+        self.index.add("Place.1", "a")
+        self.index.add("Place.1", "b")
+        self.assertEqual([], self.index.lookup("a"))
+        self.assertEqual(["Place.1"], self.index.lookup("b"))
+        self.assertEqual(1, len(self.index))
+
+    def test_remove(self):
+        self.index.add("Place.1", "a")
+        self.index.remove("Place.1")
+        self.index.remove("Place.2")
+        self.assertEqual([], self.index.lookup("a"))
+        self.assertEqual(0, len(self.index))
+
+    def test_unhashable_value(self):
+        self.index.add("Place.1", "a")
+        self.index.add("Place.1", ["a"])
+        self.assertEqual([], self.index.lookup("a"))
+        self.assertEqual(0, len(self.index))
+        with self.assertRaises(TypeError):
+            self.index.lookup(["a"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,145 @@
+#!/usr/bin/python3
+"""Defines unittests for models/engine/binary_snapshot.py.
+
+Unittest classes:
+    TestBinarySnapshot_encode
+    TestBinarySnapshot_files
+"""
+import json
+import os
+import struct
+import tempfile
+import unittest
+from io import BytesIO
+from models.engine import binary_snapshot
+from models.user import User
+
+
+def round_trip(entries):
+    """Write entries to a snapshot and read them back."""
+    f = BytesIO()
+    binary_snapshot.write_entries(
+        f, ((key, binary_snapshot.encode(key, record))
+            for key, record in entries))
+    f.seek(0)
+    return list(binary_snapshot.iter_entries(f))
+
+
+class TestBinarySnapshot_encode(unittest.TestCase):
+    """Unittests for testing the encoding of records."""
+
+    def test_model_record(self):
+        us = User()
+        us.first_name = "Betty"
+        us.city_id = "c3c4c1a9-54e2-4b9b-9f24-1b8e0ac4b8c1"
+        key = "User." + us.id
+        self.assertEqual([(key, us.to_dict())],
+                         round_trip([(key, us.to_dict())]))
+
+    def test_model_record_is_compact(self):
+        us = User()
+        record = us.to_dict()
+        encoded = binary_snapshot.encode("User." + us.id, record)
+        self.assertLess(len(encoded), len(json.dumps(record)) / 3)
+
+    def test_names(self):
+        self.assertIn("first_name", binary_snapshot.NAMES)
+        self.assertIn("Place", binary_snapshot.NAMES)
+        for name in ("cities", "places", "reviews", "amenities", "save"):
+            self.assertNotIn(name, binary_snapshot.NAMES)
+
+    def test_generic_record(self):
+        record = {
+            "id": "not-a-uuid",
+            "created_at": "2020-01-01T00:00:00+00:00",
+            "updated_at": 5,
+            "big": 2 ** 70,
+            "values": [1, None, True, False, 1.5, {"a": [], "é": "ü"}],
+            "__class__": "Unknown"
+        }
+        self.assertEqual([("Other.key", record)],
+                         round_trip([("Other.key", record)]))
+
+    def test_timestamp_without_microseconds(self):
+        record = {"id": "1", "created_at": "2020-01-01T00:00:00",
+                  "updated_at": "2020-01-01T00:00:00.000001",
+                  "__class__": "User"}
+        self.assertEqual([("User.1", record)],
+                         round_trip([("User.1", record)]))
+
+    def test_unsupported_value(self):
+        with self.assertRaises(TypeError):
+            binary_snapshot.encode("User.1", {"id": "1", "x": object(),
+                                              "__class__": "User"})
+
+
+class TestBinarySnapshot_files(unittest.TestCase):
+    """Unittests for testing snapshot files and conversions."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def path(self, name):
+        return os.path.join(self.tmpdir.name, name)
+
+    def test_empty_snapshot(self):
+        self.assertEqual([], round_trip([]))
+
+    def test_not_a_snapshot(self):
+        with self.assertRaises(ValueError):
+            list(binary_snapshot.iter_entries(BytesIO(b"{}")))
+
+    def test_truncated_snapshot(self):
+        f = BytesIO()
+        binary_snapshot.write_entries(
+            f, [("User.1", binary_snapshot.encode(
+                "User.1", {"id": "1", "__class__": "User"}))])
+        with self.assertRaises(ValueError):
+            list(binary_snapshot.iter_entries(BytesIO(f.getvalue()[:-6])))
+
+    def test_fragments(self):
+        users = [User() for _ in range(3)]
+        entries = [("User." + us.id, binary_snapshot.encode(
+            "User." + us.id, us.to_dict())) for us in users]
+        f = BytesIO()
+        binary_snapshot.write_entries(f, entries)
+        f.seek(0)
+        self.assertEqual(entries, list(binary_snapshot.iter_fragments(f)))
+        self.assertEqual(users[0].to_dict(),
+                         binary_snapshot.decode(entries[0][1]))
+
+    def test_fragments_of_another_name_table(self):
+        us = User()
+        entries = [("User." + us.id, binary_snapshot.encode(
+            "User." + us.id, us.to_dict()))]
+        f = BytesIO()
+        binary_snapshot.write_entries(f, entries)
+        names, pos = binary_snapshot.read_header(f.getvalue())
+        names = names + ["extra"]
+        header = binary_snapshot.MAGIC + struct.pack("<I", len(names))
+        for name in names:
+            header += struct.pack("<I", len(name)) + name.encode()
+        data = BytesIO(header + f.getvalue()[pos:])
+        self.assertEqual(entries, list(binary_snapshot.iter_fragments(data)))
+
+    def test_json_conversions(self):
+        users = [User() for _ in range(3)]
+        document = {"User." + us.id: us.to_dict() for us in users}
+        with open(self.path("file.json"), "w") as f:
+            json.dump(document, f)
+        binary_snapshot.json_to_binary(self.path("file.json"),
+                                       self.path("file.bin"))
+        binary_snapshot.binary_to_json(self.path("file.bin"),
+                                       self.path("copy.json"))
+        with open(self.path("file.json")) as f, \
+                open(self.path("copy.json")) as copy:
+            self.assertEqual(f.read(), copy.read())
+        self.assertLess(os.path.getsize(self.path("file.bin")),
+                        os.path.getsize(self.path("file.json")))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,62 @@
+#!/usr/bin/python3
+"""Defines unittests for models/engine/bitmap_index.py.
+
+Unittest classes:
+    TestBitmapIndex
+"""
+import unittest
+from models.engine.bitmap_index import BitmapIndex
+
+
+class TestBitmapIndex(unittest.TestCase):
+    """Unittests for testing the BitmapIndex class."""
+
+    def setUp(self):
+        self.index = BitmapIndex("amenity_ids")
+        self.index.add("Place.1", ["wifi", "pool"])
+        self.index.add("Place.2", ["wifi", "parking"])
+        self.index.add("Place.3", ["wifi", "pool", "parking"])
+        self.index.add("Place.4", [])
+
+    def test_name(self):
+        self.assertEqual("amenity_ids", self.index.name)
+
+    def test_having_all(self):
+        self.assertEqual(["Place.1", "Place.3"],
+                         self.index.having_all(["wifi", "pool"]))
+        self.assertEqual(["Place.3"],
+                         self.index.having_all(["pool", "parking", "wifi"]))
+        self.assertEqual([], self.index.having_all(["wifi", "sauna"]))
+        self.assertEqual(4, len(self.index.having_all([])))
+
+    def test_having_any(self):
+        self.assertEqual(["Place.1", "Place.2", "Place.3"],
+                         self.index.having_any(["pool", "parking"]))
+        self.assertEqual([], self.index.having_any(["sauna"]))
+        self.assertEqual([], self.index.having_any([]))
+
+    def test_add_replaces_items(self):
+        self.index.add("Place.1", ["sauna"])
+        self.assertEqual(["Place.3"], self.index.having_all(["pool"]))
+        self.assertEqual(["Place.1"], self.index.having_all(["sauna"]))
+        self.assertEqual(4, len(self.index))
+
+    def test_remove_reuses_bits(self):
+        self.index.remove("Place.2")
+        self.index.remove("Place.9")
+        self.assertEqual(["Place.3"], self.index.having_all(["parking"]))
+        self.index.add("Place.5", ["parking"])
+        self.assertEqual(["Place.5", "Place.3"],
+                         self.index.having_all(["parking"]))
+        self.assertEqual(4, len(self.index))
+
+    def test_invalid_values(self):
+        self.index.add("Place.5", "wifi")
+        self.index.add("Place.6", [["wifi"], "pool"])
+        self.assertEqual(["Place.1", "Place.3", "Place.6"],
+                         self.index.having_all(["pool"]))
+        self.assertEqual(6, len(self.index))
+
+
+if __name__ == "__main__":
+    unittest.main()
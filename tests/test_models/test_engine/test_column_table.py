@@ -0,0 +1,116 @@
+#!/usr/bin/python3
+"""Defines unittests for models/engine/column_table.py.
+
+Unittest classes:
+    TestColumnTable
+"""
+import unittest
+from array import array
+from models.engine.column_table import ColumnTable, kinds
+from models.place import Place
+
+
+class TestColumnTable(unittest.TestCase):
+    """Unittests for testing the ColumnTable class."""
+
+    def setUp(self):
+        self.table = ColumnTable(("city_id", "price_by_night", "latitude"),
+                                 (str, int, float))
+        rows = (("c1", 100, 37.7), ("c2", 50, 37.8), ("c1", 80, None),
+                ("c1", "free", 37.9), (None, 20, 38.0))
+        for i, value in enumerate(rows):
+            self.table.add("Place.{}".format(i), value)
+
+    def test_name(self):
+        self.assertEqual(("city_id", "price_by_night", "latitude"),
+                         self.table.name)
+        self.assertEqual(5, len(self.table))
+
+    def test_columns(self):
+        prices = self.table.column("price_by_night")
+        self.assertIsInstance(prices, array)
+        self.assertEqual([100, 50, 80], list(prices)[:3])
+        self.assertNotEqual(prices[3], prices[3])
+        codes = self.table.column("city_id")
+        self.assertEqual(["c1", "c2", "c1", "c1", None],
+                         [self.table.string(code) for code in codes])
+        self.assertEqual(codes[0], codes[2])
+        with self.assertRaises(KeyError):
+            self.table.column("name")
+
+    def test_keys(self):
+        self.assertEqual(["Place.0", "Place.2", "Place.3"],
+                         self.table.keys(city_id="c1"))
+        self.assertEqual(["Place.0", "Place.2"],
+                         self.table.keys(city_id="c1",
+                                         price_by_night__gte=80))
+        self.assertEqual(["Place.1", "Place.4"],
+                         self.table.keys(price_by_night__lt=80))
+        self.assertEqual(["Place.1"], self.table.keys(price_by_night=50))
+        self.assertEqual([], self.table.keys(city_id="c3"))
+        self.assertEqual([], self.table.keys(price_by_night__lt="x"))
+        self.assertEqual(5, len(self.table.keys()))
+
+    def test_invalid_criteria(self):
+        for criteria in ({"name": "Loft"}, {"city_id__lt": "c2"},
+                         {"price_by_night__any": [1]}):
+            with self.assertRaises(ValueError):
+                self.table.keys(**criteria)
+
+    def test_count(self):
+        self.assertEqual(5, self.table.count())
+        self.assertEqual(3, self.table.count(city_id="c1"))
+        self.assertEqual(1, self.table.count(latitude__gt=37.85,
+                                             city_id="c1"))
+
+    def test_aggregates(self):
+        self.assertEqual(250, self.table.sum("price_by_night"))
+        self.assertEqual(62.5, self.table.mean("price_by_night"))
+        self.assertEqual(90, self.table.mean("price_by_night",
+                                             city_id="c1"))
+        self.assertEqual(20, self.table.min("price_by_night"))
+        self.assertEqual(100, self.table.max("price_by_night",
+                                             latitude__lte=37.8))
+        self.assertIsNone(self.table.mean("price_by_night", city_id="c3"))
+        self.assertEqual(0, self.table.sum("price_by_night",
+                                           city_id="c3"))
+
+    def test_aggregates_by(self):
+        self.assertEqual({"c1": 90, "c2": 50, None: 20},
+                         self.table.mean("price_by_night", by="city_id"))
+        self.assertEqual({"c1": 180},
+                         self.table.sum("price_by_night", by="city_id",
+                                        price_by_night__gte=80))
+        with self.assertRaises(ValueError):
+            self.table.sum("city_id")
+        with self.assertRaises(ValueError):
+            self.table.sum("price_by_night", by="latitude")
+
+    def test_add_replaces_values(self):
+        self.table.add("Place.3", ("c2", 70, 37.9))
+        self.assertEqual(5, len(self.table))
+        self.assertEqual({"c1": 90, "c2": 60, None: 20},
+                         self.table.mean("price_by_night", by="city_id"))
+
+    def test_remove(self):
+        self.table.remove("Place.1")
+        self.table.remove("Place.9")
+        self.assertEqual(4, len(self.table))
+        self.assertEqual(["Place.0", "Place.4", "Place.2", "Place.3"],
+                         self.table.keys())
+        self.assertEqual(200, self.table.sum("price_by_night"))
+        self.table.remove("Place.3")
+        self.assertEqual(["Place.0", "Place.4", "Place.2"],
+                         self.table.keys(price_by_night__gte=0))
+        self.assertEqual([100, 20, 80],
+                         list(self.table.column("price_by_night")))
+        self.table.remove("Place.2")
+        self.assertEqual(37.7, self.table.min("latitude"))
+
+    def test_kinds(self):
+        self.assertEqual((str, str, int, int, int, int, float, float),
+                         kinds(Place))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,71 @@
+#!/usr/bin/python3
+"""Defines unittests for models/engine/compression.py.
+
+Unittest classes:
+    TestCompression
+"""
+import gzip
+import lzma
+import os
+import tempfile
+import unittest
+from models.engine import compression
+
+
+class TestCompression(unittest.TestCase):
+    """Unittests for testing the compression of storage files."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_split(self):
+        self.assertEqual(("file.json", ".gz"),
+                         compression.split("file.json.gz"))
+        self.assertEqual(("file.bin", ".xz"), compression.split("file.bin.xz"))
+        self.assertEqual(("file.json", ""), compression.split("file.json"))
+
+    def test_open_by_suffix(self):
+        for suffix, module in ((".gz", gzip), (".xz", lzma)):
+            path = os.path.join(self.tmpdir.name, "file.json" + suffix)
+            with compression.open(path, "w") as f:
+                f.write("{}")
+            with module.open(path, "rt") as f:
+                self.assertEqual("{}", f.read())
+            with compression.open(path, "r") as f:
+                self.assertEqual("{}", f.read())
+
+    def test_open_binary(self):
+        path = os.path.join(self.tmpdir.name, "file.bin.gz")
+        with compression.open(path, "wb") as f:
+            f.write(b"HBNB")
+        with gzip.open(path) as f:
+            self.assertEqual(b"HBNB", f.read())
+
+    def test_open_uncompressed(self):
+        path = os.path.join(self.tmpdir.name, "file.json")
+        with compression.open(path, "w") as f:
+            f.write("{}")
+        with open(path) as f:
+            self.assertEqual("{}", f.read())
+
+    def test_open_other_name(self):
+        path = os.path.join(self.tmpdir.name, "file.json.gz")
+        with compression.open(path, "w", path + ".tmp") as f:
+            f.write("{}")
+        with gzip.open(path + ".tmp", "rt") as f:
+            self.assertEqual("{}", f.read())
+
+    def test_append_streams(self):
+        path = os.path.join(self.tmpdir.name, "file.json.log.xz")
+        for line in ("a\n", "b\n"):
+            with compression.open(path, "a") as f:
+                f.write(line)
+        with compression.open(path, "r") as f:
+            self.assertEqual(["a\n", "b\n"], list(f))
+
+
+if __name__ == "__main__":
+    unittest.main()
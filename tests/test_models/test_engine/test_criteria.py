@@ -0,0 +1,71 @@
+#!/usr/bin/python3
+"""Defines unittests for models/engine/criteria.py.
+
+Unittest classes:
+    TestCriteria
+"""
+import unittest
+from unittest.mock import patch
+import models
+from models.engine import criteria
+from models.engine.file_storage import FileStorage
+from models.place import Place
+
+
+class TestCriteria(unittest.TestCase):
+    """Unittests for testing the matching of criteria."""
+
+    def setUp(self):
+        patcher = patch.object(models, "storage", FileStorage(path="unused"))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.place = Place()
+        self.place.city_id = "c1"
+        self.place.amenity_ids = ["wifi", "pool"]
+
+    def tearDown(self):
+        FileStorage._FileStorage__objects = {}
+
+    def test_parse(self):
+        self.assertEqual(("city_id", None), criteria.parse("city_id"))
+        self.assertEqual(("amenity_ids", "all"),
+                         criteria.parse("amenity_ids__all"))
+        self.assertEqual(("amenity_ids", "any"),
+                         criteria.parse("amenity_ids__any"))
+        self.assertEqual(("a__b", None), criteria.parse("a__b"))
+        self.assertEqual(("__all", None), criteria.parse("__all"))
+
+    def test_equality(self):
+        self.assertTrue(criteria.matches(self.place, {"city_id": "c1"}))
+        self.assertFalse(criteria.matches(self.place, {"city_id": "c2"}))
+        self.assertFalse(criteria.matches(self.place, {"missing": None}))
+        self.assertTrue(criteria.matches(self.place, {}))
+
+    def test_items(self):
+        self.assertTrue(criteria.matches(
+            self.place, {"amenity_ids__all": ["wifi", "pool"]}))
+        self.assertFalse(criteria.matches(
+            self.place, {"amenity_ids__all": ["wifi", "sauna"]}))
+        self.assertTrue(criteria.matches(
+            self.place, {"amenity_ids__any": ["wifi", "sauna"]}))
+        self.assertFalse(criteria.matches(
+            self.place, {"amenity_ids__any": ["sauna"]}))
+        self.assertFalse(criteria.matches(
+            self.place, {"number_rooms__any": [0]}))
+
+    def test_bounds(self):
+        self.place.price_by_night = 80
+        self.assertEqual(("price_by_night", "lte"),
+                         criteria.parse("price_by_night__lte"))
+        self.assertTrue(criteria.matches(
+            self.place, {"price_by_night__gt": 50,
+                         "price_by_night__lte": 80}))
+        self.assertFalse(criteria.matches(
+            self.place, {"price_by_night__lt": 80}))
+        self.assertFalse(criteria.matches(
+            self.place, {"price_by_night__gte": "x"}))
+        self.assertTrue(criteria.compare("b", "gt", "a"))
+
+
+if __name__ == "__main__":
+    unittest.main()
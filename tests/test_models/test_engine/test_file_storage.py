@@ -4,13 +4,41 @@
 Unittest classes:
     TestFileStorage_instantiation
     TestFileStorage_methods
+    TestFileStorage_journal
+    TestFileStorage_compact
+    TestFileStorage_dirty_tracking
+    TestFileStorage_atomic_write
+    TestFileStorage_coalescing
+    TestFileStorage_lazy
+    TestFileStorage_shard
+    TestFileStorage_binary
+    TestFileStorage_mmap
+    TestFileStorage_cache
+    TestFileStorage_identity
+    TestFileStorage_compression
+    TestFileStorage_class_index
+    TestFileStorage_find
+    TestFileStorage_find_range
+    TestFileStorage_query
+    TestFileStorage_geo
+    TestFileStorage_search
+    TestFileStorage_columns
 """
 import os
+import gzip
 import json
+import lzma
 import models
+import subprocess
+import sys
+import tempfile
+import threading
 import unittest
+from unittest.mock import patch
 from datetime import datetime
+from time import sleep
 from models.base_model import BaseModel
+from console import HBNBCommand
 from models.engine.file_storage import FileStorage
 from models.user import User
 from models.state import State
@@ -66,8 +94,11 @@ class TestFileStorage_methods(unittest.TestCase):
         self.assertEqual(dict, type(models.storage.all()))
 
     def test_all_with_arg(self):
+        self.assertIs(models.storage.all(), models.storage.all(None))
+
+    def test_all_with_two_args(self):
         with self.assertRaises(TypeError):
-            models.storage.all(None)
+            models.storage.all(None, None)
 
     def test_new(self):
         bm = BaseModel()
@@ -165,5 +196,1386 @@ class TestFileStorage_methods(unittest.TestCase):
             models.storage.reload(None)
 
 
+class FileStorageTestCase(unittest.TestCase):
+    """Base class for the unittests of a FileStorage writing to a
+    temporary directory.
+
+    Each test starts and ends with no stored objects.
+    """
+
+    def setUp(self):
+        FileStorage._FileStorage__objects = {}
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "file.json")
+
+    def tearDown(self):
+        FileStorage._FileStorage__objects = {}
+        self.tmpdir.cleanup()
+
+    def use(self, storage):
+        """Make storage models.storage for the rest of the test."""
+        patcher = patch.object(models, "storage", storage)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        return storage
+
+
+class TestFileStorage_journal(FileStorageTestCase):
+    """Unittests for testing the journal mode of the FileStorage class."""
+
+    def setUp(self):
+        super().setUp()
+        self.storage = self.use(FileStorage(path=self.path, journal=True))
+
+    def journal_ops(self):
+        with open(self.path + ".log") as f:
+            return [json.loads(line)["op"] for line in f]
+
+    def test_save_appends_instead_of_rewriting(self):
+        us = User()
+        self.storage.save()
+        self.assertFalse(os.path.exists(self.path))
+        self.assertEqual(["create"], self.journal_ops())
+        us.save()
+        self.assertEqual(["create", "update"], self.journal_ops())
+
+    def test_save_only_writes_pending_objects(self):
+        User()
+        User()
+        self.storage.save()
+        self.storage.save()
+        self.assertEqual(["create", "create"], self.journal_ops())
+
+    def test_delete(self):
+        us = User()
+        self.storage.save()
+        self.storage.delete(us)
+        self.assertNotIn("User." + us.id, self.storage.all())
+        self.storage.save()
+        self.assertEqual(["create", "delete"], self.journal_ops())
+
+    def test_reload_replays_journal(self):
+        us = User()
+        pl = Place()
+        self.storage.save()
+        us.first_name = "Betty"
+        us.save()
+        self.storage.delete(pl)
+        self.storage.save()
+        FileStorage._FileStorage__objects = {}
+        self.storage.reload()
+        objs = self.storage.all()
+        self.assertEqual("Betty", objs["User." + us.id].first_name)
+        self.assertNotIn("Place." + pl.id, objs)
+
+    def test_reload_replays_journal_over_snapshot(self):
+        us = User()
+        FileStorage(path=self.path).save()
+        us.first_name = "Betty"
+        us.save()
+        FileStorage._FileStorage__objects = {}
+        self.storage.reload()
+        objs = self.storage.all()
+        self.assertEqual("Betty", objs["User." + us.id].first_name)
+
+
+class TestFileStorage_compact(FileStorageTestCase):
+    """Unittests for testing journal compaction of the FileStorage class."""
+
+    def test_compact_folds_journal_into_snapshot(self):
+        storage = self.use(FileStorage(path=self.path, journal=True))
+        us = User()
+        pl = Place()
+        storage.save()
+        storage.delete(pl)
+        storage.save()
+        storage.compact()
+        self.assertEqual(0, os.path.getsize(self.path + ".log"))
+        with open(self.path) as f:
+            objdictionary = json.load(f)
+        self.assertEqual(["User." + us.id], list(objdictionary))
+        FileStorage._FileStorage__objects = {}
+        storage.reload()
+        self.assertIn("User." + us.id, storage.all())
+        self.assertNotIn("Place." + pl.id, storage.all())
+
+    def test_compact_without_journal_is_noop(self):
+        storage = self.use(FileStorage(path=self.path))
+        storage.compact()
+        self.assertFalse(os.path.exists(self.path))
+
+    def test_compact_threshold(self):
+        storage = self.use(FileStorage(path=self.path, journal=True,
+                                       compact_threshold=1))
+        us = User()
+        storage.save()
+        self.assertEqual(0, os.path.getsize(self.path + ".log"))
+        with open(self.path) as f:
+            self.assertIn("User." + us.id, f.read())
+
+    def test_compact_interval(self):
+        storage = self.use(FileStorage(path=self.path, journal=True,
+                                       compact_interval=0.01))
+        self.addCleanup(storage.compactor.stop)
+        us = User()
+        storage.save()
+        for _ in range(200):
+            if not os.path.getsize(self.path + ".log"):
+                break
+            sleep(0.01)
+        self.assertEqual(0, os.path.getsize(self.path + ".log"))
+        with open(self.path) as f:
+            self.assertIn("User." + us.id, f.read())
+
+
+class TestFileStorage_dirty_tracking(FileStorageTestCase):
+    """Unittests for testing that FileStorage only encodes changed objects."""
+
+    def setUp(self):
+        super().setUp()
+        self.storage = self.use(FileStorage(path=self.path))
+
+    def test_save_only_encodes_modified_objects(self):
+        us = User()
+        pl = Place()
+        self.storage.save()
+        us.first_name = "Betty"
+        with patch.object(Place, "to_dict") as pl_to_dict:
+            self.storage.save()
+            pl_to_dict.assert_not_called()
+        with open(self.path) as f:
+            objdictionary = json.load(f)
+        self.assertEqual("Betty", objdictionary["User." + us.id]["first_name"])
+        self.assertEqual(pl.to_dict(), objdictionary["Place." + pl.id])
+
+    def test_save_output_matches_json_dump(self):
+        us = User()
+        us.first_name = "Betty"
+        Place()
+        self.storage.save()
+        odict = self.storage.all()
+        expected = json.dumps({k: odict[k].to_dict() for k in odict})
+        with open(self.path) as f:
+            self.assertEqual(expected, f.read())
+
+    def test_save_drops_deleted_objects(self):
+        us = User()
+        self.storage.save()
+        self.storage.delete(us)
+        self.storage.save()
+        with open(self.path) as f:
+            self.assertEqual({}, json.load(f))
+
+    def test_save_after_id_change(self):
+        us = User()
+        self.storage.save()
+        old = us.id
+        us.id = "1234"
+        us.first_name = "Betty"
+        self.storage.save()
+        self.assertIsNone(self.storage.get(User, old))
+        self.assertIs(us, self.storage.get(User, "1234"))
+        with open(self.path) as f:
+            objdictionary = json.load(f)
+        self.assertEqual(["User.1234"], list(objdictionary))
+        self.assertEqual("Betty", objdictionary["User.1234"]["first_name"])
+
+
+class TestFileStorage_atomic_write(FileStorageTestCase):
+    """Unittests for testing crash-safe writes of the FileStorage class."""
+
+    def test_failed_save_keeps_previous_file(self):
+        storage = self.use(FileStorage(path=self.path))
+        us = User()
+        storage.save()
+        User()
+        with patch("os.replace", side_effect=OSError):
+            with self.assertRaises(OSError):
+                storage.save()
+        with open(self.path) as f:
+            self.assertEqual(["User." + us.id], list(json.load(f)))
+        self.assertEqual(["file.json"], os.listdir(self.tmpdir.name))
+
+    def test_fsync_always(self):
+        storage = self.use(FileStorage(path=self.path, fsync="always"))
+        User()
+        with patch("os.fsync") as fsync:
+            storage.save()
+            fsync.assert_called()
+
+    def test_fsync_never(self):
+        storage = self.use(FileStorage(path=self.path, fsync="never"))
+        User()
+        with patch("os.fsync") as fsync:
+            storage.save()
+            fsync.assert_not_called()
+
+    def test_fsync_journal(self):
+        storage = self.use(FileStorage(path=self.path, journal=True,
+                                       fsync="2"))
+        with patch("os.fsync") as fsync:
+            User()
+            storage.save()
+            fsync.assert_not_called()
+            User()
+            storage.save()
+            fsync.assert_called_once()
+
+    def test_invalid_fsync_policy(self):
+        with self.assertRaises(ValueError):
+            FileStorage(fsync="sometimes")
+
+
+class TestFileStorage_coalescing(FileStorageTestCase):
+    """Unittests for testing write coalescing of the FileStorage class."""
+
+    def saved_keys(self):
+        with open(self.path) as f:
+            return set(json.load(f))
+
+    def test_batch_flushes_once(self):
+        storage = self.use(FileStorage(path=self.path))
+        with patch.object(FileStorage, "_FileStorage__write") as write:
+            with storage.batch():
+                users = [User() for _ in range(10)]
+                for us in users:
+                    us.save()
+                write.assert_not_called()
+            write.assert_called_once()
+
+    def test_nested_batch_flushes_at_outermost_exit(self):
+        storage = self.use(FileStorage(path=self.path))
+        with storage.batch():
+            with storage.batch():
+                us = User()
+                us.save()
+            self.assertFalse(os.path.exists(self.path))
+        self.assertEqual({"User." + us.id}, self.saved_keys())
+
+    def test_batch_without_save_does_not_flush(self):
+        storage = self.use(FileStorage(path=self.path))
+        with storage.batch():
+            User()
+        self.assertFalse(os.path.exists(self.path))
+
+    def test_batch_journal(self):
+        storage = self.use(FileStorage(path=self.path, journal=True))
+        with patch("models.engine.journal.Journal.append") as append:
+            with storage.batch():
+                for _ in range(10):
+                    User().save()
+            append.assert_called_once()
+            self.assertEqual(10, len(append.call_args[0][0]))
+
+    def test_coalescing_window(self):
+        storage = self.use(FileStorage(path=self.path, coalesce_ms=50))
+        first = User()
+        storage.save()
+        self.assertEqual({"User." + first.id}, self.saved_keys())
+        second = User()
+        storage.save()
+        self.assertEqual({"User." + first.id}, self.saved_keys())
+        sleep(0.2)
+        self.assertEqual({"User." + first.id, "User." + second.id},
+                         self.saved_keys())
+
+    def test_reload_writes_deferred_saves(self):
+        storage = self.use(FileStorage(path=self.path, coalesce_ms=10000))
+        pl = Place()
+        pl.save()
+        pl.name = "villa"
+        pl.save()
+        storage.reload()
+        self.assertEqual("villa", pl.name)
+        with open(self.path) as f:
+            self.assertEqual("villa", json.load(f)["Place." + pl.id]["name"])
+
+    def test_compact_writes_deferred_saves(self):
+        storage = self.use(FileStorage(path=self.path, journal=True,
+                                       coalesce_ms=10000))
+        pl = Place()
+        pl.save()
+        pl.name = "villa"
+        pl.save()
+        storage.compact()
+        with open(self.path) as f:
+            self.assertEqual("villa", json.load(f)["Place." + pl.id]["name"])
+
+    def test_flush_writes_deferred_saves(self):
+        storage = self.use(FileStorage(path=self.path, coalesce_ms=10000))
+        User().save()
+        us = User()
+        us.save()
+        storage.flush()
+        self.assertIn("User." + us.id, self.saved_keys())
+
+    def test_flush_on_exit(self):
+        storage = self.use(FileStorage(path=self.path, coalesce_ms=10000))
+        User().save()
+        us = User()
+        us.save()
+        storage._FileStorage__flush_waiting()
+        self.assertIn("User." + us.id, self.saved_keys())
+
+    def test_update_during_timer_flush(self):
+        storage = self.use(FileStorage(path=self.path, coalesce_ms=50))
+        pl = Place()
+        storage.save()
+        pl.name = "one"
+        encoding, proceed = threading.Event(), threading.Event()
+        to_dict = Place.to_dict
+
+        def slow_to_dict(obj):
+            encoded = to_dict(obj)
+            if threading.current_thread() is not threading.main_thread():
+                encoding.set()
+                proceed.wait(5)
+            return encoded
+        with patch.object(Place, "to_dict", slow_to_dict):
+            storage.save()
+            self.assertTrue(encoding.wait(5))
+            rename = threading.Thread(target=setattr,
+                                      args=(pl, "name", "two"))
+            rename.start()
+            rename.join(0.1)
+            proceed.set()
+            rename.join()
+            storage.save()
+            storage.flush()
+        with open(self.path) as f:
+            self.assertEqual("two", json.load(f)["Place." + pl.id]["name"])
+
+
+class TestFileStorage_lazy(FileStorageTestCase):
+    """Unittests for testing the lazy mode of the FileStorage class."""
+
+    def setUp(self):
+        super().setUp()
+        self.storage = self.use(FileStorage(path=self.path, lazy=True))
+        self.us = User()
+        self.us.first_name = "Betty"
+        self.pl = Place()
+        self.storage.save()
+        FileStorage._FileStorage__objects = {}
+
+    def test_reload_does_not_instantiate(self):
+        with patch.object(User, "__init__") as init:
+            self.storage.reload()
+            init.assert_not_called()
+        objs = self.storage.all()
+        self.assertEqual(2, len(objs))
+        self.assertIn("User." + self.us.id, objs)
+        self.assertFalse(objs.is_loaded("User." + self.us.id))
+
+    def test_reload_keeps_encodings(self):
+        self.storage.reload()
+        records = dict(self.storage.all().peek(encoded=True))
+        self.assertEqual(self.us.to_dict(),
+                         json.loads(records["User." + self.us.id]))
+        self.assertEqual({str}, {type(record) for record in records.values()})
+        self.assertEqual(self.us.to_dict(), self.storage.all().peek(
+            ["User." + self.us.id])[0][1])
+
+    def test_get_instantiates_one_object(self):
+        self.storage.reload()
+        us = self.storage.get(User, self.us.id)
+        self.assertEqual(self.us.to_dict(), us.to_dict())
+        self.assertTrue(self.storage.all().is_loaded("User." + us.id))
+        self.assertFalse(self.storage.all().is_loaded("Place." + self.pl.id))
+
+    def test_save_does_not_instantiate(self):
+        with open(self.path) as f:
+            before = f.read()
+        self.storage.reload()
+        with patch.object(User, "__init__") as init:
+            self.storage.save()
+            init.assert_not_called()
+        with open(self.path) as f:
+            self.assertEqual(before, f.read())
+
+    def test_save_after_update(self):
+        self.storage.reload()
+        us = self.storage.get(User, self.us.id)
+        us.first_name = "Holberton"
+        self.storage.save()
+        FileStorage._FileStorage__objects = {}
+        self.storage.reload()
+        self.assertEqual("Holberton",
+                         self.storage.get(User, self.us.id).first_name)
+        self.assertEqual(self.pl.to_dict(),
+                         self.storage.get(Place, self.pl.id).to_dict())
+
+    def test_reload_keeps_unsaved_objects(self):
+        FileStorage._FileStorage__objects = {}
+        bm = BaseModel()
+        self.storage.reload()
+        self.assertIs(bm, self.storage.get(BaseModel, bm.id))
+
+    def test_reload_with_journal(self):
+        storage = FileStorage(path=self.path, journal=True, lazy=True)
+        models.storage = storage
+        storage.reload()
+        us = storage.get(User, self.us.id)
+        us.first_name = "Holberton"
+        storage.delete(storage.get(Place, self.pl.id))
+        storage.save()
+        FileStorage._FileStorage__objects = {}
+        storage.reload()
+        self.assertEqual("Holberton", storage.get(User, us.id).first_name)
+        self.assertIsNone(storage.get(Place, self.pl.id))
+
+
+class TestFileStorage_shard(FileStorageTestCase):
+    """Unittests for testing the sharded mode of the FileStorage class."""
+
+    def shard(self, name):
+        with open(os.path.join(self.tmpdir.name, name)) as f:
+            return json.load(f)
+
+    def test_shard_by_class(self):
+        storage = self.use(FileStorage(path=self.path, shard="class"))
+        us = User()
+        pl = Place()
+        storage.save()
+        self.assertEqual(["file.Place.json", "file.User.json"],
+                         sorted(os.listdir(self.tmpdir.name)))
+        self.assertEqual(["User." + us.id], list(self.shard("file.User.json")))
+        self.assertEqual(["Place." + pl.id],
+                         list(self.shard("file.Place.json")))
+
+    def test_save_only_rewrites_changed_shards(self):
+        storage = self.use(FileStorage(path=self.path, shard="class"))
+        us = User()
+        Place()
+        storage.save()
+        with patch.object(FileStorage, "_FileStorage__write") as write:
+            us.first_name = "Betty"
+            storage.save()
+            write.assert_called_once()
+            self.assertTrue(write.call_args[0][0].endswith("file.User.json"))
+
+    def test_delete_rewrites_shard(self):
+        storage = self.use(FileStorage(path=self.path, shard="class"))
+        us = User()
+        storage.save()
+        storage.delete(us)
+        storage.save()
+        self.assertEqual({}, self.shard("file.User.json"))
+
+    def test_shard_by_hash(self):
+        storage = self.use(FileStorage(path=self.path, shard=4))
+        users = [User() for _ in range(40)]
+        storage.save()
+        names = sorted(os.listdir(self.tmpdir.name))
+        self.assertLessEqual(len(names), 4)
+        keys = set()
+        for name in names:
+            self.assertRegex(name, r"^file\.[0-3]\.json$")
+            keys.update(self.shard(name))
+        self.assertEqual({"User." + us.id for us in users}, keys)
+
+    def test_reload_with_threads(self):
+        storage = self.use(FileStorage(path=self.path, shard=3))
+        users = [User() for _ in range(20)]
+        pl = Place()
+        storage.save()
+        FileStorage._FileStorage__objects = {}
+        storage.reload()
+        self.assertEqual({"User." + us.id for us in users} |
+                         {"Place." + pl.id}, set(storage.all()))
+        self.assertEqual(pl.to_dict(), storage.get(Place, pl.id).to_dict())
+
+    def test_reload_with_processes(self):
+        storage = self.use(FileStorage(path=self.path, shard="class",
+                                       shard_pool="process",
+                                       shard_workers=2))
+        us = User()
+        pl = Place()
+        storage.save()
+        FileStorage._FileStorage__objects = {}
+        storage.reload()
+        self.assertEqual({"User." + us.id, "Place." + pl.id},
+                         set(storage.all()))
+
+    def test_import_with_processes(self):
+        storage = self.use(FileStorage(path=self.path, shard="class"))
+        User()
+        Place()
+        storage.save()
+        env = dict(os.environ, HBNB_STORAGE_PATH=self.path,
+                   HBNB_STORAGE_SHARD="class", HBNB_SHARD_POOL="process")
+        root = os.path.dirname(os.path.dirname(models.__file__))
+        for method in ("fork", "spawn"):
+            code = ("import multiprocessing\n"
+                    "multiprocessing.set_start_method({!r})\n"
+                    "import models\n"
+                    "print(models.storage.count())".format(method))
+            result = subprocess.run([sys.executable, "-c", code], env=env,
+                                    cwd=root, capture_output=True,
+                                    text=True, timeout=60)
+            self.assertEqual("2", result.stdout.strip(), result.stderr)
+
+    def test_reload_ignores_other_files(self):
+        storage = self.use(FileStorage(path=self.path, shard="class"))
+        us = User()
+        storage.save()
+        with open(os.path.join(self.tmpdir.name, "file.User.json.1-1.tmp"),
+                  "w") as f:
+            f.write("garbage")
+        FileStorage._FileStorage__objects = {}
+        storage.reload()
+        self.assertEqual(["User." + us.id], list(storage.all()))
+
+    def test_reshard_by_hash(self):
+        storage = self.use(FileStorage(path=self.path, shard=3))
+        users = [User() for _ in range(10)]
+        storage.save()
+        FileStorage._FileStorage__objects = {}
+        storage = self.use(FileStorage(path=self.path, shard=4))
+        storage.reload()
+        self.assertEqual(10, storage.count(User))
+        storage.delete(storage.get(User, users[0].id))
+        storage.save()
+        FileStorage._FileStorage__objects = {}
+        storage.reload()
+        self.assertEqual({"User." + us.id for us in users[1:]},
+                         set(storage.all()))
+        for name in os.listdir(self.tmpdir.name):
+            self.assertRegex(name, r"^file\.[0-3]\.json$")
+            for key in self.shard(name):
+                self.assertEqual(name.split(".")[1],
+                                 storage._FileStorage__shard_of(key))
+
+    def test_shard_existing_file(self):
+        storage = self.use(FileStorage(path=self.path))
+        users = [User() for _ in range(3)]
+        pl = Place()
+        storage.save()
+        FileStorage._FileStorage__objects = {}
+        storage = self.use(FileStorage(path=self.path, shard="class"))
+        storage.reload()
+        self.assertEqual(4, storage.count())
+        storage.save()
+        self.assertEqual(["file.Place.json", "file.User.json"],
+                         sorted(os.listdir(self.tmpdir.name)))
+        FileStorage._FileStorage__objects = {}
+        storage.reload()
+        self.assertEqual({"User." + us.id for us in users} |
+                         {"Place." + pl.id}, set(storage.all()))
+
+    def test_invalid_shard(self):
+        for shard in (0, -1, "id", 1.5):
+            with self.assertRaises(ValueError):
+                FileStorage(shard=shard)
+        with self.assertRaises(ValueError):
+            FileStorage(shard="class", journal=True)
+
+
+class TestFileStorage_binary(FileStorageTestCase):
+    """Unittests for testing the binary format of the FileStorage class."""
+
+    def round_trip(self, **kwargs):
+        path = os.path.join(self.tmpdir.name, "file.bin")
+        storage = self.use(FileStorage(path=path, **kwargs))
+        us = User()
+        us.first_name = "Betty"
+        pl = Place()
+        storage.save()
+        FileStorage._FileStorage__objects = {}
+        storage.reload()
+        self.assertEqual(us.to_dict(), storage.get(User, us.id).to_dict())
+        self.assertEqual(pl.to_dict(), storage.get(Place, pl.id).to_dict())
+        return path
+
+    def test_save_and_reload(self):
+        path = self.round_trip()
+        with open(path, "rb") as f:
+            self.assertTrue(f.read().startswith(b"HBNB"))
+
+    def test_lazy(self):
+        path = self.round_trip(lazy=True)
+        storage = FileStorage(path=path, lazy=True)
+        FileStorage._FileStorage__objects = {}
+        storage.reload()
+        records = storage.all().peek(encoded=True)
+        self.assertEqual({bytes}, {type(record) for _, record in records})
+
+    def test_shard(self):
+        self.round_trip(shard="class")
+        self.assertEqual(["file.Place.bin", "file.User.bin"],
+                         sorted(os.listdir(self.tmpdir.name)))
+
+    def test_journal_compaction(self):
+        path = os.path.join(self.tmpdir.name, "file.bin")
+        storage = self.use(FileStorage(path=path, journal=True))
+        us = User()
+        storage.save()
+        storage.compact()
+        us.first_name = "Betty"
+        us.save()
+        storage.compact()
+        FileStorage._FileStorage__objects = {}
+        storage.reload()
+        self.assertEqual("Betty", storage.get(User, us.id).first_name)
+
+
+class TestFileStorage_mmap(FileStorageTestCase):
+    """Unittests for testing the mmap mode of the FileStorage class."""
+
+    def populate(self, name="file.json", **kwargs):
+        self.path = os.path.join(self.tmpdir.name, name)
+        storage = self.use(FileStorage(path=self.path, mmap=True, **kwargs))
+        self.us = User()
+        self.us.first_name = "Betty"
+        self.pl = Place()
+        storage.save()
+        FileStorage._FileStorage__objects = {}
+        storage.reload()
+        return storage
+
+    def test_shard_rejected(self):
+        with self.assertRaises(ValueError):
+            FileStorage(mmap=True, shard="class")
+
+    def test_save_writes_index(self):
+        self.populate()
+        self.assertTrue(os.path.exists(self.path + ".idx"))
+
+    def test_get_decodes_one_record(self):
+        storage = self.populate()
+        objects = storage.all()
+        self.assertEqual(self.us.to_dict(),
+                         storage.get(User, self.us.id).to_dict())
+        self.assertTrue(objects.is_loaded("User." + self.us.id))
+        self.assertFalse(objects.is_loaded("Place." + self.pl.id))
+
+    def test_binary(self):
+        storage = self.populate("file.bin")
+        self.assertEqual(self.pl.to_dict(),
+                         storage.get(Place, self.pl.id).to_dict())
+
+    def test_save_keeps_unread_records(self):
+        storage = self.populate()
+        storage.get(User, self.us.id).last_name = "Holberton"
+        storage.save()
+        FileStorage._FileStorage__objects = {}
+        storage.reload()
+        self.assertEqual("Holberton",
+                         storage.get(User, self.us.id).last_name)
+        self.assertIsNotNone(storage.get(Place, self.pl.id))
+
+    def test_journal(self):
+        storage = self.populate(journal=True)
+        storage.get(User, self.us.id).last_name = "Holberton"
+        storage.delete(storage.get(Place, self.pl.id))
+        storage.save()
+        FileStorage._FileStorage__objects = {}
+        storage.reload()
+        self.assertEqual("Holberton",
+                         storage.get(User, self.us.id).last_name)
+        self.assertIsNone(storage.get(Place, self.pl.id))
+        storage.compact()
+        FileStorage._FileStorage__objects = {}
+        storage.reload()
+        self.assertEqual(["User." + self.us.id], list(storage.all()))
+
+
+class TestFileStorage_cache(FileStorageTestCase):
+    """Unittests for testing the object cache of the FileStorage class."""
+
+    def populate(self, **kwargs):
+        storage = self.use(FileStorage(path=self.path, cache_size=2,
+                                       **kwargs))
+        self.users = []
+        for name in ("Betty", "Holberton", "School"):
+            us = User()
+            us.first_name = name
+            self.users.append(us)
+        storage.save()
+        FileStorage._FileStorage__objects = {}
+        storage.reload()
+        return storage
+
+    def get(self, storage, i):
+        return storage.get(User, self.users[i].id)
+
+    def test_invalid_cache_size(self):
+        for cache_size in (0, -1, 1.5):
+            with self.assertRaises(ValueError):
+                FileStorage(cache_size=cache_size)
+
+    def test_evicts_least_recently_used(self):
+        storage = self.populate()
+        for i in (0, 1, 2):
+            self.assertEqual(self.users[i].first_name,
+                             self.get(storage, i).first_name)
+        self.assertEqual({"hits": 0, "misses": 3, "evictions": 1,
+                          "size": 2, "capacity": 2}, storage.cache_info())
+        self.assertFalse(storage.all().is_loaded(
+            "User." + self.users[0].id))
+        self.assertEqual("Betty", self.get(storage, 0).first_name)
+        self.get(storage, 0)
+        info = storage.cache_info()
+        self.assertEqual((1, 4, 2), (info["hits"], info["misses"],
+                                     info["evictions"]))
+
+    def test_evicts_to_encoding(self):
+        storage = self.populate()
+        for i in (0, 1, 2):
+            self.get(storage, i)
+        key = "User." + self.users[0].id
+        record = storage.all().peek([key], encoded=True)[0][1]
+        self.assertIs(str, type(record))
+        self.assertEqual(self.users[0].to_dict(), json.loads(record))
+
+    def test_modified_objects_stay(self):
+        storage = self.populate()
+        us = self.get(storage, 0)
+        us.first_name = "Ada"
+        self.get(storage, 1)
+        self.get(storage, 2)
+        self.assertIs(us, self.get(storage, 0))
+        storage.save()
+        self.get(storage, 1)
+        self.get(storage, 2)
+        self.assertFalse(storage.all().is_loaded("User." + us.id))
+        self.assertIs(us, self.get(storage, 0))
+        self.assertEqual("Ada", self.get(storage, 0).first_name)
+        FileStorage._FileStorage__objects = {}
+        storage.reload()
+        self.assertEqual("Ada", self.get(storage, 0).first_name)
+
+    def test_mmap(self):
+        storage = self.populate(mmap=True)
+        us = self.get(storage, 0)
+        us.first_name = "Ada"
+        storage.save()
+        self.get(storage, 1)
+        self.get(storage, 2)
+        self.assertEqual("Ada", self.get(storage, 0).first_name)
+        self.assertEqual("Holberton", self.get(storage, 1).first_name)
+
+    def test_journal(self):
+        storage = self.populate(journal=True)
+        self.get(storage, 0).first_name = "Ada"
+        storage.save()
+        for i in (1, 2, 1, 2):
+            self.get(storage, i)
+        self.assertEqual("Ada", self.get(storage, 0).first_name)
+
+    def test_not_lazy(self):
+        storage = FileStorage(path=self.path)
+        self.assertEqual(len(storage.all()), storage.cache_info()["size"])
+        self.assertIsNone(storage.cache_info()["capacity"])
+
+
+class TestFileStorage_identity(FileStorageTestCase):
+    """Unittests for testing the identity map of the FileStorage class."""
+
+    def rename(self, name):
+        with open(self.path) as f:
+            objs = json.load(f)
+        objs["User." + self.us.id]["first_name"] = name
+        with open(self.path, "w") as f:
+            json.dump(objs, f)
+
+    def populate(self, **kwargs):
+        storage = self.use(FileStorage(path=self.path, **kwargs))
+        self.us = User()
+        self.us.first_name = "Betty"
+        storage.save()
+        return storage
+
+    def test_reload_refreshes_live_objects(self):
+        storage = self.populate()
+        self.rename("Holberton")
+        storage.reload()
+        self.assertIs(self.us, storage.get(User, self.us.id))
+        self.assertEqual("Holberton", self.us.first_name)
+
+    def test_lazy_reload(self):
+        storage = self.populate(lazy=True)
+        storage.reload()
+        self.rename("Holberton")
+        storage.reload()
+        self.assertIs(self.us, storage.get(User, self.us.id))
+        self.assertEqual("Holberton", self.us.first_name)
+
+    def test_mmap_reload(self):
+        storage = self.populate(mmap=True)
+        storage.reload()
+        storage.get(User, self.us.id).first_name = "Holberton"
+        storage.save()
+        storage.reload()
+        self.assertIs(self.us, storage.get(User, self.us.id))
+        self.assertEqual("Holberton", self.us.first_name)
+
+    def test_journal_replay(self):
+        storage = self.populate(journal=True)
+        self.us.first_name = "Holberton"
+        storage.save()
+        self.us.__dict__["first_name"] = "Betty"
+        storage.reload()
+        self.assertIs(self.us, storage.get(User, self.us.id))
+        self.assertEqual("Holberton", self.us.first_name)
+
+    def test_evicted_object_reused(self):
+        storage = self.populate(cache_size=1)
+        pl = Place()
+        storage.save()
+        FileStorage._FileStorage__objects = {}
+        storage.reload()
+        us = storage.get(User, self.us.id)
+        storage.get(Place, pl.id)
+        self.assertFalse(storage.all().is_loaded("User." + us.id))
+        with patch.object(User, "__init__") as init:
+            self.assertIs(us, storage.get(User, self.us.id))
+            init.assert_not_called()
+
+    def test_evicted_object_modified(self):
+        storage = self.populate(cache_size=1)
+        pl = Place()
+        storage.save()
+        FileStorage._FileStorage__objects = {}
+        storage.reload()
+        us = storage.get(User, self.us.id)
+        storage.get(Place, pl.id)
+        us.first_name = "Holberton"
+        storage.save()
+        FileStorage._FileStorage__objects = {}
+        storage.reload()
+        self.assertEqual("Holberton",
+                         storage.get(User, self.us.id).first_name)
+
+    def test_detached_objects_ignored(self):
+        storage = self.populate()
+        FileStorage._FileStorage__objects = {}
+        storage.reload()
+        us = storage.get(User, self.us.id)
+        self.assertIsNot(self.us, us)
+        self.us.first_name = "Holberton"
+        storage.save()
+        FileStorage._FileStorage__objects = {}
+        storage.reload()
+        self.assertEqual("Betty", storage.get(User, us.id).first_name)
+
+
+class TestFileStorage_compression(FileStorageTestCase):
+    """Unittests for testing compressed files of the FileStorage class."""
+
+    def round_trip(self, name, **kwargs):
+        path = os.path.join(self.tmpdir.name, name)
+        storage = self.use(FileStorage(path=path, **kwargs))
+        us = User()
+        us.first_name = "Betty"
+        pl = Place()
+        storage.save()
+        FileStorage._FileStorage__objects = {}
+        storage.reload()
+        self.assertEqual(us.to_dict(), storage.get(User, us.id).to_dict())
+        self.assertEqual(pl.to_dict(), storage.get(Place, pl.id).to_dict())
+        return path
+
+    def test_gzip(self):
+        path = self.round_trip("file.json.gz", fsync="always")
+        with gzip.open(path, "rt") as f:
+            self.assertEqual(2, len(json.load(f)))
+
+    def test_lzma(self):
+        path = self.round_trip("file.json.xz")
+        with lzma.open(path, "rt") as f:
+            self.assertEqual(2, len(json.load(f)))
+
+    def test_binary(self):
+        path = self.round_trip("file.bin.gz")
+        with gzip.open(path) as f:
+            self.assertTrue(f.read().startswith(b"HBNB"))
+
+    def test_shard(self):
+        self.round_trip("file.json.gz", shard="class")
+        self.assertEqual(["file.Place.json.gz", "file.User.json.gz"],
+                         sorted(os.listdir(self.tmpdir.name)))
+
+    def test_journal(self):
+        path = os.path.join(self.tmpdir.name, "file.json.xz")
+        storage = self.use(FileStorage(path=path, journal=True))
+        us = User()
+        storage.save()
+        self.assertTrue(os.path.exists(
+            os.path.join(self.tmpdir.name, "file.json.log.xz")))
+        storage.compact()
+        us.first_name = "Betty"
+        us.save()
+        FileStorage._FileStorage__objects = {}
+        storage.reload()
+        self.assertEqual("Betty", storage.get(User, us.id).first_name)
+
+    def test_mmap_rejected(self):
+        with self.assertRaises(ValueError):
+            FileStorage(path="file.json.gz", mmap=True)
+
+
+class TestFileStorage_class_index(FileStorageTestCase):
+    """Unittests for testing the class index of the FileStorage class."""
+
+    def test_all_of_class(self):
+        storage = self.use(FileStorage(path=self.path))
+        us = User()
+        pl = Place()
+        self.assertEqual({"User." + us.id: us}, storage.all(User))
+        self.assertEqual({"Place." + pl.id: pl}, storage.all("Place"))
+        self.assertEqual({}, storage.all(Review))
+
+    def test_count(self):
+        storage = self.use(FileStorage(path=self.path))
+        User()
+        User()
+        Place()
+        self.assertEqual(2, storage.count(User))
+        self.assertEqual(1, storage.count("Place"))
+        self.assertEqual(0, storage.count(Review))
+        self.assertEqual(3, storage.count())
+
+    def test_delete(self):
+        storage = self.use(FileStorage(path=self.path))
+        us = User()
+        storage.delete(us)
+        self.assertEqual(0, storage.count(User))
+        self.assertEqual({}, storage.all(User))
+
+    def test_replaced_objects(self):
+        storage = self.use(FileStorage(path=self.path))
+        User()
+        FileStorage._FileStorage__objects = {}
+        self.assertEqual(0, storage.count(User))
+        us = User()
+        self.assertEqual(["User." + us.id], list(storage.all(User)))
+
+    def test_reload(self):
+        storage = self.use(FileStorage(path=self.path, journal=True))
+        us = User()
+        pl = Place()
+        storage.save()
+        storage.delete(pl)
+        storage.save()
+        FileStorage._FileStorage__objects = {}
+        storage.reload()
+        self.assertEqual(1, storage.count(User))
+        self.assertEqual(0, storage.count(Place))
+        self.assertEqual(us.to_dict(),
+                         storage.all(User)["User." + us.id].to_dict())
+
+    def test_lazy_count_does_not_instantiate(self):
+        storage = self.use(FileStorage(path=self.path, lazy=True))
+        us = User()
+        storage.save()
+        FileStorage._FileStorage__objects = {}
+        storage.reload()
+        self.assertEqual(1, storage.count(User))
+        self.assertFalse(storage.all().is_loaded("User." + us.id))
+
+    def test_mmap(self):
+        storage = self.use(FileStorage(path=self.path, mmap=True))
+        User()
+        Place()
+        storage.save()
+        storage.reload()
+        self.assertEqual(1, storage.count(User))
+        self.assertEqual(1, len(storage.all(Place)))
+
+
+class TestFileStorage_find(FileStorageTestCase):
+    """Unittests for testing the find method of the FileStorage class."""
+
+    def places(self):
+        self.p1 = Place()
+        self.p1.city_id = "c1"
+        self.p1.user_id = "u1"
+        self.p2 = Place()
+        self.p2.city_id = "c1"
+        self.p2.user_id = "u2"
+        self.p3 = Place()
+        self.p3.city_id = "c2"
+        self.p3.user_id = "u1"
+
+    def test_find_indexed(self):
+        storage = self.use(FileStorage(path=self.path))
+        self.places()
+        self.assertEqual([self.p1, self.p2], storage.find(Place, city_id="c1"))
+        self.assertEqual([self.p1], storage.find("Place", city_id="c1",
+                                                 user_id="u1"))
+        self.assertEqual([], storage.find(Place, city_id="c3"))
+
+    def test_find_not_indexed(self):
+        storage = self.use(FileStorage(path=self.path))
+        self.places()
+        self.p3.name = "Loft"
+        self.assertEqual([self.p3], storage.find(Place, name="Loft"))
+        self.assertEqual([self.p3], storage.find(Place, city_id="c2",
+                                                 name="Loft"))
+        self.assertEqual(3, len(storage.find(Place)))
+        self.assertEqual([], storage.find(Place, missing="x"))
+
+    def test_index_follows_changes(self):
+        storage = self.use(FileStorage(path=self.path))
+        self.places()
+        self.assertEqual(2, len(storage.find(Place, city_id="c1")))
+        self.p1.city_id = "c2"
+        p4 = Place()
+        p4.city_id = "c1"
+        storage.delete(self.p2)
+        self.assertEqual([p4], storage.find(Place, city_id="c1"))
+        self.assertEqual([self.p3, self.p1],
+                         storage.find(Place, city_id="c2"))
+
+    def test_find_after_reload(self):
+        storage = self.use(FileStorage(path=self.path))
+        self.places()
+        storage.find(Place, city_id="c1")
+        storage.save()
+        FileStorage._FileStorage__objects = {}
+        storage.reload()
+        found = storage.find(Place, city_id="c1")
+        self.assertEqual([self.p1.id, self.p2.id], [p.id for p in found])
+
+    def test_find_lazy(self):
+        storage = self.use(FileStorage(path=self.path, lazy=True))
+        self.places()
+        storage.save()
+        FileStorage._FileStorage__objects = {}
+        storage.reload()
+        found = storage.find(Place, city_id="c2")
+        self.assertEqual([self.p3.id], [p.id for p in found])
+        self.assertFalse(storage.all().is_loaded("Place." + self.p1.id))
+
+    def test_find_amenities(self):
+        storage = self.use(FileStorage(path=self.path))
+        self.places()
+        self.p1.amenity_ids = ["wifi", "pool"]
+        self.p2.amenity_ids = ["wifi", "parking"]
+        self.p3.amenity_ids = ["wifi", "pool", "parking"]
+        self.assertEqual([self.p1, self.p3], storage.find(
+            Place, amenity_ids__all=["wifi", "pool"]))
+        self.assertEqual([self.p2, self.p3], storage.find(
+            Place, amenity_ids__any=["parking"]))
+        self.assertEqual([self.p1], storage.find(
+            Place, city_id="c1", amenity_ids__all=["pool"]))
+        self.assertEqual([], storage.find(
+            Place, amenity_ids__all=["sauna"]))
+
+    def test_amenity_index_follows_changes(self):
+        storage = self.use(FileStorage(path=self.path))
+        self.places()
+        self.p1.amenity_ids = ["wifi"]
+        self.assertEqual([self.p1], storage.find(
+            Place, amenity_ids__any=["wifi"]))
+        self.p2.amenity_ids = ["wifi"]
+        self.p1.amenity_ids = []
+        self.assertEqual([self.p2], storage.find(
+            Place, amenity_ids__all=["wifi"]))
+        storage.delete(self.p2)
+        self.assertEqual([], storage.find(Place, amenity_ids__all=["wifi"]))
+
+    def test_find_amenities_lazy(self):
+        storage = self.use(FileStorage(path=self.path, lazy=True))
+        self.places()
+        self.p3.amenity_ids = ["wifi"]
+        storage.save()
+        FileStorage._FileStorage__objects = {}
+        storage.reload()
+        found = storage.find(Place, amenity_ids__all=["wifi"])
+        self.assertEqual([self.p3.id], [pl.id for pl in found])
+        self.assertFalse(storage.all().is_loaded("Place." + self.p1.id))
+
+    def test_find_other_classes(self):
+        storage = self.use(FileStorage(path=self.path))
+        rv = Review()
+        rv.place_id = "p1"
+        ct = City()
+        ct.state_id = "s1"
+        us = User()
+        us.first_name = "Betty"
+        self.assertEqual([rv], storage.find(Review, place_id="p1"))
+        self.assertEqual([ct], storage.find(City, state_id="s1"))
+        self.assertEqual([us], storage.find(User, first_name="Betty"))
+        self.assertEqual([], storage.find("Unknown", id="x"))
+
+
+class TestFileStorage_find_range(FileStorageTestCase):
+    """Unittests for testing the find_range method of FileStorage."""
+
+    def setUp(self):
+        super().setUp()
+        self.storage = self.use(FileStorage(path=self.path))
+        self.places = []
+        for price in (120, 50, 80, 200):
+            pl = Place()
+            pl.price_by_night = price
+            pl.name = "Place {}".format(price)
+            self.places.append(pl)
+
+    def prices(self, found):
+        return [pl.price_by_night for pl in found]
+
+    def test_find_range(self):
+        found = self.storage.find_range(Place, "price_by_night", 50, 120)
+        self.assertEqual([50, 80, 120], self.prices(found))
+        found = self.storage.find_range("Place", "price_by_night", low=100)
+        self.assertEqual([120, 200], self.prices(found))
+
+    def test_index_follows_changes(self):
+        self.storage.find_range(Place, "price_by_night")
+        self.places[0].price_by_night = 10
+        self.storage.delete(self.places[1])
+        pl = Place()
+        pl.price_by_night = 90
+        found = self.storage.find_range(Place, "price_by_night", high=100)
+        self.assertEqual([10, 80, 90], self.prices(found))
+
+    def test_console_update(self):
+        self.storage.find_range(Place, "price_by_night")
+        pl = self.places[3]
+        with patch("sys.stdout"):
+            HBNBCommand().onecmd(
+                "update Place {} price_by_night 60".format(pl.id))
+        found = self.storage.find_range(Place, "price_by_night", 55, 70)
+        self.assertEqual([pl], found)
+
+    def test_not_indexed(self):
+        found = self.storage.find_range(Place, "latitude", 0, 0)
+        self.assertEqual(4, len(found))
+        self.assertEqual([], self.storage.find_range(User, "price_by_night"))
+
+    def test_after_reload(self):
+        self.storage.save()
+        FileStorage._FileStorage__objects = {}
+        self.storage.reload()
+        found = self.storage.find_range(Place, "price_by_night", 60)
+        self.assertEqual([80, 120, 200], self.prices(found))
+
+
+class TestFileStorage_query(FileStorageTestCase):
+    """Unittests for testing the query method of the FileStorage class."""
+
+    def places(self, storage):
+        self.use(storage)
+        for price, city_id in ((120, "c1"), (50, "c2"), (80, "c1"),
+                               (200, "c1")):
+            pl = Place()
+            pl.price_by_night = price
+            pl.city_id = city_id
+            pl.name = "Place {}".format(price)
+        City()
+        return storage
+
+    def prices(self, found):
+        return [pl.price_by_night for pl in found]
+
+    def reload_lazy(self, storage):
+        storage.save()
+        FileStorage._FileStorage__objects = {}
+        storage = FileStorage(path=self.path, lazy=True)
+        storage.reload()
+        self.use(storage)
+        return storage
+
+    def loaded(self, storage):
+        objects = storage.all()
+        return [key for key in objects if objects.is_loaded(key)]
+
+    def test_where(self):
+        storage = self.places(FileStorage(path=self.path))
+        query = storage.query(Place).where(city_id="c1",
+                                           price_by_night__lt=200)
+        self.assertEqual([120, 80], self.prices(query))
+        self.assertEqual(4, len(list(storage.query("Place"))))
+        self.assertEqual([], list(storage.query("Unknown")))
+
+    def test_order_by(self):
+        storage = self.places(FileStorage(path=self.path))
+        query = storage.query(Place).order_by("price_by_night")
+        self.assertEqual([50, 80, 120, 200], self.prices(query))
+        query.where(city_id="c1").order_by("-price_by_night")
+        self.assertEqual([200, 120, 80], self.prices(query))
+        query.where(price_by_night__gte=80, price_by_night__lt=200)
+        self.assertEqual([120, 80], self.prices(query))
+        query = storage.query(Place).order_by("-name").offset(1).limit(2)
+        self.assertEqual([50, 200], self.prices(query))
+
+    def test_modified_while_iterating(self):
+        storage = self.places(FileStorage(path=self.path))
+        for pl in storage.query(Place).order_by("price_by_night"):
+            pl.price_by_night += 100
+        self.assertEqual([150, 180, 220, 300], self.prices(
+            storage.query(Place).order_by("price_by_night")))
+
+    def test_find_bounds(self):
+        storage = self.places(FileStorage(path=self.path))
+        found = storage.find(Place, price_by_night__gt=50,
+                             price_by_night__lte=120)
+        self.assertEqual([80, 120], self.prices(found))
+        found = storage.find(Place, price_by_night__gt="x")
+        self.assertEqual([], found)
+
+    def test_lazy_limit(self):
+        storage = self.reload_lazy(self.places(FileStorage(path=self.path)))
+        query = storage.query(Place).order_by("-price_by_night").limit(1)
+        self.assertEqual([200], self.prices(query))
+        self.assertEqual(1, len(self.loaded(storage)))
+        query = storage.query(Place).order_by("name").limit(1)
+        self.assertEqual([120], self.prices(query))
+        self.assertEqual(2, len(self.loaded(storage)))
+
+    def test_lazy_only(self):
+        storage = self.reload_lazy(self.places(FileStorage(path=self.path)))
+        query = storage.query(Place).where(city_id="c1").order_by(
+            "price_by_night").only("name", "price_by_night")
+        self.assertEqual([{"name": "Place 80", "price_by_night": 80},
+                          {"name": "Place 120", "price_by_night": 120},
+                          {"name": "Place 200", "price_by_night": 200}],
+                         list(query))
+        self.assertEqual([], self.loaded(storage))
+
+
+class TestFileStorage_geo(FileStorageTestCase):
+    """Unittests for testing the spatial queries of FileStorage."""
+
+    def setUp(self):
+        super().setUp()
+        self.storage = self.use(FileStorage(path=self.path))
+        self.sf = self.place(37.77, -122.42)
+        self.oakland = self.place(37.80, -122.27)
+        self.nyc = self.place(40.71, -74.01)
+
+    def place(self, latitude, longitude):
+        pl = Place()
+        pl.latitude = latitude
+        pl.longitude = longitude
+        return pl
+
+    def test_near(self):
+        self.assertEqual([self.sf, self.oakland],
+                         self.storage.near(Place, 37.77, -122.42, 20))
+        self.assertEqual([self.sf], self.storage.near("Place", 37.77,
+                                                      -122.42, 1))
+
+    def test_within(self):
+        self.assertEqual([self.nyc],
+                         self.storage.within(Place, 40, -75, 41, -74))
+
+    def test_nearest(self):
+        self.assertEqual([self.oakland, self.sf],
+                         self.storage.nearest(Place, 37.8, -122.2, 2))
+        self.assertEqual([self.nyc], self.storage.nearest(Place, 40, -75))
+
+    def test_index_follows_changes(self):
+        self.storage.near(Place, 0, 0, 1)
+        self.nyc.latitude = 37.78
+        self.nyc.longitude = -122.41
+        self.storage.delete(self.oakland)
+        self.assertEqual([self.sf, self.nyc],
+                         self.storage.near(Place, 37.77, -122.42, 20))
+
+    def test_after_reload(self):
+        self.storage.save()
+        FileStorage._FileStorage__objects = {}
+        self.storage.reload()
+        found = self.storage.near(Place, 40.71, -74.01, 5)
+        self.assertEqual([self.nyc.id], [pl.id for pl in found])
+
+    def test_class_without_geo(self):
+        us = User()
+        us.latitude = 1.0
+        us.longitude = 1.0
+        self.assertEqual([us], self.storage.near(User, 1, 1, 1))
+        self.assertEqual([], self.storage.near(State, 1, 1, 1))
+
+
+class TestFileStorage_search(FileStorageTestCase):
+    """Unittests for testing the full-text search of FileStorage."""
+
+    def setUp(self):
+        super().setUp()
+        self.storage = self.use(FileStorage(path=self.path))
+        self.loft = Place()
+        self.loft.name = "City loft"
+        self.loft.description = "Fast wifi"
+        self.review = Review()
+        self.review.text = "The loft was great"
+
+    def test_search(self):
+        self.assertEqual([self.loft], self.storage.search(Place, "loft"))
+        self.assertEqual([self.loft], self.storage.search("Place", "wifi"))
+        self.assertEqual([self.review], self.storage.search(Review, "loft"))
+        self.assertEqual([], self.storage.search(User, "loft"))
+
+    def test_index_follows_changes(self):
+        self.storage.search(Place, "loft")
+        self.loft.description = "No wifi"
+        other = Place()
+        other.name = "Fast boat"
+        self.storage.delete(self.review)
+        self.assertEqual([other], self.storage.search(Place, "fast"))
+        self.assertEqual([], self.storage.search(Review, "loft"))
+
+    def test_after_reload(self):
+        self.storage.save()
+        FileStorage._FileStorage__objects = {}
+        self.storage.reload()
+        found = self.storage.search(Review, "great")
+        self.assertEqual([self.review.id], [rv.id for rv in found])
+
+
+class TestFileStorage_columns(FileStorageTestCase):
+    """Unittests for testing the columnar tables of FileStorage."""
+
+    def setUp(self):
+        super().setUp()
+        self.storage = self.use(FileStorage(path=self.path))
+        self.places = []
+        for city_id, price in (("c1", 100), ("c2", 50), ("c1", 80)):
+            pl = Place()
+            pl.city_id = city_id
+            pl.price_by_night = price
+            self.places.append(pl)
+
+    def test_columns(self):
+        table = self.storage.columns(Place)
+        self.assertIs(table, self.storage.columns("Place"))
+        self.assertEqual({"c1": 90, "c2": 50},
+                         table.mean("price_by_night", by="city_id"))
+        self.assertEqual([self.places[2].id],
+                         [key.split(".")[1] for key in
+                          table.keys(city_id="c1", price_by_night__lt=90)])
+
+    def test_table_follows_changes(self):
+        table = self.storage.columns(Place)
+        self.places[0].price_by_night = 120
+        self.storage.delete(self.places[1])
+        pl = Place()
+        pl.city_id = "c2"
+        pl.max_guest = 4
+        self.assertEqual({"c1": 100, "c2": 0},
+                         table.mean("price_by_night", by="city_id"))
+        self.assertEqual(4, table.sum("max_guest"))
+        self.assertEqual(3, len(table))
+
+    def test_without_columns(self):
+        User()
+        User()
+        table = self.storage.columns(User)
+        self.assertEqual(2, table.count())
+        self.assertEqual((), table.name)
+
+    def test_lazy_reload(self):
+        self.storage.save()
+        FileStorage._FileStorage__objects = {}
+        storage = FileStorage(path=self.path, lazy=True)
+        storage.reload()
+        table = storage.columns(Place)
+        self.assertEqual(230, table.sum("price_by_night"))
+        self.assertEqual(0, FileStorage._FileStorage__objects.count_loaded())
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,45 @@
+#!/usr/bin/python3
+"""Defines unittests for models/engine/fsync_policy.py.
+
+Unittest classes:
+    TestFsyncPolicy
+"""
+import unittest
+from time import sleep
+from models.engine.fsync_policy import FsyncPolicy
+
+
+class TestFsyncPolicy(unittest.TestCase):
+    """Unittests for testing the FsyncPolicy class."""
+
+    def test_default_is_never(self):
+        self.assertEqual("never", FsyncPolicy().spec)
+
+    def test_always(self):
+        policy = FsyncPolicy("always")
+        self.assertEqual([True, True, True], [policy.due() for _ in range(3)])
+
+    def test_never(self):
+        policy = FsyncPolicy("never")
+        self.assertEqual([False] * 3, [policy.due() for _ in range(3)])
+
+    def test_every_n_writes(self):
+        policy = FsyncPolicy("3")
+        self.assertEqual([False, False, True, False, False, True],
+                         [policy.due() for _ in range(6)])
+
+    def test_every_n_ms(self):
+        policy = FsyncPolicy("20ms")
+        self.assertFalse(policy.due())
+        sleep(0.03)
+        self.assertTrue(policy.due())
+        self.assertFalse(policy.due())
+
+    def test_invalid_spec(self):
+        for spec in ("sometimes", "0", "-1", "-5ms"):
+            with self.assertRaises(ValueError):
+                FsyncPolicy(spec)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,128 @@
+#!/usr/bin/python3
+"""Defines unittests for models/engine/geo_index.py.
+
+Unittest classes:
+    TestGeoIndex_haversine
+    TestGeoIndex
+"""
+import random
+import unittest
+from unittest.mock import patch
+from models.engine.geo_index import GeoIndex, haversine
+
+
+class TestGeoIndex_haversine(unittest.TestCase):
+    """Unittests for testing the haversine function."""
+
+    def test_distance(self):
+        self.assertAlmostEqual(0, haversine(37.77, -122.42, 37.77, -122.42))
+        paris_london = haversine(48.8566, 2.3522, 51.5074, -0.1278)
+        self.assertAlmostEqual(343.5, paris_london, delta=1)
+
+    def test_antimeridian(self):
+        self.assertAlmostEqual(haversine(0, 179.5, 0, -179.5),
+                               haversine(0, -0.5, 0, 0.5))
+
+
+class TestGeoIndex(unittest.TestCase):
+    """Unittests for testing the GeoIndex class."""
+
+    def setUp(self):
+        rng = random.Random(12)
+        self.index = GeoIndex(cell=1.0)
+        self.points = {}
+        for i in range(2000):
+            if i % 4:
+                point = (rng.gauss(37.7, 1), rng.gauss(-122.4, 1))
+            else:
+                point = (rng.uniform(-90, 90), rng.uniform(-180, 180))
+            self.points["Place.{}".format(i)] = point
+            self.index.add("Place.{}".format(i), point)
+
+    def distances(self, latitude, longitude):
+        return sorted((haversine(latitude, longitude, *point), key)
+                      for key, point in self.points.items())
+
+    def test_radius(self):
+        for point in ((37.7, -122.4), (0, 180), (89.9, 0), (-60, -179.9)):
+            for km in (0, 10, 200, 5000, 30000):
+                expected = [(d, key) for d, key in self.distances(*point)
+                            if d <= km]
+                self.assertEqual(expected, self.index.radius(*point, km))
+
+    def test_nearest(self):
+        for point in ((37.7, -122.4), (0, 180), (89.9, 0), (-60, -179.9)):
+            for k in (1, 10, 300):
+                expected = self.distances(*point)[:k]
+                found = self.index.nearest(*point, k)
+                self.assertEqual([d for d, key in expected],
+                                 [d for d, key in found])
+        self.assertEqual([], self.index.nearest(0, 0, 0))
+        self.assertEqual(2000, len(self.index.nearest(0, 0, 5000)))
+
+    def test_nearest_far_from_points(self):
+        rng = random.Random(3)
+        index = GeoIndex()
+        points = {}
+        for i in range(3000):
+            latitude, longitude = rng.choice(((37.77, -122.42),
+                                              (48.86, 2.35), (35.68, 139.69)))
+            points["Place.{}".format(i)] = (rng.gauss(latitude, 0.5),
+                                            rng.gauss(longitude, 0.5))
+            index.add("Place.{}".format(i), points["Place.{}".format(i)])
+        ring = GeoIndex._GeoIndex__ring
+        for point in ((0, 0), (-10, -100), (20, 60)):
+            expected = sorted((haversine(*point, *p), key)
+                              for key, p in points.items())[:5]
+            with patch.object(GeoIndex, "_GeoIndex__ring", autospec=True,
+                              side_effect=ring) as rings:
+                self.assertEqual(expected, index.nearest(*point, 5))
+            self.assertLess(rings.call_count, 50)
+
+    def test_bbox(self):
+        for south, west, north, east in ((37, -123, 38, -122),
+                                         (-90, 170, 90, -170),
+                                         (-10, -180, 10, 180)):
+            expected = set()
+            for key, (latitude, longitude) in self.points.items():
+                if west <= east:
+                    inside = west <= longitude <= east
+                else:
+                    inside = longitude >= west or longitude <= east
+                if south <= latitude <= north and inside:
+                    expected.add(key)
+            self.assertEqual(expected,
+                             set(self.index.bbox(south, west, north, east)))
+        self.assertEqual([], self.index.bbox(10, 0, -10, 5))
+
+    def test_add_moves_point(self):
+        self.index.add("Place.0", (10.0, 10.0))
+        self.assertEqual(["Place.0"], self.index.bbox(9.9, 9.9, 10.1, 10.1))
+        self.index.add("Place.0", (-10.0, -10.0))
+        self.assertEqual([], self.index.bbox(9.9, 9.9, 10.1, 10.1))
+        self.assertEqual(2000, len(self.index))
+
+    def test_remove(self):
+        self.index.remove("Place.1")
+        self.index.remove("Place.unknown")
+        self.assertEqual(1999, len(self.index))
+        self.assertNotIn("Place.1", self.index.bbox(-90, -180, 90, 180))
+
+    def test_invalid_coordinates(self):
+        for point in ((None, 0), (91, 0), (0, 181), ("1", "2"),
+                      (float("nan"), 0), (True, 0)):
+            self.index.add("Place.0", point)
+            self.assertEqual(1999, len(self.index))
+
+    def test_non_finite_queries(self):
+        for value in (float("nan"), float("inf"), -float("inf")):
+            self.assertEqual([], self.index.radius(value, 0, 10))
+            self.assertEqual([], self.index.radius(0, 0, value))
+            self.assertEqual([], self.index.bbox(value, 0, 10, 10))
+            self.assertEqual([], self.index.bbox(0, 0, 10, value))
+            self.assertEqual([], self.index.nearest(value, 0, 3))
+            self.assertEqual([], self.index.nearest(0, value, 3))
+
+
+if __name__ == "__main__":
+    unittest.main()
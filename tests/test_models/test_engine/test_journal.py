@@ -0,0 +1,72 @@
+#!/usr/bin/python3
+"""Defines unittests for models/engine/journal.py.
+
+Unittest classes:
+    TestJournal
+"""
+import json
+import os
+import tempfile
+import unittest
+from models.engine.journal import Journal
+
+
+class TestJournal(unittest.TestCase):
+    """Unittests for testing the Journal class."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "file.json.log")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_replay_missing_file(self):
+        self.assertEqual([], list(Journal(self.path).replay()))
+
+    def test_encode(self):
+        record = json.loads(Journal.encode("update", "User.1", '{"a": 1}'))
+        self.assertEqual({"op": "update", "key": "User.1", "data": {"a": 1}},
+                         record)
+        record = json.loads(Journal.encode("delete", "User.1"))
+        self.assertEqual({"op": "delete", "key": "User.1"}, record)
+
+    def test_append_then_replay(self):
+        journal = Journal(self.path)
+        journal.append([Journal.encode("delete", "User.1")])
+        journal.append([Journal.encode("delete", "User.2"),
+                        Journal.encode("delete", "User.3")])
+        keys = [record["key"] for record in journal.replay()]
+        self.assertEqual(["User.1", "User.2", "User.3"], keys)
+
+    def test_replay_stops_at_torn_record(self):
+        journal = Journal(self.path)
+        journal.append([Journal.encode("delete", "User.1")])
+        with open(self.path, "a") as f:
+            f.write('{"op": "delete", "ke')
+        self.assertEqual(1, len(list(journal.replay())))
+
+    def test_compressed(self):
+        for suffix in (".gz", ".xz"):
+            journal = Journal(self.path + suffix)
+            journal.append([Journal.encode("delete", "User.1")])
+            journal.append([Journal.encode("delete", "User.2")], sync=True)
+            keys = [record["key"] for record in journal.replay()]
+            self.assertEqual(["User.1", "User.2"], keys)
+            journal.truncate()
+            self.assertEqual([], list(journal.replay()))
+
+    def test_compressed_replay_stops_at_torn_stream(self):
+        journal = Journal(self.path + ".gz")
+        journal.append([Journal.encode("delete", "User.1")])
+        journal.append([Journal.encode("delete", "User.2")])
+        with open(journal.path, "rb") as f:
+            data = f.read()
+        with open(journal.path, "wb") as f:
+            f.write(data[:-4])
+        keys = [record["key"] for record in journal.replay()]
+        self.assertEqual("User.1", keys[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,75 @@
+#!/usr/bin/python3
+"""Defines unittests for models/engine/json_stream.py.
+
+Unittest classes:
+    TestJsonStream_iter_entries
+    TestJsonStream_write_entries
+"""
+import json
+import unittest
+from io import StringIO
+from models.engine.json_stream import (decode, iter_entries, iter_fragments,
+                                       write_entries)
+
+
+class TestJsonStream_iter_entries(unittest.TestCase):
+    """Unittests for testing the iter_entries function."""
+
+    document = {
+        "User.1": {"id": "1", "text": "a \"quoted\" }{,: value"},
+        "Place.2": {"id": "2", "amenity_ids": ["a", "b"], "nested": {}},
+        "Count": 12345,
+        "Empty": {}
+    }
+
+    def test_entries_at_every_chunk_size(self):
+        text = json.dumps(self.document)
+        for chunk_size in (1, 2, 3, 7, 64, 65536):
+            entries = list(iter_entries(StringIO(text), chunk_size))
+            self.assertEqual(list(self.document.items()), entries)
+
+    def test_fragments_at_every_chunk_size(self):
+        text = json.dumps(self.document)
+        expected = [(key, json.dumps(value))
+                    for key, value in self.document.items()]
+        for chunk_size in (1, 2, 3, 7, 64, 65536):
+            fragments = list(iter_fragments(StringIO(text), chunk_size))
+            self.assertEqual(expected, fragments)
+        self.assertEqual(self.document["Place.2"], decode(fragments[1][1]))
+
+    def test_whitespace(self):
+        text = json.dumps(self.document, indent=4)
+        self.assertEqual(self.document, dict(iter_entries(StringIO(text), 5)))
+
+    def test_empty_object(self):
+        self.assertEqual([], list(iter_entries(StringIO(" { } "), 1)))
+
+    def test_is_lazy(self):
+        entries = iter_entries(StringIO('{"a": 1, "b": '), 1)
+        self.assertEqual(("a", 1), next(entries))
+        with self.assertRaises(json.JSONDecodeError):
+            next(entries)
+
+    def test_invalid_documents(self):
+        for text in ("", "[1]", '{"a": 1', '{"a" 1}', "{1: 2}", '{"a": }'):
+            with self.assertRaises(json.JSONDecodeError):
+                list(iter_entries(StringIO(text), 2))
+
+
+class TestJsonStream_write_entries(unittest.TestCase):
+    """Unittests for testing the write_entries function."""
+
+    def test_matches_json_dump(self):
+        document = {"User.1": {"id": "1"}, "Place.\"2\"": {"id": "2"}}
+        f = StringIO()
+        write_entries(f, ((k, json.dumps(v)) for k, v in document.items()))
+        self.assertEqual(json.dumps(document), f.getvalue())
+
+    def test_empty(self):
+        f = StringIO()
+        write_entries(f, [])
+        self.assertEqual("{}", f.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,159 @@
+#!/usr/bin/python3
+"""Defines unittests for models/engine/lazy_objects.py.
+
+Unittest classes:
+    TestLazyObjects
+    TestLazyObjects_capacity
+"""
+import json
+import unittest
+from unittest.mock import Mock
+from models.engine.lazy_objects import LazyObjects
+
+
+class TestLazyObjects(unittest.TestCase):
+    """Unittests for testing the LazyObjects class."""
+
+    def setUp(self):
+        self.build = Mock(side_effect=lambda record: ("built", record["id"]))
+        self.objects = LazyObjects(self.build, {"User.0": "obj0"})
+        self.objects.load("User.1", {"id": "1"})
+        self.objects.load("User.2", {"id": "2"})
+
+    def test_load_does_not_build(self):
+        self.assertEqual(3, len(self.objects))
+        self.assertIn("User.1", self.objects)
+        self.assertFalse(self.objects.is_loaded("User.1"))
+        self.build.assert_not_called()
+
+    def test_getitem_builds_once(self):
+        self.assertEqual(("built", "1"), self.objects["User.1"])
+        self.assertIs(self.objects["User.1"], self.objects["User.1"])
+        self.assertTrue(self.objects.is_loaded("User.1"))
+        self.assertFalse(self.objects.is_loaded("User.2"))
+        self.build.assert_called_once()
+
+    def test_existing_objects(self):
+        self.assertEqual("obj0", self.objects["User.0"])
+        self.assertTrue(self.objects.is_loaded("User.0"))
+
+    def test_missing_key(self):
+        with self.assertRaises(KeyError):
+            self.objects["User.3"]
+        self.assertIsNone(self.objects.get("User.3"))
+
+    def test_setitem_and_delitem(self):
+        self.objects["User.1"] = "obj1"
+        self.assertEqual("obj1", self.objects["User.1"])
+        del self.objects["User.2"]
+        self.assertNotIn("User.2", self.objects)
+        self.build.assert_not_called()
+
+    def test_iteration_keeps_order(self):
+        self.assertEqual(["User.0", "User.1", "User.2"], list(self.objects))
+        self.assertEqual(["obj0", ("built", "1"), ("built", "2")],
+                         list(self.objects.values()))
+
+    def test_encoded_records(self):
+        objects = LazyObjects(self.build, decode=json.loads)
+        objects.load("User.1", '{"id": "1"}')
+        self.assertFalse(objects.is_loaded("User.1"))
+        self.assertEqual([("User.1", {"id": "1"})], objects.peek())
+        self.assertEqual([("User.1", '{"id": "1"}')],
+                         objects.peek(encoded=True))
+        self.build.assert_not_called()
+        self.assertEqual(("built", "1"), objects["User.1"])
+        self.assertTrue(objects.is_loaded("User.1"))
+
+    def test_peek_does_not_build(self):
+        self.assertEqual([("User.0", "obj0"), ("User.1", {"id": "1"}),
+                          ("User.2", {"id": "2"})], self.objects.peek())
+        self.build.assert_not_called()
+
+
+class Record(dict):
+    """Object built from a record, turned back into it by to_dict()."""
+
+    def to_dict(self):
+        return dict(self)
+
+
+class TestLazyObjects_capacity(unittest.TestCase):
+    """Unittests for testing the eviction of objects beyond a capacity."""
+
+    def setUp(self):
+        self.dirty = set()
+        self.objects = LazyObjects(Record, capacity=2,
+                                   dirty=self.dirty.__contains__)
+        for i in range(4):
+            self.objects.load("User.{}".format(i), {"id": str(i)})
+
+    def loaded(self):
+        return [key for key in self.objects if self.objects.is_loaded(key)]
+
+    def test_evicts_least_recently_used(self):
+        self.objects["User.0"]
+        self.objects["User.1"]
+        self.objects["User.0"]
+        self.objects["User.2"]
+        self.assertEqual(["User.0", "User.2"], self.loaded())
+        self.assertEqual({"id": "1"}, self.objects.peek(["User.1"])[0][1])
+        self.assertEqual({"id": "1"}, self.objects["User.1"])
+        self.assertEqual(["User.1", "User.2"], self.loaded())
+        self.assertEqual((1, 4, 2), (self.objects.hits, self.objects.misses,
+                                     self.objects.evictions))
+        self.assertEqual(2, self.objects.count_loaded())
+
+    def test_dirty_objects_stay(self):
+        self.objects["User.0"]
+        self.dirty.add("User.0")
+        self.objects["User.1"]
+        self.objects["User.2"]
+        self.objects["User.3"]
+        self.assertEqual(["User.0", "User.3"], self.loaded())
+        self.dirty.clear()
+        self.objects["User.1"]
+        self.assertEqual(["User.1", "User.3"], self.loaded())
+
+    def test_most_recent_object_stays(self):
+        self.dirty.update(["User.0", "User.1"])
+        self.objects["User.0"]
+        self.objects["User.1"]
+        self.objects["User.2"]
+        self.assertEqual(["User.0", "User.1", "User.2"], self.loaded())
+        self.objects["User.3"] = Record(id="3")
+        self.assertEqual(["User.0", "User.1", "User.3"], self.loaded())
+
+    def test_evicts_to_source(self):
+        source = {"User.4": {"id": "4"}, "User.5": {"id": "5"}}
+        self.objects.attach(source)
+        self.objects["User.4"]["name"] = "Betty"
+        self.objects["User.5"]["name"] = "Holberton"
+        self.objects.touch("User.5")
+        self.objects["User.0"]
+        self.objects["User.1"]
+        self.assertEqual({"id": "4"}, self.objects["User.4"])
+        self.assertEqual({"id": "5", "name": "Holberton"},
+                         self.objects["User.5"])
+
+    def test_evicts_to_encoding(self):
+        objects = LazyObjects(Record, capacity=1, encode=lambda key, obj:
+                              json.dumps(obj), decode=json.loads)
+        objects.load("User.0", '{"id": "0"}')
+        self.assertFalse(objects.is_loaded("User.0"))
+        self.assertEqual([("User.0", {"id": "0"})], objects.peek())
+        self.assertEqual({"id": "0"}, objects["User.0"])
+        objects["User.1"] = Record(id="1")
+        self.assertEqual([("User.0", '{"id": "0"}'), ("User.1", {"id": "1"})],
+                         objects.peek(encoded=True))
+        self.assertEqual((0, 1, 1), (objects.hits, objects.misses,
+                                     objects.evictions))
+
+    def test_invalid_capacity(self):
+        for capacity in (0, -1, 1.5, "2"):
+            with self.assertRaises(ValueError):
+                LazyObjects(Record, capacity=capacity)
+
+
+if __name__ == "__main__":
+    unittest.main()
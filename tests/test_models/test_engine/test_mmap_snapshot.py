@@ -0,0 +1,79 @@
+#!/usr/bin/python3
+"""Defines unittests for models/engine/mmap_snapshot.py.
+
+Unittest classes:
+    TestMmapSnapshot
+"""
+import json
+import os
+import tempfile
+import unittest
+from models.engine import binary_snapshot, json_stream, mmap_snapshot
+from models.engine.mmap_snapshot import MmapSnapshot
+from models.user import User
+
+
+class TestMmapSnapshot(unittest.TestCase):
+    """Unittests for testing the MmapSnapshot class."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        us = User()
+        us.first_name = "Bétty"
+        self.records = {"User." + us.id: us.to_dict(),
+                        "User.other": {"__class__": "User", "id": "x",
+                                       "emoji": "☃"}}
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def write(self, name, module, index=True):
+        path = os.path.join(self.tmpdir.name, name)
+        mode = "wb" if module is binary_snapshot else "w"
+        with open(path, mode) as f:
+            spans = module.write_entries(
+                f, ((key, module.encode(key, record))
+                    for key, record in self.records.items()))
+        if index:
+            mmap_snapshot.write_index(path, spans)
+        return path
+
+    def check(self, path):
+        snapshot = MmapSnapshot(path)
+        self.addCleanup(snapshot.close)
+        self.assertEqual(self.records, dict(snapshot))
+        return snapshot
+
+    def test_json(self):
+        self.check(self.write("file.json", json_stream))
+
+    def test_binary(self):
+        self.check(self.write("file.bin", binary_snapshot))
+
+    def test_missing_index_is_built(self):
+        for name, module in (("file.json", json_stream),
+                             ("file.bin", binary_snapshot)):
+            path = self.write(name, module, index=False)
+            self.check(path)
+            self.assertTrue(os.path.exists(mmap_snapshot.index_path(path)))
+
+    def test_stale_index_is_rebuilt(self):
+        path = self.write("file.json", json_stream)
+        self.records.pop("User.other")
+        with open(path, "w") as f:
+            json.dump(self.records, f)
+        self.check(path)
+
+    def test_empty_json_object(self):
+        path = os.path.join(self.tmpdir.name, "file.json")
+        with open(path, "w") as f:
+            f.write("{}")
+        self.assertEqual(0, len(MmapSnapshot(path)))
+
+    def test_missing_file(self):
+        with self.assertRaises(FileNotFoundError):
+            MmapSnapshot(os.path.join(self.tmpdir.name, "file.json"))
+
+
+if __name__ == "__main__":
+    unittest.main()
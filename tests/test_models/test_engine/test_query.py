@@ -0,0 +1,114 @@
+#!/usr/bin/python3
+"""Defines unittests for models/engine/query.py.
+
+Unittest classes:
+    TestQuery
+"""
+import unittest
+from datetime import datetime
+from unittest.mock import patch
+import models
+from models.engine.file_storage import FileStorage
+from models.engine.query import Query
+from models.place import Place
+
+
+class TestQuery(unittest.TestCase):
+    """Unittests for testing the Query class over plain functions."""
+
+    def setUp(self):
+        patcher = patch.object(models, "storage", FileStorage(path="unused"))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.objects = {}
+        for name, price in (("a", 30), ("b", 10), ("c", 20), ("d", 10)):
+            place = Place()
+            place.name = name
+            place.price_by_night = price
+            self.objects["Place." + place.id] = place
+        self.record = {"id": "r", "name": "e", "price_by_night": 5,
+                       "created_at": "2024-01-02T03:04:05.000006",
+                       "__class__": "Place"}
+        self.objects["Place.r"] = self.record
+        self.reads = []
+
+    def tearDown(self):
+        FileStorage._FileStorage__objects = {}
+
+    def plan(self, criteria, order):
+        return list(self.objects), False
+
+    def read(self, key, record=False):
+        self.reads.append((key, record))
+        obj = self.objects.get(key)
+        if type(obj) is dict and not record:
+            obj = self.objects[key] = Place(**obj)
+        return obj
+
+    def query(self):
+        return Query(Place, self.plan, self.read)
+
+    def names(self, query):
+        return [obj.name for obj in query]
+
+    def test_all(self):
+        self.assertEqual(["a", "b", "c", "d", "e"], self.names(self.query()))
+
+    def test_where(self):
+        query = self.query().where(price_by_night=10)
+        self.assertEqual(["b", "d"], self.names(query))
+        query.where(price_by_night__gte=10, name__lt="c")
+        self.assertEqual(["b"], self.names(query))
+        self.assertEqual([], self.names(self.query().where(missing=None)))
+
+    def test_order_by(self):
+        query = self.query().order_by("price_by_night", "-name")
+        self.assertEqual(["e", "d", "b", "c", "a"], self.names(query))
+        query.order_by("-price_by_night")
+        self.assertEqual(["a", "c", "b", "d", "e"], self.names(query))
+
+    def test_limit_offset(self):
+        query = self.query().order_by("name").offset(1).limit(2)
+        self.assertEqual(["b", "c"], self.names(query))
+        self.assertEqual(["c", "b"], self.names(
+            self.query().order_by("-name").offset(2).limit(2)))
+        self.assertEqual([], self.names(self.query().limit(0)))
+        self.assertEqual(["d", "e"], self.names(self.query().offset(3)))
+        with self.assertRaises(ValueError):
+            self.query().limit(-1)
+        with self.assertRaises(ValueError):
+            self.query().offset(-1)
+
+    def test_streams(self):
+        results = iter(self.query().limit(2))
+        next(results)
+        self.assertEqual(1, len(self.reads))
+        self.assertEqual(1, len(list(results)))
+        self.assertEqual(2, len(self.reads))
+
+    def test_only(self):
+        query = self.query().where(price_by_night__lte=10).only(
+            "name", "max_guest", "created_at", "missing")
+        found = list(query)
+        self.assertEqual({"name": "b", "max_guest": 0}, {
+            k: v for k, v in found[0].items() if k != "created_at"})
+        self.assertEqual({"name": "e", "max_guest": 0,
+                          "created_at": datetime(2024, 1, 2, 3, 4, 5, 6)},
+                         found[2])
+        self.assertIs(self.record, self.objects["Place.r"])
+
+    def test_records_instantiated_when_yielded(self):
+        found = list(self.query().where(name="e"))
+        self.assertEqual(Place, type(found[0]))
+        self.assertEqual("r", found[0].id)
+        self.assertIn(("Place.r", True), self.reads)
+
+    def test_runs_again(self):
+        query = self.query().where(price_by_night=10)
+        self.assertEqual(2, len(list(query)))
+        list(self.objects.values())[1].price_by_night = 11
+        self.assertEqual(1, len(list(query)))
+
+
+if __name__ == "__main__":
+    unittest.main()
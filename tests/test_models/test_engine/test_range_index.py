@@ -0,0 +1,53 @@
+#!/usr/bin/python3
+"""Defines unittests for models/engine/range_index.py.
+
+Unittest classes:
+    TestRangeIndex
+"""
+import unittest
+from models.engine.range_index import RangeIndex
+
+
+class TestRangeIndex(unittest.TestCase):
+    """Unittests for testing the RangeIndex class."""
+
+    def setUp(self):
+        self.index = RangeIndex("price_by_night")
+        for i, value in enumerate((120, 50, 80, 50, 200, 120.5)):
+            self.index.add("Place.{}".format(i), value)
+
+    def test_name(self):
+        self.assertEqual("price_by_night", self.index.name)
+
+    def test_range(self):
+        self.assertEqual(["Place.1", "Place.3", "Place.2", "Place.0"],
+                         self.index.range(50, 120))
+        self.assertEqual(["Place.5", "Place.4"], self.index.range(120.5))
+        self.assertEqual(["Place.1", "Place.3"], self.index.range(high=50))
+        self.assertEqual(6, len(self.index.range()))
+        self.assertEqual([], self.index.range(300))
+        self.assertEqual([], self.index.range(120, 50))
+
+    def test_add_replaces_value(self):
+        self.index.add("Place.1", 300)
+        self.assertEqual(["Place.3"], self.index.range(high=50))
+        self.assertEqual(["Place.1"], self.index.range(250))
+        self.assertEqual(6, len(self.index))
+
+    def test_remove(self):
+        self.index.remove("Place.3")
+        self.index.remove("Place.9")
+        self.assertEqual(["Place.1"], self.index.range(high=50))
+        self.assertEqual(5, len(self.index))
+
+    def test_non_numeric_values(self):
+        self.index.add("Place.0", "cheap")
+        self.index.add("Place.6", None)
+        self.index.add("Place.7", True)
+        self.index.add("Place.8", float("nan"))
+        self.assertEqual(5, len(self.index))
+        self.assertEqual(["Place.2"], self.index.range(60, 120))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,253 @@
+#!/usr/bin/python3
+"""Defines unittests for models/engine/sqlite_storage.py.
+
+Unittest classes:
+    TestSQLiteStorage_instantiation
+    TestSQLiteStorage_methods
+"""
+import os
+import sqlite3
+import tempfile
+import unittest
+from unittest.mock import patch
+import models
+from models.base_model import BaseModel, classes
+from models.engine.file_storage import FileStorage
+from models.engine.sqlite_storage import SQLiteStorage
+from models.place import Place
+from models.review import Review
+from models.user import User
+
+
+class TestSQLiteStorage_instantiation(unittest.TestCase):
+    """Unittests for testing instantiation of the SQLiteStorage class."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "hbnb.db")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_instantiation_with_arg(self):
+        with self.assertRaises(TypeError):
+            SQLiteStorage(self.path)
+
+    def test_creates_table_per_class(self):
+        SQLiteStorage(path=self.path).close()
+        with sqlite3.connect(self.path) as connection:
+            tables = {row[0] for row in connection.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'table'")}
+        self.assertEqual({"BaseModel", "Amenity", "City", "Place", "Review",
+                          "State", "User"}, tables)
+
+
+class TestSQLiteStorage_methods(unittest.TestCase):
+    """Unittests for testing methods of the SQLiteStorage class."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "hbnb.db")
+        self.storage = SQLiteStorage(path=self.path)
+        patcher = patch.object(models, "storage", self.storage)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        self.storage.close()
+        self.tmpdir.cleanup()
+        FileStorage._FileStorage__objects = {}
+
+    def reopen(self):
+        self.storage.close()
+        self.storage = SQLiteStorage(path=self.path)
+        models.storage = self.storage
+        return self.storage
+
+    def test_new_and_all(self):
+        us = User()
+        self.assertIs(us, self.storage.all()["User." + us.id])
+
+    def test_save_and_get(self):
+        us = User()
+        us.first_name = "Betty"
+        us.save()
+        storage = self.reopen()
+        loaded = storage.get(User, us.id)
+        self.assertEqual(us.to_dict(), loaded.to_dict())
+        self.assertIs(loaded, storage.get("User", us.id))
+
+    def test_get_missing(self):
+        self.assertIsNone(self.storage.get(User, "123"))
+        self.assertIsNone(self.storage.get("Unknown", "123"))
+
+    def test_all_reads_every_table(self):
+        us = User()
+        pl = Place()
+        bm = BaseModel()
+        self.storage.save()
+        storage = self.reopen()
+        self.assertEqual({"User." + us.id, "Place." + pl.id,
+                          "BaseModel." + bm.id}, set(storage.all()))
+
+    def test_all_of_class(self):
+        us = User()
+        Place()
+        self.storage.save()
+        storage = self.reopen()
+        self.assertEqual(["User." + us.id], list(storage.all(User)))
+        self.assertEqual({}, storage.all("Unknown"))
+
+    def test_count(self):
+        User()
+        pl = Place()
+        self.storage.save()
+        self.assertEqual(1, self.storage.count(User))
+        self.assertEqual(2, self.storage.count())
+        self.storage.delete(pl)
+        User()
+        self.assertEqual(2, self.storage.count("User"))
+        self.assertEqual(0, self.storage.count(Place))
+        self.assertEqual(0, self.storage.count("Unknown"))
+
+    def test_find(self):
+        pl = Place()
+        pl.city_id = "c1"
+        Place()
+        self.storage.save()
+        storage = self.reopen()
+        self.assertEqual([pl.id], [p.id for p in
+                                   storage.find(Place, city_id="c1")])
+
+    def test_query(self):
+        for price in (120, 50, 80):
+            pl = Place()
+            pl.price_by_night = price
+        self.storage.save()
+        storage = self.reopen()
+        query = storage.query(Place).where(price_by_night__gt=50).order_by(
+            "-price_by_night").only("price_by_night")
+        self.assertEqual([{"price_by_night": 120}, {"price_by_night": 80}],
+                         list(query))
+
+    def test_find_amenities(self):
+        pl = Place()
+        pl.amenity_ids = ["wifi", "pool"]
+        Place()
+        self.storage.save()
+        storage = self.reopen()
+        found = storage.find(Place, amenity_ids__all=["pool", "wifi"])
+        self.assertEqual([pl.id], [p.id for p in found])
+
+    def test_find_range(self):
+        cheap = Place()
+        cheap.price_by_night = 50
+        dear = Place()
+        dear.price_by_night = 200
+        self.storage.save()
+        storage = self.reopen()
+        self.assertEqual([cheap.id, dear.id], [
+            p.id for p in storage.find_range(Place, "price_by_night")])
+        self.assertEqual([dear.id], [
+            p.id for p in storage.find_range(Place, "price_by_night", 100)])
+
+    def test_geo(self):
+        sf = Place()
+        sf.latitude = 37.77
+        sf.longitude = -122.42
+        nyc = Place()
+        nyc.latitude = 40.71
+        nyc.longitude = -74.01
+        self.storage.save()
+        storage = self.reopen()
+        self.assertEqual([sf.id], [p.id for p in
+                                   storage.near(Place, 37.7, -122.4, 20)])
+        self.assertEqual([nyc.id], [p.id for p in
+                                    storage.within(Place, 40, -75, 41, -74)])
+        self.assertEqual([nyc.id, sf.id], [p.id for p in
+                                           storage.nearest(Place, 40, -75, 2)])
+
+    def test_search(self):
+        rv = Review()
+        rv.text = "Great wifi"
+        Review()
+        self.storage.save()
+        storage = self.reopen()
+        self.assertEqual([rv.id], [r.id for r in
+                                   storage.search(Review, "wifi")])
+        self.assertEqual([], storage.search(User, "wifi"))
+
+    def test_columns(self):
+        for city_id, price in (("c1", 100), ("c2", 50), ("c1", 80)):
+            pl = Place()
+            pl.city_id = city_id
+            pl.price_by_night = price
+        self.storage.save()
+        storage = self.reopen()
+        self.assertEqual({"c1": 90, "c2": 50},
+                         storage.columns(Place).mean("price_by_night",
+                                                     by="city_id"))
+        self.assertEqual(0, storage.columns(User).count())
+
+    def test_subclass_reloaded(self):
+        class Boat(BaseModel):
+            pass
+        self.addCleanup(classes.pop, "Boat")
+        bt = Boat()
+        self.storage.save()
+        self.assertEqual(1, self.storage.count(Boat))
+        self.assertEqual(1, self.storage.count())
+        storage = self.reopen()
+        boat = storage.get("Boat", bt.id)
+        self.assertIs(Boat, type(boat))
+        self.assertEqual(bt.to_dict(), boat.to_dict())
+        self.assertEqual(["Boat." + bt.id], list(storage.all(Boat)))
+
+    def test_update(self):
+        us = User()
+        self.storage.save()
+        us.first_name = "Betty"
+        self.storage.save()
+        self.assertEqual("Betty",
+                         self.reopen().get(User, us.id).first_name)
+
+    def test_delete(self):
+        us = User()
+        self.storage.save()
+        self.storage.delete(us)
+        self.assertIsNone(self.storage.get(User, us.id))
+        self.storage.save()
+        self.assertIsNone(self.reopen().get(User, us.id))
+
+    def test_unsaved_changes_are_not_written(self):
+        us = User()
+        other = SQLiteStorage(path=self.path)
+        self.addCleanup(other.close)
+        self.assertIsNone(other.get(User, us.id))
+
+    def test_batch(self):
+        with self.storage.batch():
+            us = User()
+            us.save()
+            with sqlite3.connect(self.path) as connection:
+                count = connection.execute(
+                    'SELECT COUNT(*) FROM "User"').fetchone()[0]
+            self.assertEqual(0, count)
+        self.assertIsNotNone(self.reopen().get(User, us.id))
+
+    def test_reload_keeps_pending_objects(self):
+        us = User()
+        self.storage.reload()
+        self.assertIs(us, self.storage.get(User, us.id))
+
+    def test_reload_rereads_saved_objects(self):
+        us = User()
+        us.save()
+        self.storage.reload()
+        loaded = self.storage.get(User, us.id)
+        self.assertIsNot(us, loaded)
+        self.assertEqual(us.to_dict(), loaded.to_dict())
+
+
+if __name__ == "__main__":
+    unittest.main()
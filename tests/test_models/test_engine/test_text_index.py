@@ -0,0 +1,70 @@
+#!/usr/bin/python3
+"""Defines unittests for models/engine/text_index.py.
+
+Unittest classes:
+    TestTextIndex
+"""
+import unittest
+from models.engine.text_index import TextIndex, tokenize
+
+
+class TestTextIndex(unittest.TestCase):
+    """Unittests for testing the TextIndex class."""
+
+    def setUp(self):
+        self.index = TextIndex(("name", "description"))
+        self.index.add("Place.1", ("Beach house", "Wifi and a pool"))
+        self.index.add("Place.2", ("City loft", "Fast wifi, wifi everywhere"))
+        self.index.add("Place.3", ("Cabin", "No wifi, a lake and a pool"))
+        self.index.add("Place.4", ("Beach hut", None))
+
+    def keys(self, query):
+        return [key for score, key in self.index.search(query)]
+
+    def test_tokenize(self):
+        self.assertEqual(["wi", "fi", "café", "2"],
+                         tokenize("Wi-Fi, Café 2!"))
+
+    def test_single_word(self):
+        self.assertEqual(["Place.2", "Place.1", "Place.3"],
+                         self.keys("wifi"))
+        self.assertEqual([], self.keys("sauna"))
+
+    def test_and(self):
+        self.assertEqual({"Place.1", "Place.3"}, set(self.keys("wifi pool")))
+        self.assertEqual({"Place.1", "Place.3"},
+                         set(self.keys("wifi AND pool")))
+        self.assertEqual(["Place.1"], self.keys("BEACH pool"))
+
+    def test_or(self):
+        self.assertEqual({"Place.1", "Place.3", "Place.4"},
+                         set(self.keys("pool OR hut")))
+        self.assertEqual({"Place.3", "Place.4"},
+                         set(self.keys("lake pool OR hut")))
+
+    def test_scores_rank_rare_words_higher(self):
+        found = self.index.search("beach OR wifi")
+        scores = dict((key, score) for score, key in found)
+        self.assertGreater(scores["Place.4"], scores["Place.3"])
+        self.assertEqual(found, sorted(found, key=lambda x: -x[0]))
+
+    def test_add_replaces_document(self):
+        self.index.add("Place.1", ("Beach house", "Sauna"))
+        self.assertEqual(["Place.1"], self.keys("sauna"))
+        self.assertNotIn("Place.1", self.keys("wifi"))
+        self.assertEqual(4, len(self.index))
+
+    def test_remove(self):
+        self.index.remove("Place.2")
+        self.index.remove("Place.9")
+        self.assertEqual(["Place.1", "Place.3"], sorted(self.keys("wifi")))
+        self.assertEqual([], self.keys("loft"))
+        self.assertEqual(3, len(self.index))
+
+    def test_empty_query(self):
+        self.assertEqual([], self.keys(""))
+        self.assertEqual([], self.keys("OR AND"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -9,11 +9,13 @@ Unittest classes:
     TestPlaceInstantiation
     TestPlaceSave
     TestPlaceDict
+    TestPlaceRelationships
 """
 from console import HBNBCommand
 import os
 import models
 import unittest
+from models.review import Review
 from models.place import Place
 from datetime import datetime
 from time import sleep
@@ -258,5 +260,26 @@ class TestPlace_to_dict(HBNBCommandTestCase):
             pl.to_dict(None)
 
 
+class TestPlace_relationships(unittest.TestCase):
+    """Unittests for testing the relationships of the Place class."""
+
+    def test_reviews(self):
+        pl = Place()
+        rv1 = Review()
+        rv1.place_id = pl.id
+        rv2 = Review()
+        rv2.place_id = pl.id
+        Review().place_id = Place().id
+        self.assertEqual([rv1, rv2], pl.reviews)
+
+    def test_reviews_follow_changes(self):
+        pl = Place()
+        rv = Review()
+        rv.place_id = pl.id
+        self.assertEqual([rv], pl.reviews)
+        models.storage.delete(rv)
+        self.assertEqual([], pl.reviews)
+
+
 if __name__ == "__main__":
     unittest.main()
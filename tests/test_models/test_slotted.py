@@ -0,0 +1,169 @@
+#!/usr/bin/python3
+"""Defines unittests for models/slotted.py.
+
+Unittest classes:
+    TestSlotted
+    TestSlotted_storage
+"""
+import json
+import os
+import tempfile
+import unittest
+import weakref
+from io import StringIO
+from unittest.mock import patch
+import models
+from console import HBNBCommand
+from models.base_model import classes
+from models.engine.file_storage import FileStorage
+from models.place import Place
+from models.slotted import SlottedModel, slotted
+from models.user import User
+
+RECORD = {"id": "1234", "created_at": "2024-01-02T03:04:05.000006",
+          "updated_at": "2024-01-02T03:04:05.000007", "city_id": "c1",
+          "name": "Loft", "number_rooms": 2, "__class__": "Place"}
+
+
+class TestSlotted(unittest.TestCase):
+    """Unittests for testing the slotted variants of the model classes."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.classes = dict(classes)
+        cls.SlottedPlace = slotted(Place)
+
+    @classmethod
+    def tearDownClass(cls):
+        classes.clear()
+        classes.update(cls.classes)
+
+    def test_variant(self):
+        self.assertIs(self.SlottedPlace, slotted(Place))
+        self.assertIs(self.SlottedPlace, slotted(self.SlottedPlace))
+        self.assertIs(self.SlottedPlace, classes["Place"])
+        self.assertTrue(issubclass(self.SlottedPlace, Place))
+        self.assertEqual("Place", self.SlottedPlace.__name__)
+        self.assertIn("amenity_ids", self.SlottedPlace.__slots__)
+        self.assertIn("id", self.SlottedPlace.__slots__)
+
+    def test_same_output(self):
+        place = Place(**RECORD)
+        slotted_place = self.SlottedPlace(**RECORD)
+        self.assertEqual(str(place), str(slotted_place))
+        self.assertEqual(place.to_dict(), slotted_place.to_dict())
+        self.assertEqual(list(place.to_dict()),
+                         list(slotted_place.to_dict()))
+
+    def test_same_output_after_updates(self):
+        place = Place(**RECORD)
+        slotted_place = self.SlottedPlace(**RECORD)
+        for obj in (place, slotted_place):
+            obj.max_guest = 4
+            obj.pets = True
+            obj.name = "Attic"
+            del obj.city_id
+        self.assertEqual(str(place), str(slotted_place))
+        self.assertEqual(list(place.to_dict()),
+                         list(slotted_place.to_dict()))
+
+    def test_defaults(self):
+        slotted_place = self.SlottedPlace(**RECORD)
+        self.assertEqual(0, slotted_place.price_by_night)
+        self.assertEqual([], slotted_place.amenity_ids)
+        self.assertEqual("", self.SlottedPlace.description)
+        self.assertFalse(hasattr(self.SlottedPlace, "id"))
+        self.assertNotIn("description", slotted_place.to_dict())
+
+    def test_schema_attributes_in_slots(self):
+        slotted_place = self.SlottedPlace(**RECORD)
+        slotted_place.description = "Bright"
+        self.assertEqual({"__class__": "Place"}, vars(slotted_place))
+        slotted_place.pets = True
+        self.assertEqual({"__class__": "Place", "pets": True},
+                         vars(slotted_place))
+
+    def test_order_shared(self):
+        first = self.SlottedPlace(**RECORD)
+        second = self.SlottedPlace(**dict(RECORD, id="5678"))
+        self.assertIs(first._SlottedModel__order,
+                      second._SlottedModel__order)
+
+    def test_weakref(self):
+        slotted_place = self.SlottedPlace(**RECORD)
+        self.assertIs(slotted_place, weakref.ref(slotted_place)())
+
+    def test_new_instance(self):
+        with patch.object(models, "storage") as storage:
+            slotted_place = self.SlottedPlace()
+        storage.new.assert_called_once_with(slotted_place)
+        self.assertIsInstance(slotted_place, SlottedModel)
+        self.assertEqual(["id", "created_at", "updated_at", "__class__"],
+                         list(slotted_place.to_dict()))
+
+
+class TestSlotted_storage(unittest.TestCase):
+    """Unittests for testing the storage of slotted instances."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.classes = dict(classes)
+
+    @classmethod
+    def tearDownClass(cls):
+        classes.clear()
+        classes.update(cls.classes)
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "file.json")
+        with open(self.path, "w") as f:
+            json.dump({"Place.1234": RECORD}, f)
+        slotted(Place)
+        slotted(User)
+        self.storage = FileStorage(path=self.path)
+        patcher = patch.object(models, "storage", self.storage)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.storage.reload()
+
+    def tearDown(self):
+        FileStorage._FileStorage__objects = {}
+        self.tmpdir.cleanup()
+
+    def test_reload(self):
+        place = self.storage.get(Place, "1234")
+        self.assertIsInstance(place, SlottedModel)
+        self.assertEqual("Loft", place.name)
+        self.assertEqual([place], self.storage.find(Place, city_id="c1"))
+
+    def test_save_and_reload(self):
+        place = self.storage.get(Place, "1234")
+        place.name = "Attic"
+        user = User()
+        user.email = "betty@hbnb.io"
+        self.storage.save()
+        self.storage.reload()
+        self.assertEqual("Attic", place.name)
+        self.assertIs(place, self.storage.get(Place, "1234"))
+        self.assertEqual("betty@hbnb.io",
+                         self.storage.get(User, user.id).email)
+
+    def test_reload_refreshes(self):
+        place = self.storage.get(Place, "1234")
+        place.name = "Attic"
+        self.storage.reload()
+        self.assertEqual("Loft", place.name)
+
+    def test_console_update(self):
+        with patch("console.storage", self.storage), \
+                patch("sys.stdout", new=StringIO()):
+            HBNBCommand().onecmd("update Place 1234 max_guest 6")
+            HBNBCommand().onecmd("update Place 1234 id_card 6")
+        place = self.storage.get(Place, "1234")
+        self.assertEqual(6, place.max_guest)
+        self.assertEqual("6", place.id_card)
+
+
+if __name__ == "__main__":
+    unittest.main()
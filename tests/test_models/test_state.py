@@ -5,10 +5,12 @@ Unittest classes:
     TestStateInstantiation
     TestStateSave
     TestStateDict
+    TestStateRelationships
 """
 import os
 import models
 import unittest
+from models.city import City
 from datetime import datetime
 from time import sleep
 from models.state import State
@@ -188,5 +190,30 @@ class TestStateDict(HBNBCommandTestCase):
             st.to_dict(None)
 
 
+class TestState_relationships(unittest.TestCase):
+    """Unittests for testing the relationships of the State class."""
+
+    def test_cities(self):
+        st = State()
+        cy1 = City()
+        cy1.state_id = st.id
+        cy2 = City()
+        cy2.state_id = st.id
+        City().state_id = State().id
+        self.assertEqual([cy1, cy2], st.cities)
+
+    def test_cities_follow_changes(self):
+        st = State()
+        cy = City()
+        self.assertEqual([], st.cities)
+        cy.state_id = st.id
+        self.assertEqual([cy], st.cities)
+        models.storage.delete(cy)
+        self.assertEqual([], st.cities)
+
+    def test_cities_not_serialized(self):
+        self.assertNotIn("cities", State().to_dict())
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -5,10 +5,13 @@ Unittest classes:
     TestUserInstantiation
     TestUserSave
     TestUserDict
+    TestUserRelationships
 """
 import os
 import models
 import unittest
+from models.review import Review
+from models.place import Place
 from datetime import datetime
 from time import sleep
 from models.user import User
@@ -200,5 +203,25 @@ class TestUser_to_dict(unittest.TestCase):
         self.assertDictEqual(us.to_dict(), tdict)
 
 
+class TestUser_relationships(unittest.TestCase):
+    """Unittests for testing the relationships of the User class."""
+
+    def test_places(self):
+        us = User()
+        pl = Place()
+        pl.user_id = us.id
+        Place().user_id = User().id
+        self.assertEqual([pl], us.places)
+
+    def test_reviews(self):
+        us = User()
+        rv1 = Review()
+        rv1.user_id = us.id
+        rv2 = Review()
+        rv2.user_id = us.id
+        Review().user_id = User().id
+        self.assertEqual([rv1, rv2], us.reviews)
+
+
 if __name__ == "__main__":
     unittest.main()